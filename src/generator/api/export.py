@@ -0,0 +1,185 @@
+import numpy
+
+# Models that can be exported to arrays, and scored with NumPy only (this module does not import scikit-learn, so it can be copied next to the exported models).
+EXPORTABLE_MODELS = ("DecisionTreeClassifier", "RandomForestClassifier", "GradientBoostingClassifier", "LogisticRegression")
+FORMAT_VERSION = 1
+# Maximum number of instances that go down the trees at once (the memory used by each step of the descent is proportional to the instances times the trees).
+TREE_CHUNK_SIZE = 10000
+
+def flattenTrees(trees):
+  # The nodes of all trees are stored in the same arrays (the children are positions in these arrays, and 'roots' has the position of the root of each tree).
+  # A child that is a leaf is stored as ~position (a negative value), so that an instance knows that it has reached a leaf without visiting it.
+  offsets = numpy.cumsum([0] + [tree.node_count for tree in trees])
+  index_dtype = numpy.int32 if (offsets[-1] < numpy.iinfo(numpy.int32).max) else numpy.int64
+  children, feature, threshold, missing_go_to_left = [], [], [], []
+  for tree, offset in zip(trees, offsets):
+    is_leaf = numpy.append(tree.children_left == -1, False)
+    # Left and right child of each node, one after the other (the children of the leaves are never used).
+    node_children = numpy.stack([tree.children_left, tree.children_right], axis=1) + offset
+    children.append(numpy.where(is_leaf[[tree.children_left, tree.children_right]].T, ~node_children, node_children))
+    # The attribute of the leaves is negative.
+    feature.append(tree.feature)
+    threshold.append(tree.threshold)
+    # Trees fitted by scikit-learn < 1.3 do not support missing values.
+    missing_go_to_left.append(getattr(tree, "missing_go_to_left", numpy.zeros(tree.node_count, dtype=numpy.uint8)))
+  # The trees compare float32 values with float64 thresholds, which is the same as comparing them with the largest float32 value that is not greater than the threshold.
+  threshold = numpy.concatenate(threshold)
+  with numpy.errstate(over="ignore"):
+    threshold_float32 = threshold.astype(numpy.float32)
+  threshold_float32 = numpy.where(threshold_float32 > threshold, numpy.nextafter(threshold_float32, numpy.float32(-numpy.inf)), threshold_float32)
+  return {
+    "roots": offsets[:-1].astype(index_dtype),
+    "children": numpy.concatenate(children).ravel().astype(index_dtype),
+    "feature": numpy.concatenate(feature).astype(numpy.int32),
+    "threshold": threshold_float32,
+    "missing_go_to_left": numpy.concatenate(missing_go_to_left).astype(bool)
+  }
+
+def classValues(tree, n_classes):
+  # Values of the classes in each node (as the 'value' of the tree, i.e., counts or fractions of the instances of each class).
+  return tree.value[:, 0, :n_classes]
+
+def initialRawPrediction(model):
+  # Initial prediction of a GradientBoostingClassifier (before its trees), computed from public attributes as scikit-learn computes it: zero with init='zero', or the link of the
+  # class priors of its default init estimator (a DummyClassifier with the 'prior' strategy), which is the same for all instances. Any other init estimator may predict a
+  # different value for each instance, so it cannot be exported.
+  init = model.init_
+  if isinstance(init, str) and (init == "zero"):
+    return numpy.zeros(model.estimators_.shape[1], dtype=numpy.float64)
+  if (type(init).__name__ != "DummyClassifier") or (init.strategy != "prior"):
+    raise ValueError("a GradientBoostingClassifier with a " + type(init).__name__ + " as init estimator cannot be exported (only with the default init estimator or init='zero').")
+  # The same functions as scikit-learn are used, so that the values are exactly the same (SciPy is only needed to export, not to load or score).
+  from scipy.special import logit
+  from scipy.stats import gmean
+  eps = numpy.finfo(numpy.float64).eps
+  priors = numpy.clip(init.class_prior_, eps, 1 - eps, dtype=numpy.float64)
+  if model.estimators_.shape[1] == 1:
+    # Two classes: the logit of the prior of the positive class (half of it with the exponential loss).
+    return numpy.array([logit(priors[1]) * (0.5 if (model.loss == "exponential") else 1.0)])
+  # More than two classes: the logarithm of the priors relative to their geometric mean.
+  return numpy.log(priors / gmean(priors))
+
+def exportModel(model):
+  # Returns the arrays of a fitted model (and nothing else), with the same predictions as the model.
+  model_type = type(model).__name__
+  if model_type not in EXPORTABLE_MODELS:
+    raise ValueError("a " + model_type + " cannot be exported (only a " + " or a ".join(EXPORTABLE_MODELS) + ").")
+  if getattr(model, "n_outputs_", 1) != 1:
+    raise ValueError("only models with one class attribute can be exported.")
+  classes = numpy.asarray(model.classes_)
+  arrays = {
+    "format_version": numpy.array(FORMAT_VERSION),
+    "model_type": numpy.array(model_type),
+    # The classes (and the names of the attributes) are stored as strings if they are Python objects, since the arrays are loaded without pickle.
+    "classes": classes.astype(str) if (classes.dtype == object) else classes,
+    "n_features": numpy.array(model.n_features_in_)
+  }
+  if hasattr(model, "feature_names_in_"):
+    arrays["feature_names"] = numpy.asarray(model.feature_names_in_).astype(str)
+  if model_type == "DecisionTreeClassifier":
+    arrays.update(flattenTrees([model.tree_]))
+    arrays["value"] = classValues(model.tree_, len(classes))
+  elif model_type == "RandomForestClassifier":
+    arrays.update(flattenTrees([estimator.tree_ for estimator in model.estimators_]))
+    # The probabilities of each tree are its values normalised by their sum (as in 'predict_proba'), so they are computed once here instead of in each prediction.
+    value = numpy.concatenate([classValues(estimator.tree_, len(classes)) for estimator in model.estimators_])
+    normalizer = value.sum(axis=1)[:, numpy.newaxis]
+    normalizer[normalizer == 0.0] = 1.0
+    arrays["value"] = value / normalizer
+  elif model_type == "GradientBoostingClassifier":
+    # One regression tree per stage and per class (only one per stage with two classes), stored stage by stage.
+    trees = [estimator.tree_ for estimator in model.estimators_.ravel()]
+    arrays.update(flattenTrees(trees))
+    arrays["value"] = numpy.concatenate([tree.value[:, 0, 0] for tree in trees])[:, numpy.newaxis]
+    arrays["n_trees_per_stage"] = numpy.array(model.estimators_.shape[1])
+    arrays["learning_rate"] = numpy.array(model.learning_rate, dtype=numpy.float64)
+    arrays["init_raw_prediction"] = initialRawPrediction(model)
+  elif model_type == "LogisticRegression":
+    arrays["coef"] = numpy.asarray(model.coef_, dtype=numpy.float64)
+    arrays["intercept"] = numpy.asarray(model.intercept_, dtype=numpy.float64)
+  return arrays
+
+def saveModel(model, file_path):
+  # The arrays are not compressed, so the file is loaded without decompressing it.
+  numpy.savez(file_path, **exportModel(model))
+
+def loadModel(file_path):
+  # No object is unpickled (only arrays are read).
+  with numpy.load(file_path, allow_pickle=False) as arrays:
+    return NumpyModel({name: arrays[name] for name in arrays.files})
+
+class NumpyModel:
+  # A model exported to arrays, which predicts as the original model (with the same attributes used by the model serving: classes_, n_features_in_ and feature_names_in_).
+
+  def __init__(self, arrays):
+    if int(arrays["format_version"]) != FORMAT_VERSION:
+      raise ValueError("the version of the exported model (" + str(arrays["format_version"]) + ") is not supported.")
+    self.arrays = arrays
+    self.model_type = str(arrays["model_type"])
+    self.classes_ = arrays["classes"]
+    self.n_features_in_ = int(arrays["n_features"])
+    if "feature_names" in arrays:
+      self.feature_names_in_ = arrays["feature_names"]
+
+  def toArray(self, X, dtype):
+    # The attributes are selected by name if the model stores them and X has them (e.g. a pandas DataFrame); the trees compare the values in float32, as scikit-learn does.
+    if hasattr(self, "feature_names_in_") and hasattr(X, "columns"):
+      X = X[list(self.feature_names_in_)]
+    X = numpy.asarray(X, dtype=dtype)
+    if (X.ndim != 2) or (X.shape[1] != self.n_features_in_):
+      raise ValueError("X must have " + str(self.n_features_in_) + " attributes.")
+    return X
+
+  def leaves(self, X):
+    # Position of the leaf of each instance in each tree: all instances go down all trees at the same time, one level per iteration, and the pairs (instance, tree)
+    # that reach a leaf are no longer processed (so the work is proportional to the depth of the leaves, and not to the depth of the deepest tree).
+    arrays = self.arrays
+    n_trees = len(arrays["roots"])
+    node = numpy.tile(arrays["roots"], len(X))
+    # The pairs that are still going down (those whose root is not a leaf), their current nodes and the position of their row in the flattened X.
+    active = numpy.flatnonzero(arrays["feature"][node] >= 0)
+    current_node = node[active]
+    row_start = (active // n_trees) * X.shape[1]
+    # The missing values are only checked if there are any.
+    has_missing_values = numpy.isnan(X).any()
+    X = X.ravel()
+    while len(active) > 0:
+      values = X[row_start + arrays["feature"][current_node]]
+      go_left = values <= arrays["threshold"][current_node]
+      if has_missing_values:
+        go_left |= numpy.isnan(values) & arrays["missing_go_to_left"][current_node]
+      # The left child is in the position 2 * node of the children, and the right child in the next one.
+      next_node = arrays["children"][2 * current_node + (~go_left)]
+      is_leaf = next_node < 0
+      node[active[is_leaf]] = ~next_node[is_leaf]
+      active, current_node, row_start = active[~is_leaf], next_node[~is_leaf], row_start[~is_leaf]
+    return node.reshape(-1, n_trees)
+
+  def predictChunk(self, X):
+    arrays = self.arrays
+    if self.model_type == "LogisticRegression":
+      scores = X @ arrays["coef"].T + arrays["intercept"]
+      return (scores[:, 0] > 0).astype(int) if (scores.shape[1] == 1) else numpy.argmax(scores, axis=1)
+    leaves = self.leaves(X)
+    value = arrays["value"]
+    if self.model_type == "DecisionTreeClassifier":
+      return numpy.argmax(value[leaves[:, 0]], axis=1)
+    if self.model_type == "RandomForestClassifier":
+      # The probabilities of the trees are added one tree at a time (in the same order as scikit-learn) and averaged.
+      proba = numpy.zeros((len(X), value.shape[1]), dtype=numpy.float64)
+      for tree in range(leaves.shape[1]):
+        proba += value[leaves[:, tree]]
+      proba /= leaves.shape[1]
+      return numpy.argmax(proba, axis=1)
+    # GradientBoostingClassifier: the initial prediction plus the learning rate times the value of each tree, added one stage at a time.
+    n_trees_per_stage = int(arrays["n_trees_per_stage"])
+    raw_predictions = numpy.repeat(arrays["init_raw_prediction"][numpy.newaxis, :], len(X), axis=0)
+    for tree in range(leaves.shape[1]):
+      raw_predictions[:, tree % n_trees_per_stage] += arrays["learning_rate"] * value[leaves[:, tree], 0]
+    return (raw_predictions[:, 0] >= 0).astype(int) if (n_trees_per_stage == 1) else numpy.argmax(raw_predictions, axis=1)
+
+  def predict(self, X):
+    X = self.toArray(X, numpy.float64 if (self.model_type == "LogisticRegression") else numpy.float32)
+    chunk_size = len(X) if (self.model_type == "LogisticRegression") else TREE_CHUNK_SIZE
+    encoded_classes = [self.predictChunk(X[chunk_start:chunk_start+chunk_size]) for chunk_start in range(0, len(X), max(chunk_size, 1))]
+    return self.classes_.take(numpy.concatenate(encoded_classes) if encoded_classes else numpy.array([], dtype=int))
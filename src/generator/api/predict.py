@@ -0,0 +1,113 @@
+import os, io, json, hashlib, threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy, pandas, joblib
+from api import export
+
+# Techniques whose workflows write a model that can score new instances, and the classes of that model (SVC with a kernel approximation and the out-of-core Logistic Regression write a pipeline, and the hyperparameter search writes the best model of any classifier).
+TECHNIQUES = {
+  "LogisticRegression": ("LogisticRegression", "Pipeline"),
+  "GradientBoostingClassifier": ("GradientBoostingClassifier",),
+  "RandomForestClassifier": ("RandomForestClassifier",),
+  "SVC": ("SVC", "Pipeline"),
+  "DecisionTreeClassifier": ("DecisionTreeClassifier",),
+  "HistGradientBoostingClassifier": ("HistGradientBoostingClassifier",),
+  "HyperparameterSearch": None
+}
+# Extensions of the model artefacts: joblib (current workflows), pickle (workflows generated before the models were written with joblib) and npz (models exported to arrays, see api/export.py).
+ARTEFACT_EXTENSIONS = (".joblib", ".pickle", ".npz")
+# Maximum and minimum number of instances of a batch scored at once by each worker (a batch is split among all workers).
+MAX_CHUNK_SIZE = 100000
+MIN_CHUNK_SIZE = 1000
+
+def modelStorePath():
+  # Folder with the model artefacts that can be served (outputs of the workflows copied there).
+  return os.path.realpath(os.environ.get("PHENOFLOW_MODEL_STORE", "models"))
+
+def resolveArtefact(reference):
+  # Loading a model unpickles it, so only the artefacts inside the model store can be loaded (and never an arbitrary file of the server).
+  model_store_path = modelStorePath()
+  artefact_path = os.path.realpath(os.path.join(model_store_path, reference))
+  if (os.path.commonpath([model_store_path, artefact_path]) != model_store_path) or (not artefact_path.endswith(ARTEFACT_EXTENSIONS)):
+    raise ValueError("the 'model' parameter must be the path of a .joblib, .pickle or .npz file inside the model store.")
+  if not os.path.isfile(artefact_path):
+    raise ValueError("the model '" + reference + "' does not exist in the model store.")
+  return artefact_path
+
+class ModelCache:
+  # Loaded models, from the least to the most recently used, keyed by the SHA-256 hash of the artefact (so the same artefact stored with several names is only loaded once).
+
+  def __init__(self, max_size):
+    self.max_size = max_size
+    self.models = OrderedDict()
+    # Hash of each artefact, which is only computed again if the file changes (path, size and modification time).
+    self.artefact_hashes = dict()
+    self.lock = threading.Lock()
+
+  def artefactHash(self, artefact_path):
+    artefact_stat = os.stat(artefact_path)
+    artefact_key = (artefact_path, artefact_stat.st_size, artefact_stat.st_mtime_ns)
+    with self.lock:
+      if artefact_key in self.artefact_hashes:
+        return self.artefact_hashes[artefact_key]
+    sha256 = hashlib.sha256()
+    with open(artefact_path, "rb") as artefact_file:
+      for block in iter(lambda: artefact_file.read(1024 * 1024), b""):
+        sha256.update(block)
+    with self.lock:
+      self.artefact_hashes[artefact_key] = sha256.hexdigest()
+    return sha256.hexdigest()
+
+  def get(self, artefact_path):
+    # Returns the hash of the artefact and its model, which is only loaded if it is not in the cache.
+    artefact_hash = self.artefactHash(artefact_path)
+    with self.lock:
+      if artefact_hash in self.models:
+        self.models.move_to_end(artefact_hash)
+        return artefact_hash, self.models[artefact_hash]
+    # joblib also loads the models written with pickle, and the exported models are loaded without unpickling anything (nor importing scikit-learn).
+    model = export.loadModel(artefact_path) if artefact_path.endswith(".npz") else joblib.load(artefact_path)
+    with self.lock:
+      self.models[artefact_hash] = model
+      self.models.move_to_end(artefact_hash)
+      while len(self.models) > self.max_size:
+        evicted_hash, _ = self.models.popitem(last=False)
+        self.artefact_hashes = {artefact_key: current_hash for artefact_key, current_hash in self.artefact_hashes.items() if current_hash != evicted_hash}
+    return artefact_hash, model
+
+def numberOfWorkers():
+  # The same CPU setting as the step 2 of the workflows: the environment variable PHENOFLOW_N_JOBS or, otherwise, the effective CPU quota.
+  environment_value = os.environ.get("PHENOFLOW_N_JOBS")
+  return max(1, int(environment_value)) if environment_value else joblib.cpu_count()
+
+cache = ModelCache(int(os.environ.get("PHENOFLOW_MODEL_CACHE_SIZE", "8")))
+# Worker pool that scores the chunks of the batches (the models release the GIL while predicting, and they are shared by all workers instead of being copied).
+number_of_workers = numberOfWorkers()
+executor = ThreadPoolExecutor(max_workers=number_of_workers)
+
+def readBatch(body, content_type):
+  # A batch is either a CSV file (with header) or a JSON list of instances (objects whose keys are the attributes).
+  if "json" in content_type:
+    return pandas.DataFrame.from_records(json.loads(body))
+  return pandas.read_csv(io.BytesIO(body))
+
+def modelType(model):
+  # An exported model keeps the class of the original model.
+  return model.model_type if isinstance(model, export.NumpyModel) else type(model).__name__
+
+def checkTechnique(technique, model):
+  model_classes = TECHNIQUES[technique]
+  if (model_classes is not None) and (modelType(model) not in model_classes):
+    raise ValueError("the model is a " + modelType(model) + ", not a " + " or a ".join(model_classes) + ".")
+
+def score(model, batch, class_name):
+  # The attributes used to fit the model are selected by name when the model stores them; otherwise, all attributes except the class (if it exists) are used.
+  if hasattr(model, "feature_names_in_"):
+    X = batch[list(model.feature_names_in_)]
+  else:
+    X = (batch.drop(columns=[class_name], errors="ignore") if class_name else batch).to_numpy()
+  if len(X) == 0:
+    return numpy.array([])
+  chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, -(-len(X) // number_of_workers)))
+  chunks = [X[chunk_start:chunk_start+chunk_size] for chunk_start in range(0, len(X), chunk_size)]
+  return numpy.concatenate(list(executor.map(model.predict, chunks)))
@@ -1,6 +1,8 @@
+import os
 from starlette.applications import Starlette
 from starlette.responses import Response, JSONResponse, PlainTextResponse
-from api import workflow
+from starlette.concurrency import run_in_threadpool
+from api import workflow, predict, export
 import oyaml as yaml
 import cwlgen
 
@@ -121,7 +123,7 @@ async def tbcGetStepCwl(request):
       step_second_input_doc = "File that contains the dataset"
     elif (step_number_param == 3):
       step_second_input_param_id_label = "step3_input_partitions" # In this case, "param_id" and "label" have the same value.
-      step_second_input_doc = "File that contains the partitions in JSON format"
+      step_second_input_doc = "File that contains the partitions in JSON or NPY format"
     elif (step_number_param == 4):
       step_second_input_param_id_label = "step4_input_matrix_of_matches" # In this case, "param_id" and "label" have the same value.
       step_second_input_doc = "File that contains the matrix of matches in JSON format"
@@ -140,6 +142,15 @@ async def tbcGetStepCwl(request):
                               )
     step.inputs.append(step_python_file)
     step.inputs.append(step_second_input)
+    if (step_number_param == 2):
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Schema of the dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     # outputs
     if (step_number_param == 1):
       step_output_param_id_label = "step1_output_dataset" # In this case, "param_id" and "label" have the same value.
@@ -147,8 +158,8 @@ async def tbcGetStepCwl(request):
       step_output_glob = "*.csv"
     elif (step_number_param == 2):
       step_output_param_id_label = "step2_output_partitions" # In this case, "param_id" and "label" have the same value.
-      step_output_doc = "Partitions in JSON format generated after executing step2"
-      step_output_glob = "partitions.json"
+      step_output_doc = "Partitions (in JSON or NPY format) generated after executing step2"
+      step_output_glob = "partitions.*"
     elif (step_number_param == 3):
       step_output_param_id_label = "step3_output_matrix_of_matches" # In this case, "param_id" and "label" have the same value.
       step_output_doc = "Matrix of matches in JSON format generated after executing step3"
@@ -172,6 +183,15 @@ async def tbcGetStepCwl(request):
                                 doc=step_output_doc
                                 )
     step.outputs.append(step_output)
+    if (step_number_param == 1):
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the dataset (names and types of its attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     return PlainTextResponse(step.export_string())
   except Exception as e:
     return Response("ERROR generating step" + str(step_number_param) + ".cwl file: " + str(e), status_code = 500)
@@ -197,6 +217,7 @@ async def tbcGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_python_file", source="step1_python_file") )
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_dataset", source="step1_input_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     tbc_workflow.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -204,6 +225,7 @@ async def tbcGetMainCwl(request):
                         )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_dataset", source="step1/step1_output_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_partitions") )
     tbc_workflow.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
@@ -299,6 +321,110 @@ async def tbcGenerateMainYml(request):
   except Exception as e: # Any exception.
     return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
 
+@app.route('/tbc/getOneStepCwl', methods=['GET'])
+async def tbcGetOneStepCwl(request):
+  try:
+    # CommandLineTool
+    step = cwlgen.CommandLineTool(
+                  tool_id='tbc',
+                  base_command='python',
+                  label="tbc",
+                  doc="CWL file to run automatically the one-step version of the Trace-based clustering technique",
+                  cwl_version="v1.0"
+                  )
+    # namespaces
+    step_namespace = cwlgen.Namespaces()
+    step_namespace.name = "$namespaces"
+    step_namespace.s = "http://phenomics.kcl.ac.uk/phenoflow/"
+    step.namespaces = step_namespace
+    # requirements
+    # - IMPORTANT: it must be a list.
+    step.requirements = [ cwlgen.DockerRequirement(docker_pull="continuumio/anaconda3:2024.10-1") ]
+    # metadata
+    step.metadata = cwlgen.Metadata(**{'type' : 'output'})
+    # inputs
+    step.inputs.append( cwlgen.CommandInputParameter(
+                              param_id='tbc_python_file',
+                              label='tbc_python_file',
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=1),
+                              doc='Python file corresponding to the one-step version of the Trace-based clustering technique'
+                              ) )
+    step.inputs.append( cwlgen.CommandInputParameter(
+                              param_id='tbc_input_dataset',
+                              label='tbc_input_dataset',
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc='File that contains the input dataset'
+                              ) )
+    # outputs
+    step.outputs.append( cwlgen.CommandOutputParameter(
+                                param_id='tbc_output_final_candidate_clusters',
+                                label='tbc_output_final_candidate_clusters',
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.csv"),
+                                doc="Final candidate clusters in CSV format generated after executing the Trace-based clustering technique"
+                                ) )
+    return PlainTextResponse(step.export_string())
+  except Exception as e:
+    return Response("ERROR generating tbc.cwl file: " + str(e), status_code = 500)
+
+@app.route('/tbc/getOneStepMainCwl', methods=['GET'])
+async def tbcGetOneStepMainCwl(request):
+  try:
+    # Workflow
+    tbc_workflow = cwlgen.workflow.Workflow(
+                      workflow_id="tbc_workflow",
+                      label="tbc_workflow",
+                      doc="Main workflow for the one-step version of the Trace-based clustering technique",
+                      cwl_version="v1.0"
+                      )
+    # requirements
+    # - IMPORTANT: it must be a list.
+    tbc_workflow.requirements = [ cwlgen.SubworkflowFeatureRequirement() ]
+    # steps
+    tbc_step = cwlgen.workflow.WorkflowStep(
+                        step_id="tbc",
+                        run="cwl/tbc.cwl"
+                        )
+    tbc_step.inputs.append( cwlgen.WorkflowStepInput(input_id="tbc_python_file", source="tbc_python_file") )
+    tbc_step.inputs.append( cwlgen.WorkflowStepInput(input_id="tbc_input_dataset", source="tbc_input_dataset") )
+    tbc_step.out.append( cwlgen.WorkflowStepOutput(output_id="tbc_output_final_candidate_clusters") )
+    tbc_workflow.steps.append( tbc_step )
+    # inputs
+    tbc_workflow.inputs.append( cwlgen.workflow.InputParameter(
+                                        param_id="tbc_python_file",
+                                        label="tbc_python_file",
+                                        doc="Python file corresponding to the one-step version of the Trace-based clustering technique",
+                                        param_type="File"
+                                        ) )
+    tbc_workflow.inputs.append( cwlgen.workflow.InputParameter(
+                                        param_id="tbc_input_dataset",
+                                        label="tbc_input_dataset",
+                                        doc="File that contains the input dataset",
+                                        param_type="File"
+                                        ) )
+    # outputs
+    tbc_workflow.outputs.append( cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="tbc_output_final_candidate_clusters",
+                                output_source="tbc/tbc_output_final_candidate_clusters",
+                                label="tbc_output_final_candidate_clusters",
+                                doc="Final candidate clusters in CSV format generated after executing the Trace-based clustering technique",
+                                param_type="File"
+                                ) )
+    return PlainTextResponse(tbc_workflow.export_string())
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.cwl file: " + str(e), status_code = 500)
+
+@app.route('/tbc/generateOneStepMainYml/{dataset_name:str}', methods=['GET'])
+async def tbcGenerateOneStepMainYml(request):
+  try:
+    main_yml_file_content = "tbc_python_file:\n  class: File\n  path: python/tbc.py\n"
+    main_yml_file_content = main_yml_file_content + "tbc_input_dataset:\n  class: File\n  path: files/" + request.path_params['dataset_name'] + "\n"
+    return PlainTextResponse(main_yml_file_content)
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
+
 ###########################################################################
 ###########################################################################
 ################ ROUTES FOR LOGISTIC REGRESSION TECHNIQUE ################
@@ -382,6 +508,14 @@ async def LogisticRegressionGetStepCwl(request):
                               doc="Input test dataset corresponding to the step 2"
                               )
       step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     elif (step_number_param == 3):
       step_input_train_dataset = cwlgen.CommandInputParameter(
                               param_id="step3_input_train_dataset_with_predictions",
@@ -404,9 +538,17 @@ async def LogisticRegressionGetStepCwl(request):
                               label="step3_input_pickle_model",
                               param_type='File',
                               input_binding=cwlgen.CommandLineBinding(position=4),
-                              doc="Model in pickle format"
+                              doc="Model in joblib format"
                               )
       step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
@@ -428,6 +570,14 @@ async def LogisticRegressionGetStepCwl(request):
                                 doc="Output test dataset corresponding to the step 1"
                                 )
       step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     elif (step_number_param == 2):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step2_output_train_dataset_with_predictions",
@@ -449,10 +599,18 @@ async def LogisticRegressionGetStepCwl(request):
                                 param_id="step2_output_pickel_model",
                                 label="step2_output_pickel_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     elif (step_number_param == 3):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step3_output_train_dataset_with_predictions",
@@ -474,10 +632,18 @@ async def LogisticRegressionGetStepCwl(request):
                                 param_id="step3_output_pickle_model",
                                 label="step3_output_pickle_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="*.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
@@ -508,6 +674,7 @@ async def LogisticRegressionGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     workflow_object.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -516,9 +683,11 @@ async def LogisticRegressionGetMainCwl(request):
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_pickel_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
     workflow_object.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
                         step_id="step3",
@@ -528,9 +697,11 @@ async def LogisticRegressionGetMainCwl(request):
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_pickle_model", source="step2/step2_output_pickel_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_pickle_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
     workflow_object.steps.append( step3 )
     # inputs
     workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
@@ -589,7 +760,15 @@ async def LogisticRegressionGetMainCwl(request):
                                 param_id="step3_output_pickle_model",
                                 output_source="step3/step3_output_pickle_model",
                                 label="step3_output_pickle_model",
-                                doc="Model in pickle format",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
                                 param_type="File"
                                 )
     workflow_object.outputs.append(workflow_output)
@@ -692,6 +871,14 @@ async def GradientBoostingClassifierGetStepCwl(request):
                               doc="Input test dataset corresponding to the step 2"
                               )
       step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     elif (step_number_param == 3):
       step_input_train_dataset = cwlgen.CommandInputParameter(
                               param_id="step3_input_train_dataset_with_predictions",
@@ -714,9 +901,17 @@ async def GradientBoostingClassifierGetStepCwl(request):
                               label="step3_input_pickle_model",
                               param_type='File',
                               input_binding=cwlgen.CommandLineBinding(position=4),
-                              doc="Model in pickle format"
+                              doc="Model in joblib format"
                               )
       step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
@@ -738,6 +933,14 @@ async def GradientBoostingClassifierGetStepCwl(request):
                                 doc="Output test dataset corresponding to the step 1"
                                 )
       step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     elif (step_number_param == 2):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step2_output_train_dataset_with_predictions",
@@ -759,10 +962,18 @@ async def GradientBoostingClassifierGetStepCwl(request):
                                 param_id="step2_output_pickel_model",
                                 label="step2_output_pickel_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     elif (step_number_param == 3):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step3_output_train_dataset_with_predictions",
@@ -784,10 +995,18 @@ async def GradientBoostingClassifierGetStepCwl(request):
                                 param_id="step3_output_pickle_model",
                                 label="step3_output_pickle_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="*.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
@@ -818,6 +1037,7 @@ async def GradientBoostingClassifierGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     workflow_object.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -826,9 +1046,11 @@ async def GradientBoostingClassifierGetMainCwl(request):
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_pickel_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
     workflow_object.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
                         step_id="step3",
@@ -838,9 +1060,11 @@ async def GradientBoostingClassifierGetMainCwl(request):
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_pickle_model", source="step2/step2_output_pickel_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_pickle_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
     workflow_object.steps.append( step3 )
     # inputs
     workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
@@ -899,7 +1123,15 @@ async def GradientBoostingClassifierGetMainCwl(request):
                                 param_id="step3_output_pickle_model",
                                 output_source="step3/step3_output_pickle_model",
                                 label="step3_output_pickle_model",
-                                doc="Model in pickle format",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
                                 param_type="File"
                                 )
     workflow_object.outputs.append(workflow_output)
@@ -1002,6 +1234,14 @@ async def RandomForestClassifierGetStepCwl(request):
                               doc="Input test dataset corresponding to the step 2"
                               )
       step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     elif (step_number_param == 3):
       step_input_train_dataset = cwlgen.CommandInputParameter(
                               param_id="step3_input_train_dataset_with_predictions",
@@ -1024,9 +1264,17 @@ async def RandomForestClassifierGetStepCwl(request):
                               label="step3_input_pickle_model",
                               param_type='File',
                               input_binding=cwlgen.CommandLineBinding(position=4),
-                              doc="Model in pickle format"
+                              doc="Model in joblib format"
                               )
       step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
@@ -1048,6 +1296,14 @@ async def RandomForestClassifierGetStepCwl(request):
                                 doc="Output test dataset corresponding to the step 1"
                                 )
       step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     elif (step_number_param == 2):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step2_output_train_dataset_with_predictions",
@@ -1069,10 +1325,18 @@ async def RandomForestClassifierGetStepCwl(request):
                                 param_id="step2_output_pickel_model",
                                 label="step2_output_pickel_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     elif (step_number_param == 3):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step3_output_train_dataset_with_predictions",
@@ -1094,10 +1358,18 @@ async def RandomForestClassifierGetStepCwl(request):
                                 param_id="step3_output_pickle_model",
                                 label="step3_output_pickle_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="*.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
@@ -1128,6 +1400,7 @@ async def RandomForestClassifierGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     workflow_object.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -1136,9 +1409,11 @@ async def RandomForestClassifierGetMainCwl(request):
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_pickel_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
     workflow_object.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
                         step_id="step3",
@@ -1148,9 +1423,11 @@ async def RandomForestClassifierGetMainCwl(request):
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_pickle_model", source="step2/step2_output_pickel_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_pickle_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
     workflow_object.steps.append( step3 )
     # inputs
     workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
@@ -1209,7 +1486,15 @@ async def RandomForestClassifierGetMainCwl(request):
                                 param_id="step3_output_pickle_model",
                                 output_source="step3/step3_output_pickle_model",
                                 label="step3_output_pickle_model",
-                                doc="Model in pickle format",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
                                 param_type="File"
                                 )
     workflow_object.outputs.append(workflow_output)
@@ -1312,6 +1597,14 @@ async def SVCGetStepCwl(request):
                               doc="Input test dataset corresponding to the step 2"
                               )
       step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     elif (step_number_param == 3):
       step_input_train_dataset = cwlgen.CommandInputParameter(
                               param_id="step3_input_train_dataset_with_predictions",
@@ -1334,9 +1627,17 @@ async def SVCGetStepCwl(request):
                               label="step3_input_pickle_model",
                               param_type='File',
                               input_binding=cwlgen.CommandLineBinding(position=4),
-                              doc="Model in pickle format"
+                              doc="Model in joblib format"
                               )
       step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
@@ -1358,6 +1659,14 @@ async def SVCGetStepCwl(request):
                                 doc="Output test dataset corresponding to the step 1"
                                 )
       step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     elif (step_number_param == 2):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step2_output_train_dataset_with_predictions",
@@ -1379,10 +1688,18 @@ async def SVCGetStepCwl(request):
                                 param_id="step2_output_pickel_model",
                                 label="step2_output_pickel_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     elif (step_number_param == 3):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step3_output_train_dataset_with_predictions",
@@ -1404,10 +1721,18 @@ async def SVCGetStepCwl(request):
                                 param_id="step3_output_pickle_model",
                                 label="step3_output_pickle_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="*.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
@@ -1438,6 +1763,7 @@ async def SVCGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     workflow_object.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -1446,9 +1772,11 @@ async def SVCGetMainCwl(request):
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_pickel_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
     workflow_object.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
                         step_id="step3",
@@ -1458,9 +1786,11 @@ async def SVCGetMainCwl(request):
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_pickle_model", source="step2/step2_output_pickel_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_pickle_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
     workflow_object.steps.append( step3 )
     # inputs
     workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
@@ -1519,7 +1849,15 @@ async def SVCGetMainCwl(request):
                                 param_id="step3_output_pickle_model",
                                 output_source="step3/step3_output_pickle_model",
                                 label="step3_output_pickle_model",
-                                doc="Model in pickle format",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
                                 param_type="File"
                                 )
     workflow_object.outputs.append(workflow_output)
@@ -1622,6 +1960,14 @@ async def DecisionTreeClassifierGetStepCwl(request):
                               doc="Input test dataset corresponding to the step 2"
                               )
       step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
     elif (step_number_param == 3):
       step_input_train_dataset = cwlgen.CommandInputParameter(
                               param_id="step3_input_train_dataset_with_predictions",
@@ -1644,9 +1990,17 @@ async def DecisionTreeClassifierGetStepCwl(request):
                               label="step3_input_pickle_model",
                               param_type='File',
                               input_binding=cwlgen.CommandLineBinding(position=4),
-                              doc="Model in pickle format"
+                              doc="Model in joblib format"
                               )
       step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
@@ -1668,6 +2022,14 @@ async def DecisionTreeClassifierGetStepCwl(request):
                                 doc="Output test dataset corresponding to the step 1"
                                 )
       step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
     elif (step_number_param == 2):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step2_output_train_dataset_with_predictions",
@@ -1689,10 +2051,18 @@ async def DecisionTreeClassifierGetStepCwl(request):
                                 param_id="step2_output_pickel_model",
                                 label="step2_output_pickel_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     elif (step_number_param == 3):
       step_output_train_data = cwlgen.CommandOutputParameter(
                                 param_id="step3_output_train_dataset_with_predictions",
@@ -1714,10 +2084,18 @@ async def DecisionTreeClassifierGetStepCwl(request):
                                 param_id="step3_output_pickle_model",
                                 label="step3_output_pickle_model",
                                 param_type='File',
-                                output_binding=cwlgen.CommandOutputBinding(glob="*.pickle"),
-                                doc="Model in pickle format"
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
                                 )
       step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
     else:
       # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
       return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
@@ -1748,6 +2126,7 @@ async def DecisionTreeClassifierGetMainCwl(request):
     step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
     step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
     workflow_object.steps.append( step1 )
     step2 = cwlgen.workflow.WorkflowStep(
                         step_id="step2",
@@ -1756,9 +2135,11 @@ async def DecisionTreeClassifierGetMainCwl(request):
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
     step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
     step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_pickel_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
     workflow_object.steps.append( step2 )
     step3 = cwlgen.workflow.WorkflowStep(
                         step_id="step3",
@@ -1768,9 +2149,11 @@ async def DecisionTreeClassifierGetMainCwl(request):
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
     step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_pickle_model", source="step2/step2_output_pickel_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
     step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_pickle_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
     workflow_object.steps.append( step3 )
     # inputs
     workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
@@ -1829,7 +2212,15 @@ async def DecisionTreeClassifierGetMainCwl(request):
                                 param_id="step3_output_pickle_model",
                                 output_source="step3/step3_output_pickle_model",
                                 label="step3_output_pickle_model",
-                                doc="Model in pickle format",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
                                 param_type="File"
                                 )
     workflow_object.outputs.append(workflow_output)
@@ -1848,3 +2239,1183 @@ async def DecisionTreeClassifierGenerateMainYml(request):
     return PlainTextResponse(main_yml_file_content)
   except Exception as e: # Any exception.
     return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
+
+############################################################################
+############################################################################
+################ ROUTES FOR HYPERPARAMETER SEARCH TECHNIQUE ################
+############################################################################
+############################################################################
+
+@app.route('/HyperparameterSearch/getStepCwl/{step_number:int}', methods=['GET'])
+async def HyperparameterSearchGetStepCwl(request):
+  # step_number must be between 1 and 3 (both included).
+  step_number_param = request.path_params['step_number']
+  if (step_number_param < 1) or (step_number_param > 3):
+    return Response("ERROR: the 'step_number' parameter must be an integer between 1 and 3 (both included).", status_code = 500)
+  try:
+    # CommandLineTool
+    step = cwlgen.CommandLineTool(
+                  tool_id='step' + str(step_number_param),
+                  base_command='python',
+                  label="step" + str(step_number_param),
+                  doc="CWL file to automatically run the step " + str(step_number_param),
+                  cwl_version="v1.0"
+                  )
+    # namespaces
+    step_namespace = cwlgen.Namespaces()
+    step_namespace.name = "$namespaces"
+    step_namespace.s = "http://phenomics.kcl.ac.uk/phenoflow/"
+    step.namespaces = step_namespace
+    # requirements
+    # - IMPORTANT: it must be a list.
+    step.requirements = [ cwlgen.DockerRequirement(docker_pull="continuumio/anaconda3:2024.10-1") ]
+    # metadata
+    if (step_number_param == 1):
+      metadata = {'type' : 'load'}
+    elif (step_number_param == 2):
+      metadata = {'type' : 'logic'}
+    elif (step_number_param == 3):
+      metadata = {'type' : 'output'}
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (metadata): this should never happen.", status_code = 500)
+    step.metadata = cwlgen.Metadata(**metadata)
+    # inputs
+    step_python_file = cwlgen.CommandInputParameter(
+                              param_id='step' + str(step_number_param) + '_python_file',
+                              label='step' + str(step_number_param) + '_python_file',
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=1),
+                              doc='Python file corresponding to the step ' + str(step_number_param)
+                              )
+    step.inputs.append(step_python_file)
+    if (step_number_param == 1):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_train_dataset",
+                              label="step1_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_test_dataset",
+                              label="step1_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_test_dataset)
+    elif (step_number_param == 2):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_train_dataset",
+                              label="step2_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_test_dataset",
+                              label="step2_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
+    elif (step_number_param == 3):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_train_dataset_with_predictions",
+                              label="step3_input_train_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_test_dataset_with_predictions",
+                              label="step3_input_test_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_model = cwlgen.CommandInputParameter(
+                              param_id="step3_input_model",
+                              label="step3_input_model",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Best model in joblib format"
+                              )
+      step.inputs.append(step_input_model)
+      step_input_search_results = cwlgen.CommandInputParameter(
+                              param_id="step3_input_search_results",
+                              label="step3_input_search_results",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="Results of all combinations of the search in CSV format"
+                              )
+      step.inputs.append(step_input_search_results)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=6),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
+    # outputs
+    if (step_number_param == 1):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_train_dataset",
+                                label="step1_output_train_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_train_dataset.csv"),
+                                doc="Output train dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_test_dataset",
+                                label="step1_output_test_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_test_dataset.csv"),
+                                doc="Output test dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
+    elif (step_number_param == 2):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_train_dataset_with_predictions",
+                                label="step2_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_train_dataset_with_predictions.csv"),
+                                doc="Output train dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_test_dataset_with_predictions",
+                                label="step2_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_test_dataset_with_predictions.csv"),
+                                doc="Output test dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_model = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_model",
+                                label="step2_output_model",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Best model in joblib format"
+                                )
+      step.outputs.append(step_output_model)
+      step_output_search_results = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_search_results",
+                                label="step2_output_search_results",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_search_results.csv"),
+                                doc="Results of all combinations of the search in CSV format"
+                                )
+      step.outputs.append(step_output_search_results)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    elif (step_number_param == 3):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_train_dataset_with_predictions.csv"),
+                                doc="Train dataset in CSV format with the final predictions"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_test_dataset_with_predictions.csv"),
+                                doc="Test dataset in CSV format with the final predictions"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_model = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_model",
+                                label="step3_output_model",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Best model in joblib format"
+                                )
+      step.outputs.append(step_output_model)
+      step_output_search_results = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_search_results",
+                                label="step3_output_search_results",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_search_results.csv"),
+                                doc="Results of all combinations of the search in CSV format"
+                                )
+      step.outputs.append(step_output_search_results)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
+    return PlainTextResponse(step.export_string())
+  except Exception as e:
+    return Response("ERROR generating step" + str(step_number_param) + ".cwl file: " + str(e), status_code = 500)
+
+@app.route('/HyperparameterSearch/getMainCwl', methods=['GET'])
+async def HyperparameterSearchGetMainCwl(request):
+  try:
+    # Workflow
+    workflow_object = cwlgen.workflow.Workflow(
+                      workflow_id="HyperparameterSearch_workflow",
+                      label="HyperparameterSearch_workflow",
+                      doc="Main workflow for the Hyperparameter Search technique",
+                      cwl_version="v1.0"
+                      )
+    # requirements
+    # - IMPORTANT: it must be a list.
+    workflow_object.requirements = [ cwlgen.SubworkflowFeatureRequirement() ]
+    # steps
+    step1 = cwlgen.workflow.WorkflowStep(
+                        step_id="step1",
+                        run="cwl/step1.cwl"
+                        )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_python_file", source="step1_python_file") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_train_dataset", source="step1_input_train_dataset") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
+    workflow_object.steps.append( step1 )
+    step2 = cwlgen.workflow.WorkflowStep(
+                        step_id="step2",
+                        run="cwl/step2.cwl"
+                        )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_search_results") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
+    workflow_object.steps.append( step2 )
+    step3 = cwlgen.workflow.WorkflowStep(
+                        step_id="step3",
+                        run="cwl/step3.cwl"
+                        )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_python_file", source="step3_python_file") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_model", source="step2/step2_output_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_search_results", source="step2/step2_output_search_results") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_search_results") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
+    workflow_object.steps.append( step3 )
+    # inputs
+    workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step1_python_file",
+                                        label="step1_python_file",
+                                        doc="Python file corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_python_file )
+    workflow_input_step1_input_train_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_train_dataset",
+                                        label="step1_input_train_dataset",
+                                        doc="Train dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_train_dataset )
+    workflow_input_step1_input_test_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_test_dataset",
+                                        label="step1_input_test_dataset",
+                                        doc="Test dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_test_dataset )
+    workflow_input_step2_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step2_python_file",
+                                        label="step2_python_file",
+                                        doc="Python file corresponding to the step 2",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step2_python_file )
+    workflow_input_step3_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step3_python_file",
+                                        label="step3_python_file",
+                                        doc="Python file corresponding to the step 3",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step3_python_file )
+    # outputs
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                output_source="step3/step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                doc="Train dataset in CSV format with the final predictions",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                output_source="step3/step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                doc="Test dataset in CSV format with the final predictions",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_model",
+                                output_source="step3/step3_output_model",
+                                label="step3_output_model",
+                                doc="Best model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_search_results",
+                                output_source="step3/step3_output_search_results",
+                                label="step3_output_search_results",
+                                doc="Results of all combinations of the search in CSV format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    return PlainTextResponse(workflow_object.export_string())
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.cwl file: " + str(e), status_code = 500)
+
+@app.route('/HyperparameterSearch/generateMainYml/{train_dataset_name:str}/{test_dataset_name:str}', methods=['GET'])
+async def HyperparameterSearchGenerateMainYml(request):
+  try:
+    main_yml_file_content = "step1_python_file:\n  class: File\n  path: python/step1.py\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_train_dataset:\n  class: File\n  path: files/" + request.path_params['train_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_test_dataset:\n  class: File\n  path: files/" + request.path_params['test_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step2_python_file:\n  class: File\n  path: python/step2.py\n"
+    main_yml_file_content = main_yml_file_content + "step3_python_file:\n  class: File\n  path: python/step3.py\n"
+    return PlainTextResponse(main_yml_file_content)
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
+
+###################################################################################################
+###################################################################################################
+################ ROUTES FOR HISTOGRAM-BASED GRADIENT BOOSTING CLASSIFIER TECHNIQUE ################
+###################################################################################################
+###################################################################################################
+
+@app.route('/HistGradientBoostingClassifier/getStepCwl/{step_number:int}', methods=['GET'])
+async def HistGradientBoostingClassifierGetStepCwl(request):
+  # step_number must be between 1 and 3 (both included).
+  step_number_param = request.path_params['step_number']
+  if (step_number_param < 1) or (step_number_param > 3):
+    return Response("ERROR: the 'step_number' parameter must be an integer between 1 and 3 (both included).", status_code = 500)
+  try:
+    # CommandLineTool
+    step = cwlgen.CommandLineTool(
+                  tool_id='step' + str(step_number_param),
+                  base_command='python',
+                  label="step" + str(step_number_param),
+                  doc="CWL file to automatically run the step " + str(step_number_param),
+                  cwl_version="v1.0"
+                  )
+    # namespaces
+    step_namespace = cwlgen.Namespaces()
+    step_namespace.name = "$namespaces"
+    step_namespace.s = "http://phenomics.kcl.ac.uk/phenoflow/"
+    step.namespaces = step_namespace
+    # requirements
+    # - IMPORTANT: it must be a list.
+    step.requirements = [ cwlgen.DockerRequirement(docker_pull="continuumio/anaconda3:2024.10-1") ]
+    # metadata
+    if (step_number_param == 1):
+      metadata = {'type' : 'load'}
+    elif (step_number_param == 2):
+      metadata = {'type' : 'logic'}
+    elif (step_number_param == 3):
+      metadata = {'type' : 'output'}
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (metadata): this should never happen.", status_code = 500)
+    step.metadata = cwlgen.Metadata(**metadata)
+    # inputs
+    step_python_file = cwlgen.CommandInputParameter(
+                              param_id='step' + str(step_number_param) + '_python_file',
+                              label='step' + str(step_number_param) + '_python_file',
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=1),
+                              doc='Python file corresponding to the step ' + str(step_number_param)
+                              )
+    step.inputs.append(step_python_file)
+    if (step_number_param == 1):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_train_dataset",
+                              label="step1_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_test_dataset",
+                              label="step1_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_test_dataset)
+    elif (step_number_param == 2):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_train_dataset",
+                              label="step2_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_test_dataset",
+                              label="step2_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
+    elif (step_number_param == 3):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_train_dataset_with_predictions",
+                              label="step3_input_train_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_test_dataset_with_predictions",
+                              label="step3_input_test_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_model = cwlgen.CommandInputParameter(
+                              param_id="step3_input_model",
+                              label="step3_input_model",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Model in joblib format"
+                              )
+      step.inputs.append(step_input_model)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
+    # outputs
+    if (step_number_param == 1):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_train_dataset",
+                                label="step1_output_train_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_train_dataset.csv"),
+                                doc="Output train dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_test_dataset",
+                                label="step1_output_test_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_test_dataset.csv"),
+                                doc="Output test dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
+    elif (step_number_param == 2):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_train_dataset_with_predictions",
+                                label="step2_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_train_dataset_with_predictions.csv"),
+                                doc="Output train dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_test_dataset_with_predictions",
+                                label="step2_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_test_dataset_with_predictions.csv"),
+                                doc="Output test dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_model = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_model",
+                                label="step2_output_model",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_model.joblib"),
+                                doc="Model in joblib format"
+                                )
+      step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    elif (step_number_param == 3):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_train_dataset_with_predictions.csv"),
+                                doc="Train dataset in CSV format with the final predictions"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_test_dataset_with_predictions.csv"),
+                                doc="Test dataset in CSV format with the final predictions"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_model = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_model",
+                                label="step3_output_model",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*.joblib"),
+                                doc="Model in joblib format"
+                                )
+      step.outputs.append(step_output_model)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
+    return PlainTextResponse(step.export_string())
+  except Exception as e:
+    return Response("ERROR generating step" + str(step_number_param) + ".cwl file: " + str(e), status_code = 500)
+
+@app.route('/HistGradientBoostingClassifier/getMainCwl', methods=['GET'])
+async def HistGradientBoostingClassifierGetMainCwl(request):
+  try:
+    # Workflow
+    workflow_object = cwlgen.workflow.Workflow(
+                      workflow_id="HistGradientBoostingClassifier_workflow",
+                      label="HistGradientBoostingClassifier_workflow",
+                      doc="Main workflow for the Histogram-based Gradient Boosting Classifier technique",
+                      cwl_version="v1.0"
+                      )
+    # requirements
+    # - IMPORTANT: it must be a list.
+    workflow_object.requirements = [ cwlgen.SubworkflowFeatureRequirement() ]
+    # steps
+    step1 = cwlgen.workflow.WorkflowStep(
+                        step_id="step1",
+                        run="cwl/step1.cwl"
+                        )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_python_file", source="step1_python_file") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_train_dataset", source="step1_input_train_dataset") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
+    workflow_object.steps.append( step1 )
+    step2 = cwlgen.workflow.WorkflowStep(
+                        step_id="step2",
+                        run="cwl/step2.cwl"
+                        )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_model") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
+    workflow_object.steps.append( step2 )
+    step3 = cwlgen.workflow.WorkflowStep(
+                        step_id="step3",
+                        run="cwl/step3.cwl"
+                        )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_python_file", source="step3_python_file") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_model", source="step2/step2_output_model") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_model") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
+    workflow_object.steps.append( step3 )
+    # inputs
+    workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step1_python_file",
+                                        label="step1_python_file",
+                                        doc="Python file corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_python_file )
+    workflow_input_step1_input_train_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_train_dataset",
+                                        label="step1_input_train_dataset",
+                                        doc="Train dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_train_dataset )
+    workflow_input_step1_input_test_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_test_dataset",
+                                        label="step1_input_test_dataset",
+                                        doc="Test dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_test_dataset )
+    workflow_input_step2_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step2_python_file",
+                                        label="step2_python_file",
+                                        doc="Python file corresponding to the step 2",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step2_python_file )
+    workflow_input_step3_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step3_python_file",
+                                        label="step3_python_file",
+                                        doc="Python file corresponding to the step 3",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step3_python_file )
+    # outputs
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                output_source="step3/step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                doc="Train dataset in CSV format with the final predictions",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                output_source="step3/step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                doc="Test dataset in CSV format with the final predictions",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_model",
+                                output_source="step3/step3_output_model",
+                                label="step3_output_model",
+                                doc="Model in joblib format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    return PlainTextResponse(workflow_object.export_string())
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.cwl file: " + str(e), status_code = 500)
+
+@app.route('/HistGradientBoostingClassifier/generateMainYml/{train_dataset_name:str}/{test_dataset_name:str}', methods=['GET'])
+async def HistGradientBoostingClassifierGenerateMainYml(request):
+  try:
+    main_yml_file_content = "step1_python_file:\n  class: File\n  path: python/step1.py\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_train_dataset:\n  class: File\n  path: files/" + request.path_params['train_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_test_dataset:\n  class: File\n  path: files/" + request.path_params['test_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step2_python_file:\n  class: File\n  path: python/step2.py\n"
+    main_yml_file_content = main_yml_file_content + "step3_python_file:\n  class: File\n  path: python/step3.py\n"
+    return PlainTextResponse(main_yml_file_content)
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
+
+############################################################################
+############################################################################
+################ ROUTES FOR CLASSIFIER COMPARISON TECHNIQUE ################
+############################################################################
+############################################################################
+
+@app.route('/ClassifierComparison/getStepCwl/{step_number:int}', methods=['GET'])
+async def ClassifierComparisonGetStepCwl(request):
+  # step_number must be between 1 and 3 (both included).
+  step_number_param = request.path_params['step_number']
+  if (step_number_param < 1) or (step_number_param > 3):
+    return Response("ERROR: the 'step_number' parameter must be an integer between 1 and 3 (both included).", status_code = 500)
+  try:
+    # CommandLineTool
+    step = cwlgen.CommandLineTool(
+                  tool_id='step' + str(step_number_param),
+                  base_command='python',
+                  label="step" + str(step_number_param),
+                  doc="CWL file to automatically run the step " + str(step_number_param),
+                  cwl_version="v1.0"
+                  )
+    # namespaces
+    step_namespace = cwlgen.Namespaces()
+    step_namespace.name = "$namespaces"
+    step_namespace.s = "http://phenomics.kcl.ac.uk/phenoflow/"
+    step.namespaces = step_namespace
+    # requirements
+    # - IMPORTANT: it must be a list.
+    step.requirements = [ cwlgen.DockerRequirement(docker_pull="continuumio/anaconda3:2024.10-1") ]
+    # metadata
+    if (step_number_param == 1):
+      metadata = {'type' : 'load'}
+    elif (step_number_param == 2):
+      metadata = {'type' : 'logic'}
+    elif (step_number_param == 3):
+      metadata = {'type' : 'output'}
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (metadata): this should never happen.", status_code = 500)
+    step.metadata = cwlgen.Metadata(**metadata)
+    # inputs
+    step_python_file = cwlgen.CommandInputParameter(
+                              param_id='step' + str(step_number_param) + '_python_file',
+                              label='step' + str(step_number_param) + '_python_file',
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=1),
+                              doc='Python file corresponding to the step ' + str(step_number_param)
+                              )
+    step.inputs.append(step_python_file)
+    if (step_number_param == 1):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_train_dataset",
+                              label="step1_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step1_input_test_dataset",
+                              label="step1_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 1"
+                              )
+      step.inputs.append(step_input_test_dataset)
+    elif (step_number_param == 2):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_train_dataset",
+                              label="step2_input_train_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step2_input_test_dataset",
+                              label="step2_input_test_dataset",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_schema = cwlgen.CommandInputParameter(
+                              param_id="step2_input_schema",
+                              label="step2_input_schema",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Schema of the train and test datasets corresponding to the step 2"
+                              )
+      step.inputs.append(step_input_schema)
+    elif (step_number_param == 3):
+      step_input_train_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_train_dataset_with_predictions",
+                              label="step3_input_train_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=2),
+                              doc="Input train dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_train_dataset)
+      step_input_test_dataset = cwlgen.CommandInputParameter(
+                              param_id="step3_input_test_dataset_with_predictions",
+                              label="step3_input_test_dataset_with_predictions",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=3),
+                              doc="Input test dataset corresponding to the step 3 (with predictions)"
+                              )
+      step.inputs.append(step_input_test_dataset)
+      step_input_comparison_summary = cwlgen.CommandInputParameter(
+                              param_id="step3_input_comparison_summary",
+                              label="step3_input_comparison_summary",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=4),
+                              doc="Time taken and metrics of all the classifiers in CSV format"
+                              )
+      step.inputs.append(step_input_comparison_summary)
+      step_input_cpu_setting = cwlgen.CommandInputParameter(
+                              param_id="step3_input_cpu_setting",
+                              label="step3_input_cpu_setting",
+                              param_type='File',
+                              input_binding=cwlgen.CommandLineBinding(position=5),
+                              doc="CPU setting used by the step 2 in JSON format"
+                              )
+      step.inputs.append(step_input_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_inputs): this should never happen.", status_code = 500)
+    # outputs
+    if (step_number_param == 1):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_train_dataset",
+                                label="step1_output_train_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_train_dataset.csv"),
+                                doc="Output train dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_test_dataset",
+                                label="step1_output_test_dataset",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_test_dataset.csv"),
+                                doc="Output test dataset corresponding to the step 1"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_schema = cwlgen.CommandOutputParameter(
+                                param_id="step1_output_schema",
+                                label="step1_output_schema",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_schema.json"),
+                                doc="Schema of the train and test datasets (names and types of their attributes) in JSON format"
+                                )
+      step.outputs.append(step_output_schema)
+    elif (step_number_param == 2):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_train_dataset_with_predictions",
+                                label="step2_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_train_dataset_with_predictions.csv"),
+                                doc="Output train dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_test_dataset_with_predictions",
+                                label="step2_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_test_dataset_with_predictions.csv"),
+                                doc="Output test dataset corresponding to the step 2 (with predictions)"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_comparison_summary = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_comparison_summary",
+                                label="step2_output_comparison_summary",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_comparison_summary.csv"),
+                                doc="Time taken and metrics of all the classifiers in CSV format"
+                                )
+      step.outputs.append(step_output_comparison_summary)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step2_output_cpu_setting",
+                                label="step2_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="step2_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    elif (step_number_param == 3):
+      step_output_train_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_train_dataset_with_predictions.csv"),
+                                doc="Train dataset in CSV format with the predictions of all the classifiers"
+                                )
+      step.outputs.append(step_output_train_data)
+      step_output_test_data = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_test_dataset_with_predictions.csv"),
+                                doc="Test dataset in CSV format with the predictions of all the classifiers"
+                                )
+      step.outputs.append(step_output_test_data)
+      step_output_comparison_summary = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_comparison_summary",
+                                label="step3_output_comparison_summary",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_comparison_summary.csv"),
+                                doc="Time taken and metrics of all the classifiers in CSV format"
+                                )
+      step.outputs.append(step_output_comparison_summary)
+      step_output_cpu_setting = cwlgen.CommandOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                param_type='File',
+                                output_binding=cwlgen.CommandOutputBinding(glob="*_output_cpu_setting.json"),
+                                doc="CPU setting used by the step 2 in JSON format"
+                                )
+      step.outputs.append(step_output_cpu_setting)
+    else:
+      # We checked at the beginning that 'step_number_param' parameter is ok. This should never happen.
+      return Response("CRITICAL ERROR (step_output): this should never happen.", status_code = 500)
+    return PlainTextResponse(step.export_string())
+  except Exception as e:
+    return Response("ERROR generating step" + str(step_number_param) + ".cwl file: " + str(e), status_code = 500)
+
+@app.route('/ClassifierComparison/getMainCwl', methods=['GET'])
+async def ClassifierComparisonGetMainCwl(request):
+  try:
+    # Workflow
+    workflow_object = cwlgen.workflow.Workflow(
+                      workflow_id="ClassifierComparison_workflow",
+                      label="ClassifierComparison_workflow",
+                      doc="Main workflow for the Classifier Comparison technique",
+                      cwl_version="v1.0"
+                      )
+    # requirements
+    # - IMPORTANT: it must be a list.
+    workflow_object.requirements = [ cwlgen.SubworkflowFeatureRequirement() ]
+    # steps
+    step1 = cwlgen.workflow.WorkflowStep(
+                        step_id="step1",
+                        run="cwl/step1.cwl"
+                        )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_python_file", source="step1_python_file") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_train_dataset", source="step1_input_train_dataset") )
+    step1.inputs.append( cwlgen.WorkflowStepInput(input_id="step1_input_test_dataset", source="step1_input_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_train_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_test_dataset") )
+    step1.out.append( cwlgen.WorkflowStepOutput(output_id="step1_output_schema") )
+    workflow_object.steps.append( step1 )
+    step2 = cwlgen.workflow.WorkflowStep(
+                        step_id="step2",
+                        run="cwl/step2.cwl"
+                        )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_python_file", source="step2_python_file") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_train_dataset", source="step1/step1_output_train_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_test_dataset", source="step1/step1_output_test_dataset") )
+    step2.inputs.append( cwlgen.WorkflowStepInput(input_id="step2_input_schema", source="step1/step1_output_schema") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_train_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_test_dataset_with_predictions") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_comparison_summary") )
+    step2.out.append( cwlgen.WorkflowStepOutput(output_id="step2_output_cpu_setting") )
+    workflow_object.steps.append( step2 )
+    step3 = cwlgen.workflow.WorkflowStep(
+                        step_id="step3",
+                        run="cwl/step3.cwl"
+                        )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_python_file", source="step3_python_file") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_train_dataset_with_predictions", source="step2/step2_output_train_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_test_dataset_with_predictions", source="step2/step2_output_test_dataset_with_predictions") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_comparison_summary", source="step2/step2_output_comparison_summary") )
+    step3.inputs.append( cwlgen.WorkflowStepInput(input_id="step3_input_cpu_setting", source="step2/step2_output_cpu_setting") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_train_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_test_dataset_with_predictions") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_comparison_summary") )
+    step3.out.append( cwlgen.WorkflowStepOutput(output_id="step3_output_cpu_setting") )
+    workflow_object.steps.append( step3 )
+    # inputs
+    workflow_input_step1_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step1_python_file",
+                                        label="step1_python_file",
+                                        doc="Python file corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_python_file )
+    workflow_input_step1_input_train_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_train_dataset",
+                                        label="step1_input_train_dataset",
+                                        doc="Train dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_train_dataset )
+    workflow_input_step1_input_test_dataset = cwlgen.workflow.InputParameter(
+                                        param_id="step1_input_test_dataset",
+                                        label="step1_input_test_dataset",
+                                        doc="Test dataset corresponding to the step 1",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step1_input_test_dataset )
+    workflow_input_step2_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step2_python_file",
+                                        label="step2_python_file",
+                                        doc="Python file corresponding to the step 2",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step2_python_file )
+    workflow_input_step3_python_file = cwlgen.workflow.InputParameter(
+                                        param_id="step3_python_file",
+                                        label="step3_python_file",
+                                        doc="Python file corresponding to the step 3",
+                                        param_type="File"
+                                        )
+    workflow_object.inputs.append( workflow_input_step3_python_file )
+    # outputs
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_train_dataset_with_predictions",
+                                output_source="step3/step3_output_train_dataset_with_predictions",
+                                label="step3_output_train_dataset_with_predictions",
+                                doc="Train dataset in CSV format with the predictions of all the classifiers",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_test_dataset_with_predictions",
+                                output_source="step3/step3_output_test_dataset_with_predictions",
+                                label="step3_output_test_dataset_with_predictions",
+                                doc="Test dataset in CSV format with the predictions of all the classifiers",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_comparison_summary",
+                                output_source="step3/step3_output_comparison_summary",
+                                label="step3_output_comparison_summary",
+                                doc="Time taken and metrics of all the classifiers in CSV format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    workflow_output = cwlgen.workflow.WorkflowOutputParameter(
+                                param_id="step3_output_cpu_setting",
+                                output_source="step3/step3_output_cpu_setting",
+                                label="step3_output_cpu_setting",
+                                doc="CPU setting used by the step 2 in JSON format",
+                                param_type="File"
+                                )
+    workflow_object.outputs.append(workflow_output)
+    return PlainTextResponse(workflow_object.export_string())
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.cwl file: " + str(e), status_code = 500)
+
+@app.route('/ClassifierComparison/generateMainYml/{train_dataset_name:str}/{test_dataset_name:str}', methods=['GET'])
+async def ClassifierComparisonGenerateMainYml(request):
+  try:
+    main_yml_file_content = "step1_python_file:\n  class: File\n  path: python/step1.py\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_train_dataset:\n  class: File\n  path: files/" + request.path_params['train_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step1_input_test_dataset:\n  class: File\n  path: files/" + request.path_params['test_dataset_name'] + "\n"
+    main_yml_file_content = main_yml_file_content + "step2_python_file:\n  class: File\n  path: python/step2.py\n"
+    main_yml_file_content = main_yml_file_content + "step3_python_file:\n  class: File\n  path: python/step3.py\n"
+    return PlainTextResponse(main_yml_file_content)
+  except Exception as e: # Any exception.
+    return Response("ERROR generating main.yml file: " + str(e), status_code = 500)
+
+##########################################################
+##########################################################
+################ ROUTES FOR MODEL SERVING ################
+##########################################################
+##########################################################
+
+@app.route('/predict/{technique:str}', methods=['POST'])
+async def predictBatch(request):
+  # Scores a batch of new instances (CSV or JSON body) with a model written by a workflow of the technique, without running the workflow again.
+  # - Query parameters: 'model' (path of the artefact inside the model store, e.g. 'name_example_id_1_output_model.joblib') and, optionally, 'class_name' (the class is not used to score the instances, and the predictions are called as in the step 2).
+  technique_param = request.path_params['technique']
+  if (technique_param not in predict.TECHNIQUES):
+    return Response("ERROR: the 'technique' parameter must be one of: " + ", ".join(predict.TECHNIQUES) + ".", status_code = 500)
+  if ('model' not in request.query_params):
+    return Response("ERROR: the 'model' parameter is missing.", status_code = 500)
+  class_name_param = request.query_params.get('class_name')
+  try:
+    artefact_path = predict.resolveArtefact(request.query_params['model'])
+    # The model is only loaded (and the artefact only hashed) the first time; the following batches use the cached model.
+    artefact_hash, model = await run_in_threadpool(predict.cache.get, artefact_path)
+    predict.checkTechnique(technique_param, model)
+  except Exception as e:
+    return Response("ERROR loading the model: " + str(e), status_code = 500)
+  content_type = request.headers.get('content-type', '')
+  try:
+    batch = predict.readBatch(await request.body(), content_type)
+    predictions = await run_in_threadpool(predict.score, model, batch, class_name_param)
+  except Exception as e:
+    return Response("ERROR scoring the batch: " + str(e), status_code = 500)
+  # The response has the same format as the batch: the instances with a new attribute (the predictions) in CSV format, or the list of predictions in JSON format.
+  if ("json" in content_type):
+    return JSONResponse({'model': artefact_hash, 'predictions': predictions.tolist()})
+  batch[(class_name_param + "_pred") if class_name_param else "prediction"] = predictions
+  return PlainTextResponse(batch.to_csv(index = False), media_type = "text/csv", headers = {'X-Model-Hash': artefact_hash})
+
+@app.route('/export/{technique:str}', methods=['POST'])
+async def exportModel(request):
+  # Exports a model written by a workflow of the technique to arrays (a .npz file with the same name, next to the model in the model store), which are scored with NumPy only (see api/export.py).
+  # - Query parameters: 'model' (path of the artefact inside the model store). The exported model can then be used in '/predict/{technique}' instead of the original one.
+  technique_param = request.path_params['technique']
+  if (technique_param not in predict.TECHNIQUES):
+    return Response("ERROR: the 'technique' parameter must be one of: " + ", ".join(predict.TECHNIQUES) + ".", status_code = 500)
+  if ('model' not in request.query_params):
+    return Response("ERROR: the 'model' parameter is missing.", status_code = 500)
+  try:
+    artefact_path = predict.resolveArtefact(request.query_params['model'])
+    if artefact_path.endswith(".npz"):
+      raise ValueError("the model is already exported.")
+    artefact_hash, model = await run_in_threadpool(predict.cache.get, artefact_path)
+    predict.checkTechnique(technique_param, model)
+    export_path = os.path.splitext(artefact_path)[0] + ".npz"
+    await run_in_threadpool(export.saveModel, model, export_path)
+  except Exception as e:
+    return Response("ERROR exporting the model: " + str(e), status_code = 500)
+  return JSONResponse({'model': artefact_hash, 'export': os.path.relpath(export_path, predict.modelStorePath())})
@@ -0,0 +1,54 @@
+import unittest, os, tempfile
+import numpy, pandas
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from api import export
+
+class ExportTests(unittest.TestCase):
+  def setUp(self):
+    generator = numpy.random.default_rng(0)
+    self.dataset = pandas.DataFrame({"a":generator.integers(0, 10, 600), "b":generator.normal(size=600), "c":generator.normal(size=600)})
+    self.binary_class = numpy.where(self.dataset["a"] + self.dataset["b"] > 4, "positive", "negative")
+    self.multiclass_class = numpy.digitize(self.dataset["b"] + self.dataset["c"], [-1, 0, 1])
+
+  def assertSamePredictions(self, model, y):
+    model.fit(self.dataset[:400], y[:400])
+    with tempfile.TemporaryDirectory() as directory:
+      export.saveModel(model, os.path.join(directory, "model.npz"))
+      exported_model = export.loadModel(os.path.join(directory, "model.npz"))
+    assert exported_model.model_type == type(model).__name__
+    assert exported_model.predict(self.dataset[400:]).tolist() == model.predict(self.dataset[400:]).tolist()
+    # The attributes are selected by name (in any order), or by position if they have no names.
+    assert exported_model.predict(self.dataset[["c", "b", "a"]]).tolist() == model.predict(self.dataset).tolist()
+    assert exported_model.predict(self.dataset.to_numpy()).tolist() == model.predict(self.dataset).tolist()
+
+  def test_export_trees(self):
+    for y in [self.binary_class, self.multiclass_class]:
+      self.assertSamePredictions(DecisionTreeClassifier(random_state=1), y)
+      self.assertSamePredictions(RandomForestClassifier(n_estimators=20, random_state=1), y)
+      self.assertSamePredictions(GradientBoostingClassifier(n_estimators=20, random_state=1), y)
+
+  def test_export_gradient_boosting_init(self):
+    # The initial prediction is exported with the default init estimator (also with the exponential loss) and with init='zero'; any other init estimator is rejected,
+    # since its prediction may be different for each instance.
+    for y in [self.binary_class, self.multiclass_class]:
+      self.assertSamePredictions(GradientBoostingClassifier(n_estimators=20, init="zero", random_state=1), y)
+    self.assertSamePredictions(GradientBoostingClassifier(n_estimators=20, loss="exponential", random_state=1), self.binary_class)
+    with self.assertRaises(ValueError):
+      export.exportModel(GradientBoostingClassifier(n_estimators=20, init=LogisticRegression(), random_state=1).fit(self.dataset, self.binary_class))
+
+  def test_export_linear(self):
+    for y in [self.binary_class, self.multiclass_class]:
+      self.assertSamePredictions(LogisticRegression(random_state=1), y)
+
+  def test_export_missing_values(self):
+    dataset = self.dataset.copy()
+    dataset.loc[::7, "b"] = numpy.nan
+    model = DecisionTreeClassifier(random_state=1).fit(dataset[:400], self.binary_class[:400])
+    assert export.NumpyModel(export.exportModel(model)).predict(dataset[400:]).tolist() == model.predict(dataset[400:]).tolist()
+
+  def test_export_unsupported(self):
+    with self.assertRaises(ValueError):
+      export.exportModel(SVC().fit(self.dataset, self.binary_class))
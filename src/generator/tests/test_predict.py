@@ -0,0 +1,79 @@
+import unittest, os, io, tempfile
+import numpy, pandas, joblib
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.svm import LinearSVC
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import Pipeline, make_pipeline
+from starlette.testclient import TestClient
+from api import routes, predict
+
+class PredictTests(unittest.TestCase):
+  def setUp(self):
+    self.model_store = tempfile.TemporaryDirectory()
+    os.environ["PHENOFLOW_MODEL_STORE"] = self.model_store.name
+    generator = numpy.random.default_rng(0)
+    self.train_dataset = pandas.DataFrame({"a":generator.integers(0, 10, 200), "b":generator.normal(size=200)})
+    self.train_dataset["Class"] = numpy.where(self.train_dataset["a"] > 4, "positive", "negative")
+    self.model = DecisionTreeClassifier(random_state=1).fit(self.train_dataset[["a", "b"]], self.train_dataset["Class"])
+    joblib.dump(self.model, os.path.join(self.model_store.name, "name_example_id_1_output_model.joblib"))
+    predict.cache.models.clear()
+
+  def tearDown(self):
+    del os.environ["PHENOFLOW_MODEL_STORE"]
+    self.model_store.cleanup()
+
+  def test_predict_csv(self):
+    client = TestClient(routes.app)
+    response = client.post('/predict/DecisionTreeClassifier?model=name_example_id_1_output_model.joblib&class_name=Class', data=self.train_dataset.to_csv(index=False), headers={'content-type':'text/csv'})
+    assert response.status_code == 200
+    scored_dataset = pandas.read_csv(io.StringIO(response.text))
+    assert scored_dataset["Class_pred"].tolist() == self.model.predict(self.train_dataset[["a", "b"]]).tolist()
+
+  def test_predict_json_cached(self):
+    client = TestClient(routes.app)
+    instances = self.train_dataset[["b", "a"]].head(5).to_dict(orient="records")
+    for _ in range(2):
+      response = client.post('/predict/DecisionTreeClassifier?model=name_example_id_1_output_model.joblib', json=instances)
+      assert response.status_code == 200
+      assert response.json()["predictions"] == self.model.predict(self.train_dataset[["a", "b"]].head(5)).tolist()
+    # The model was only loaded once.
+    assert len(predict.cache.models) == 1
+
+  def test_predict_svc_approximation(self):
+    # SVC with a kernel approximation writes a pipeline instead of an SVC.
+    model = make_pipeline(Nystroem(n_components=20, random_state=1), LinearSVC(random_state=1)).fit(self.train_dataset[["a", "b"]], self.train_dataset["Class"])
+    joblib.dump(model, os.path.join(self.model_store.name, "name_svc_id_2_output_model.joblib"))
+    client = TestClient(routes.app)
+    response = client.post('/predict/SVC?model=name_svc_id_2_output_model.joblib', json=self.train_dataset.to_dict(orient="records"))
+    assert response.status_code == 200
+    assert response.json()["predictions"] == model.predict(self.train_dataset[["a", "b"]]).tolist()
+
+  def test_predict_logistic_regression_out_of_core(self):
+    # The out-of-core Logistic Regression writes a pipeline of a scaler and a classifier, fitted separately (one chunk at a time).
+    scaler = StandardScaler().partial_fit(self.train_dataset[["a", "b"]])
+    classifier = SGDClassifier(loss="log_loss", random_state=1).partial_fit(scaler.transform(self.train_dataset[["a", "b"]]), self.train_dataset["Class"], classes=numpy.unique(self.train_dataset["Class"]))
+    model = Pipeline([("scaler", scaler), ("classifier", classifier)])
+    joblib.dump(model, os.path.join(self.model_store.name, "name_lr_id_3_output_model.joblib"))
+    client = TestClient(routes.app)
+    response = client.post('/predict/LogisticRegression?model=name_lr_id_3_output_model.joblib', json=self.train_dataset.to_dict(orient="records"))
+    assert response.status_code == 200
+    assert response.json()["predictions"] == model.predict(self.train_dataset[["a", "b"]]).tolist()
+
+  def test_predict_invalid_model(self):
+    client = TestClient(routes.app)
+    assert client.post('/predict/DecisionTreeClassifier?model=../outside.joblib', json=[]).status_code == 500
+    assert client.post('/predict/SVC?model=name_example_id_1_output_model.joblib', json=[]).status_code == 500
+
+  def test_export(self):
+    client = TestClient(routes.app)
+    response = client.post('/export/DecisionTreeClassifier?model=name_example_id_1_output_model.joblib')
+    assert response.status_code == 200
+    assert response.json()["export"] == "name_example_id_1_output_model.npz"
+    # The exported model is served instead of the original one, with the same predictions.
+    response = client.post('/predict/DecisionTreeClassifier?model=name_example_id_1_output_model.npz', json=self.train_dataset.to_dict(orient="records"))
+    assert response.status_code == 200
+    assert response.json()["predictions"] == self.model.predict(self.train_dataset[["a", "b"]]).tolist()
+    assert client.post('/predict/SVC?model=name_example_id_1_output_model.npz', json=[]).status_code == 500
+    assert client.post('/export/DecisionTreeClassifier?model=name_example_id_1_output_model.npz').status_code == 500
@@ -61,6 +61,9 @@ const GradientBoostingClassifier = require("./routes/GradientBoostingClassifier"
 const RandomForestClassifier = require("./routes/RandomForestClassifier")
 const SVC = require("./routes/SVC")
 const DecisionTreeClassifier = require("./routes/DecisionTreeClassifier")
+const HyperparameterSearch = require("./routes/HyperparameterSearch")
+const HistGradientBoostingClassifier = require("./routes/HistGradientBoostingClassifier")
+const ClassifierComparison = require("./routes/ClassifierComparison")
 
 const app = express();
 app.enable('strict routing');
@@ -94,6 +97,9 @@ router.use("/GradientBoostingClassifier", GradientBoostingClassifier)
 router.use("/RandomForestClassifier", RandomForestClassifier)
 router.use("/SVC", SVC)
 router.use("/DecisionTreeClassifier", DecisionTreeClassifier)
+router.use("/HyperparameterSearch", HyperparameterSearch)
+router.use("/HistGradientBoostingClassifier", HistGradientBoostingClassifier)
+router.use("/ClassifierComparison", ClassifierComparison)
 
 app.use("/phenoflow", router);
 app.use("/phenoflowml", router);
@@ -35,6 +35,15 @@ const path = require('path');
  *               random_state:
  *                 type: integer
  *                 description: The random seed for the ML algorithm
+ *               chunk_size:
+ *                 type: integer
+ *                 description: Number of instances of the test dataset read and predicted at once, so that the memory used does not depend on the size of the test dataset (default 100000). The predictions do not depend on this value
+ *                 minimum: 1
+ *               compression:
+ *                 type: integer
+ *                 description: Compression level of the model file (joblib format), from 0 to 9 (default 0). An uncompressed model can be loaded with its numpy arrays memory-mapped
+ *                 minimum: 0
+ *                 maximum: 9
  *               replace:
  *                 type: boolean
  *                 description: If replace is true and the phenotype name already exists, the phenotype will be completely replaced; if replace is false and the phenotype name already exists, an HTTP 500 response code will be returned
@@ -65,6 +74,14 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
     if ( Number.isNaN(req_body_random_state) || (req_body_random_state < 0) ) {
         return res.status(500).send("Error: random_state parameter must be greater or equal than 0.")
     }
+    var req_body_chunk_size = req.body.chunk_size ? Number.parseInt(req.body.chunk_size) : 100000
+    if( !Number.isInteger(req_body_chunk_size) || (req_body_chunk_size < 1) ) {
+        return res.status(500).send("Error: chunk_size parameter must be an integer greater or equal than 1.")
+    }
+    var req_body_compression = req.body.compression ? Number.parseInt(req.body.compression) : 0
+    if( !Number.isInteger(req_body_compression) || (req_body_compression < 0) || (req_body_compression > 9) ) {
+        return res.status(500).send("Error: compression parameter must be an integer between 0 and 9.")
+    }
     if ( (req.body.replace.toLowerCase() !== "true") && (req.body.replace.toLowerCase() !== "false") ) {
         return res.status(500).send("Error: replace parameter is not valid (see documentation).")
     }
@@ -135,7 +152,7 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"The same .csv files, since the datasets are already preprocessed and in csv format.", extension:"csv", stepId:step_id});
+        await models.output.create({doc:"The same .csv files, since the datasets are already preprocessed and in csv format, and a .json file with their schema (names and types of the attributes).", extension:"csv", stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
@@ -190,7 +207,7 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"The train and test datasets with a new attribute (the predictions) and the ML model in pickle format.", extension:"csv", stepId:step_id});
+        await models.output.create({doc:"The train and test datasets with a new attribute (the predictions), the ML model in joblib format and the CPU setting used (in json format).", extension:"csv", stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 2: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
@@ -201,7 +218,7 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
     dest_implementation_file_path = implementation_files_folder_path + "/" + implementation_file_name
     try{
         source_file_content = await fs.readFile(source_implementation_file_path, "utf8")
-        regex = /<CLASS_NAME>|<RANDOM_STATE>|/g
+        regex = /<CLASS_NAME>|<RANDOM_STATE>|<CHUNK_SIZE>|<COMPRESSION>|/g
         new_source_file_content = source_file_content.replaceAll(regex, (match) => {
             if (match === "<CLASS_NAME>") {
                 if (
@@ -214,6 +231,10 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
                 }
             } else if (match === "<RANDOM_STATE>") {
                 return req_body_random_state
+            } else if (match === "<CHUNK_SIZE>") {
+                return req_body_chunk_size.toString()
+            } else if (match === "<COMPRESSION>") {
+                return req_body_compression.toString()
             } else {
                 return match;
             }
@@ -231,9 +252,9 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
         logger.debug(error);
         return res.status(500).send(error);
     }
-    // Step 3: OUTPUT STEP: write the datasets with predictions and the model in pickle format.
+    // Step 3: OUTPUT STEP: write the datasets with predictions and the model in joblib format.
     var step_name = "step_3_output"
-    var step_description = "Write the train and test datasets with predictions (in csv format) and the model in pickle format."
+    var step_description = "Write the train and test datasets with predictions (in csv format), the model in joblib format and the CPU setting used by the step 2 (in json format)."
     var step_type = "output"
     try {
         var step = await models.step.create({name:step_name, doc:step_description, type:step_type, workflowId:workflow_id, position:3});
@@ -244,14 +265,14 @@ router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algo
         return res.status(500).send(error);
     }
     try {
-        await models.input.create({doc:"The train and test datasets with predictions (in csv format) and the model in pickle format.", stepId:step_id});
+        await models.input.create({doc:"The train and test datasets with predictions (in csv format), the model in joblib format and the CPU setting used by the step 2 (in json format).", stepId:step_id});
     } catch(error) {
         error = "Error creating the input for step 3: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"The train and test datasets with predictions (in csv format) and the model in pickle format.", extension:"csv", stepId:step_id});
+        await models.output.create({doc:"The train and test datasets with predictions (in csv format), the model in joblib format and the CPU setting used by the step 2 (in json format).", extension:"csv", stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 3: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
@@ -35,19 +35,38 @@ const path = require('path');
  *                 minimum: 2
  *               clustering_algorithm:
  *                 type: string
- *                 description: Clustering algorithm to apply over the input dataset
- *                 enum: [kmeans]
+ *                 description: Clustering algorithm to apply over the input dataset (minibatchkmeans is the large-data mode, in which the dataset is never loaded completely in memory)
+ *                 enum: [kmeans, minibatchkmeans]
  *               match_function:
  *                 type: string
- *                 description: Match function to apply between the clusters of different partitions
+ *                 description: Match function used to select the final candidate clusters (the matrix of matches generated in the step 3 contains the values of match of all match functions)
  *                 enum: [jaccard, jaccard2, dice]
  *               random_seed:
  *                 type: number
- *                 description: Seed for the generation of random numbers
+ *                 description: Seed for the generation of random numbers (steps and fused engines)
  *                 minimum: 0
  *               threshold:
  *                 type: number
  *                 description: Minimum threshold value used to filter and obtain the final candidate clusters
+ *               partitions_format:
+ *                 type: string
+ *                 description: Format of the partitions generated in the step 2, either a json file with the indices of the instances of each cluster or a (much smaller) npy file with the label matrix (default json)
+ *                 enum: [json, npy]
+ *               n_jobs:
+ *                 type: integer
+ *                 description: Number of processes used to generate the partitions in parallel in the step 2, where -1 means all available CPUs (default -1). The partitions obtained do not depend on this value
+ *               chunk_size:
+ *                 type: integer
+ *                 description: Number of instances read at once from the input dataset when clustering_algorithm is minibatchkmeans (default 100000)
+ *                 minimum: 1
+ *               engine:
+ *                 type: string
+ *                 description: Either a workflow with the five steps of the technique (steps), a workflow with only one step that runs the whole technique in the same process, without intermediate files (fused), or a workflow with only one step that runs the whole technique with all random seeds in random_seeds and writes, for each instance, the frequency with which it belongs to a final candidate cluster (consensus). The steps and fused engines produce the same output file (default steps). The fused and consensus engines only support the kmeans clustering algorithm
+ *                 enum: [steps, fused, consensus]
+ *               random_seeds:
+ *                 type: string
+ *                 description: Comma-separated list of distinct seeds for the generation of random numbers, used instead of random_seed (which is not required) by the consensus engine. The partitions of all seeds are generated in parallel (see n_jobs)
+ *                 example: 34,35,36,37
  *               replace:
  *                 type: boolean
  *                 description: If replace is true and the phenotype name already exists, the phenotype will be completely replaced; if replace is false and the phenotype name already exists, an HTTP 500 response code will be returned
@@ -71,14 +90,14 @@ const path = require('path');
  */
  router.post('/addPhenotype', jwt({secret:config.get("jwt.RSA_PRIVATE_KEY"), algorithms:['RS256']}), async function(req, res, next) {
     req.setTimeout(0);
-    if ( !req.body.k || !req.body.clustering_algorithm || !req.body.match_function || !req.body.random_seed || !req.body.threshold || !req.body.replace || !req.body.name || !req.body.about || !req.body.userName ) {
+    if ( !req.body.k || !req.body.clustering_algorithm || !req.body.match_function || !req.body.threshold || !req.body.replace || !req.body.name || !req.body.about || !req.body.userName ) {
         return res.status(500).send("Missing parameters (see documentation).")
     }
     var req_body_k = Number.parseInt(req.body.k)
     if( !Number.isInteger(req_body_k) || (req_body_k < 2) ) {
         return res.status(500).send("Error: k parameter must be an integer greater or equal than 2.")
     }
-    const valid_clustering_algorithms = new Set(['kmeans'])
+    const valid_clustering_algorithms = new Set(['kmeans', 'minibatchkmeans'])
     if ( !valid_clustering_algorithms.has(req.body.clustering_algorithm) ) {
         return res.status(500).send("Error: clustering_algorithm parameter is not valid (see documentation).")
     }
@@ -86,10 +105,6 @@ const path = require('path');
     if ( !valid_match_functions.has(req.body.match_function) ) {
         return res.status(500).send("Error: match_function parameter is not valid (see documentation).")
     }
-    var req_body_random_seed = Number.parseFloat(req.body.random_seed)
-    if ( Number.isNaN(req_body_random_seed) || (req_body_random_seed < 0) ) {
-        return res.status(500).send("Error: random_seed parameter must be greater or equal than 0.")
-    }
     var req_body_threshold = Number.parseFloat(req.body.threshold)
     if ( Number.isNaN(req_body_threshold) ) {
         return res.status(500).send("Error: threshold parameter is not valid (see documentation).")
@@ -97,6 +112,53 @@ const path = require('path');
     if ( (req.body.replace.toLowerCase() !== "true") && (req.body.replace.toLowerCase() !== "false") ) {
         return res.status(500).send("Error: replace parameter is not valid (see documentation).")
     }
+    var req_body_partitions_format = req.body.partitions_format || "json"
+    const valid_partitions_formats = new Set(['json', 'npy'])
+    if ( !valid_partitions_formats.has(req_body_partitions_format) ) {
+        return res.status(500).send("Error: partitions_format parameter is not valid (see documentation).")
+    }
+    var req_body_n_jobs = req.body.n_jobs ? Number.parseInt(req.body.n_jobs) : -1
+    if( !Number.isInteger(req_body_n_jobs) || ((req_body_n_jobs < 1) && (req_body_n_jobs !== -1)) ) {
+        return res.status(500).send("Error: n_jobs parameter must be -1 or an integer greater or equal than 1.")
+    }
+    var req_body_chunk_size = req.body.chunk_size ? Number.parseInt(req.body.chunk_size) : 100000
+    if( !Number.isInteger(req_body_chunk_size) || (req_body_chunk_size < 1) || ((req.body.clustering_algorithm === "minibatchkmeans") && (req_body_chunk_size < req_body_k)) ) {
+        return res.status(500).send("Error: chunk_size parameter must be an integer greater or equal than k.")
+    }
+    var req_body_engine = req.body.engine || "steps"
+    const valid_engines = new Set(['steps', 'fused', 'consensus'])
+    if ( !valid_engines.has(req_body_engine) ) {
+        return res.status(500).send("Error: engine parameter is not valid (see documentation).")
+    }
+    if ( (req_body_engine !== "steps") && (req.body.clustering_algorithm !== "kmeans") ) {
+        return res.status(500).send("Error: the " + req_body_engine + " engine only supports the kmeans clustering algorithm.")
+    }
+    if (req_body_engine === "consensus") {
+        if ( !req.body.random_seeds ) {
+            return res.status(500).send("Error: the consensus engine requires the random_seeds parameter.")
+        }
+        var req_body_random_seeds = req.body.random_seeds.toString().split(",").map((random_seed) => Number.parseFloat(random_seed))
+        if ( req_body_random_seeds.some((random_seed) => Number.isNaN(random_seed) || (random_seed < 0)) ) {
+            return res.status(500).send("Error: random_seeds parameter must be a comma-separated list of numbers greater or equal than 0.")
+        }
+        if ( new Set(req_body_random_seeds).size !== req_body_random_seeds.length ) {
+            return res.status(500).send("Error: random_seeds parameter must not contain the same seed more than once.")
+        }
+    } else {
+        if ( !req.body.random_seed ) {
+            return res.status(500).send("Error: the " + req_body_engine + " engine requires the random_seed parameter.")
+        }
+        var req_body_random_seed = Number.parseFloat(req.body.random_seed)
+        if ( Number.isNaN(req_body_random_seed) || (req_body_random_seed < 0) ) {
+            return res.status(500).send("Error: random_seed parameter must be greater or equal than 0.")
+        }
+    }
+    // Calculation of the values of match between all pairs of clusters of two partitions, depending on the value of the 'match_function' parameter (fused and consensus engines).
+    const values_of_match_calculations = {
+        "jaccard": "divide(intersection_sizes, cluster_sizes_of_partition_k[:, None] + cluster_sizes_of_current_partition[None, :] - intersection_sizes)",
+        "jaccard2": "divide(intersection_sizes, cluster_sizes_of_current_partition[None, :])",
+        "dice": "divide(2*intersection_sizes, cluster_sizes_of_partition_k[:, None] + cluster_sizes_of_current_partition[None, :])"
+    }
     // Check whether the Trace-based clustering phenotype already exists.
     // IMPORTANT: in this point, either no workflow of this type exists or only one exists.
     // - Other workflows with the same name could exist, but they do not correspond to the Trace-based clustering technique (i.e., they were created using other endpoints).
@@ -143,6 +205,86 @@ const path = require('path');
             return res.status(500).send(error);
         }
     }
+    // Fused and consensus engines: only one step, which runs the whole technique (from the dataset to the output in csv format) in the same process.
+    if (req_body_engine !== "steps") {
+        var step_name = "step_1_trace_based_clustering"
+        if (req_body_engine === "fused") {
+            var step_description = "Read the csv dataset, obtain all partitions, the matrix of matches and the final candidate clusters in memory, and write them to a .csv file. This .csv file will contain the following three attributes: (1) instance index of the initial dataset (starting from 0), (2) cluster name (starting from 0 and from the partition with more clusters), and (3) mean value of match with previous partitions."
+            var output_description = "A .csv file containing the final candidate clusters."
+        } else {
+            var step_description = "Read the csv dataset, obtain the final candidate clusters in memory for each random seed, and write to a .csv file how often each instance belongs to a final candidate cluster. This .csv file will contain the following three attributes: (1) instance index of the initial dataset (starting from 0), (2) number of random seeds for which the instance belongs to a final candidate cluster, and (3) stable cluster frequency (i.e., the previous number divided by the number of random seeds)."
+            var output_description = "A .csv file containing the stable cluster frequency of each instance."
+        }
+        var step_type = "output"
+        try {
+            var step = await models.step.create({name:step_name, doc:step_description, type:step_type, workflowId:workflow_id, position:1});
+            var step_id = step.id
+        } catch(error) {
+            error = "Error creating step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+            logger.debug(error);
+            return res.status(500).send(error);
+        }
+        try {
+            await models.input.create({doc:"A .csv file containing a dataset in csv format. We suppose that this dataset is already preprocessed and without missing values. Remember that all attributes must be numeric, since a clustering technique will be applied.", stepId:step_id});
+        } catch(error) {
+            error = "Error creating the input for step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+            logger.debug(error);
+            return res.status(500).send(error);
+        }
+        try {
+            await models.output.create({doc:output_description, extension:"csv", stepId:step_id});
+        } catch(error) {
+            error = "Error creating the output for step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+            logger.debug(error);
+            return res.status(500).send(error);
+        }
+        implementation_file_name = "tbc.py"
+        source_implementation_file_path = (req_body_engine === "fused") ? "templates/tbc/one-step.py" : "templates/tbc/consensus.py"
+        dest_implementation_file_path = implementation_files_folder_path + "/" + implementation_file_name
+        try{
+            source_file_content = await fs.readFile(source_implementation_file_path, "utf8")
+            regex = /<WORKFLOW_NAME>|<WORKFLOW_ID>|<CLUSTERING_ALGORITHM_NAME>|<RANDOM_SEED_PARAMETER>|<RANDOM_SEEDS_PARAMETER>|<K_PARAMETER>|<THRESHOLD_PARAMETER>|<N_JOBS_PARAMETER>|<CLUSTERING_ALGORITHM_CALL>|<VALUE_OF_MATCH_CALCULATION>/g
+            new_source_file_content = source_file_content.replaceAll(regex, (match) => {
+                if (match === "<WORKFLOW_NAME>") {
+                    return req.body.name;
+                } else if (match === "<WORKFLOW_ID>") {
+                    return workflow_id.toString()
+                } else if (match === "<CLUSTERING_ALGORITHM_NAME>") {
+                    return "KMeans"
+                } else if (match === "<RANDOM_SEED_PARAMETER>") {
+                    return req_body_random_seed.toString()
+                } else if (match === "<RANDOM_SEEDS_PARAMETER>") {
+                    return req_body_random_seeds.join(", ")
+                } else if (match === "<K_PARAMETER>") {
+                    return req_body_k.toString()
+                } else if (match === "<THRESHOLD_PARAMETER>") {
+                    return req_body_threshold.toString()
+                } else if (match === "<N_JOBS_PARAMETER>") {
+                    return req_body_n_jobs.toString()
+                } else if (match === "<CLUSTERING_ALGORITHM_CALL>") {
+                    return "KMeans(n_clusters=number_of_clusters, random_state=current_random_seed).fit(pandas_dataframe)"
+                } else if (match === "<VALUE_OF_MATCH_CALCULATION>") {
+                    return values_of_match_calculations[req.body.match_function]
+                } else {
+                    return match;
+                }
+            });
+            await fs.writeFile(dest_implementation_file_path, new_source_file_content, "utf8");
+        } catch(error) {
+            error = "Error creating the implementation file for the step 1: " + error;
+            logger.debug(error);
+            return res.status(500).send(error);
+        }
+        try {
+            await models.implementation.create({fileName:implementation_file_name, language:"python", stepId:step_id});
+        } catch(error) {
+            error = "Error creating the implementation for step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+            logger.debug(error);
+            return res.status(500).send(error);
+        }
+        await WorkflowUtils.workflowComplete(workflow_id);
+        return res.sendStatus(200);
+    }
     // Create the needed steps (with their inputs, outputs and implememtations) and add them to the previous workflow.
     // Step 1: LOAD STEP: we suppose that the initial dataset (a .csv file) is already preprocessed and without missing values.
     var step_name = "step_1_load"
@@ -164,7 +306,7 @@ const path = require('path');
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"The same .csv file, since the dataset is already preprocessed and in csv format.", extension:"csv", stepId:step_id});
+        await models.output.create({doc:"The same .csv file, since the dataset is already preprocessed and in csv format, and a .json file with its schema (names of the attributes, which are read as decimal values).", extension:"csv", stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 1: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
@@ -219,19 +361,24 @@ const path = require('path');
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"A json file containing all partitions generated (each cluster of each partition stores a list with the indices of the instances belonging to that cluster).", extension:"json", stepId:step_id});
+        await models.output.create({doc:"A file containing all partitions generated: either a json file (each cluster of each partition stores a list with the indices of the instances belonging to that cluster) or a npy file (label matrix in which the column j stores the cluster of each instance in the partition with j+2 clusters).", extension:req_body_partitions_format, stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 2: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
         return res.status(500).send(error);
     }
     implementation_file_name = "step2.py"
-    source_implementation_file_path = "templates/tbc/" + implementation_file_name
+    // The large-data mode has its own template, in which the dataset is read by chunks.
+    if (req.body.clustering_algorithm === "minibatchkmeans") {
+        source_implementation_file_path = "templates/tbc/step2-large-data.py"
+    } else {
+        source_implementation_file_path = "templates/tbc/" + implementation_file_name
+    }
     dest_implementation_file_path = implementation_files_folder_path + "/" + implementation_file_name
     try{
         source_file_content = await fs.readFile(source_implementation_file_path, "utf8")
         // We have to replace depending on the value of the 'clustering_algorithm' parameter.
-        regex = /<CLUSTERING_ALGORITHM_NAME>|<RANDOM_SEED_PARAMETER>|<K_PARAMETER>|<CLUSTERING_ALGORITHM_CALL>/g
+        regex = /<CLUSTERING_ALGORITHM_NAME>|<RANDOM_SEED_PARAMETER>|<K_PARAMETER>|<N_JOBS_PARAMETER>|<CHUNK_SIZE_PARAMETER>|<PARTITIONS_FORMAT>|<CLUSTERING_ALGORITHM_CALL>/g
         if (req.body.clustering_algorithm === "kmeans") {
             new_source_file_content = source_file_content.replaceAll(regex, (match) => {
                 if (match === "<CLUSTERING_ALGORITHM_NAME>") {
@@ -240,12 +387,34 @@ const path = require('path');
                     return req_body_random_seed.toString()
                 } else if (match === "<K_PARAMETER>") {
                     return req_body_k.toString()
+                } else if (match === "<N_JOBS_PARAMETER>") {
+                    return req_body_n_jobs.toString()
+                } else if (match === "<PARTITIONS_FORMAT>") {
+                    return req_body_partitions_format
                 } else if (match === "<CLUSTERING_ALGORITHM_CALL>") {
                     return "KMeans(n_clusters=number_of_clusters, random_state=current_random_seed).fit(pandas_dataframe)"
                 } else {
                     return match;
                 }
             });
+        } else if (req.body.clustering_algorithm === "minibatchkmeans") {
+            new_source_file_content = source_file_content.replaceAll(regex, (match) => {
+                if (match === "<CLUSTERING_ALGORITHM_NAME>") {
+                    return "MiniBatchKMeans"
+                } else if (match === "<RANDOM_SEED_PARAMETER>") {
+                    return req_body_random_seed.toString()
+                } else if (match === "<K_PARAMETER>") {
+                    return req_body_k.toString()
+                } else if (match === "<CHUNK_SIZE_PARAMETER>") {
+                    return req_body_chunk_size.toString()
+                } else if (match === "<PARTITIONS_FORMAT>") {
+                    return req_body_partitions_format
+                } else if (match === "<CLUSTERING_ALGORITHM_CALL>") {
+                    return "MiniBatchKMeans(n_clusters=number_of_clusters, random_state=current_random_seed)"
+                } else {
+                    return match;
+                }
+            });
         }
         await fs.writeFile(dest_implementation_file_path, new_source_file_content, "utf8");
     } catch(error) {
@@ -262,7 +431,7 @@ const path = require('path');
     }
     // Step 3: obtain the matrix of matches using all partitions generated previously.
     var step_name = "step_3_from_partitions_to_matrix_of_matches"
-    var step_description = "Read the json file containing the partitions and generate the matrix of matches in json format."
+    var step_description = "Read the file containing the partitions (in json or npy format) and generate the matrix of matches in json format, for all match functions (jaccard, jaccard2 and dice) at once."
     var step_type = "logic"
     try {
         var step = await models.step.create({name:step_name, doc:step_description, type:step_type, workflowId:workflow_id, position:3});
@@ -273,14 +442,14 @@ const path = require('path');
         return res.status(500).send(error);
     }
     try {
-        await models.input.create({doc:"A json file containing all partitions generated in the previous step (each cluster of each partition stores a list with the indices of the instances belonging to that cluster).", stepId:step_id});
+        await models.input.create({doc:"A file containing all partitions generated in the previous step, either in json format (each cluster of each partition stores a list with the indices of the instances belonging to that cluster) or in npy format (label matrix).", stepId:step_id});
     } catch(error) {
         error = "Error creating the input for step 3: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
         return res.status(500).send(error);
     }
     try {
-        await models.output.create({doc:"A json file containing the matrix of matches.", extension:"json", stepId:step_id});
+        await models.output.create({doc:"A json file containing the matrix of matches (for all match functions).", extension:"json", stepId:step_id});
     } catch(error) {
         error = "Error creating the output for step 3: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
         logger.debug(error);
@@ -291,39 +460,8 @@ const path = require('path');
     dest_implementation_file_path = implementation_files_folder_path + "/" + implementation_file_name
     try{
         source_file_content = await fs.readFile(source_implementation_file_path, "utf8")
-        // We have to replace depending on the value of the 'match_function' parameter.
-        regex = /<K_PARAMETER>|<VALUE_OF_MATCH_CALCULATION>/g
-        if (req.body.match_function === "jaccard") {
-            new_source_file_content = source_file_content.replaceAll(regex, (match) => {
-                if (match === "<K_PARAMETER>") {
-                    return req_body_k.toString()
-                } else if (match === "<VALUE_OF_MATCH_CALCULATION>") {
-                    return "len( cluster_of_partition_k.intersection(cluster_of_current_partition) ) / len( cluster_of_partition_k.union(cluster_of_current_partition) )"
-                } else {
-                    return match;
-                }
-            });
-        } else if (req.body.match_function === "jaccard2") {
-            new_source_file_content = source_file_content.replaceAll(regex, (match) => {
-                if (match === "<K_PARAMETER>") {
-                    return req_body_k.toString()
-                } else if (match === "<VALUE_OF_MATCH_CALCULATION>") {
-                    return "len( cluster_of_partition_k.intersection(cluster_of_current_partition) ) / len( cluster_of_current_partition )"
-                } else {
-                    return match;
-                }
-            });
-        } else if (req.body.match_function === "dice") {
-            new_source_file_content = source_file_content.replaceAll(regex, (match) => {
-                if (match === "<K_PARAMETER>") {
-                    return req_body_k.toString()
-                } else if (match === "<VALUE_OF_MATCH_CALCULATION>") {
-                    return "(2*len(cluster_of_partition_k.intersection(cluster_of_current_partition))) / (len(cluster_of_partition_k)+len(cluster_of_current_partition))"
-                } else {
-                    return match;
-                }
-            });
-        }
+        // We have to replace using the value of the 'k' parameter (all match functions are computed in this step).
+        new_source_file_content = source_file_content.replaceAll("<K_PARAMETER>", req_body_k.toString());
         await fs.writeFile(dest_implementation_file_path, new_source_file_content, "utf8");
     } catch(error) {
         error = "Error creating the implementation file for the step 3: " + error;
@@ -339,7 +477,7 @@ const path = require('path');
     }
     // Step 4: filter the matrix of matches in order to obtain the final candidate clusters.
     var step_name = "step_4_from_matrix_of_matches_to_final_candidate_clusters"
-    var step_description = "Read the json file containing the matrix of matches and filter it in order to obtain the final candidate clusters in json format."
+    var step_description = "Read the json file containing the matrix of matches and filter it (using the values of match of the selected match function) in order to obtain the final candidate clusters in json format."
     var step_type = "logic"
     try {
         var step = await models.step.create({name:step_name, doc:step_description, type:step_type, workflowId:workflow_id, position:4});
@@ -368,8 +506,17 @@ const path = require('path');
     dest_implementation_file_path = implementation_files_folder_path + "/" + implementation_file_name
     try{
         source_file_content = await fs.readFile(source_implementation_file_path, "utf8")
-        // We have to replace using the value of the 'threshold' parameter.
-        new_source_file_content = source_file_content.replaceAll("<THRESHOLD_PARAMETER>", req_body_threshold.toString());
+        // We have to replace using the value of the 'threshold' and 'match_function' parameters.
+        regex = /<THRESHOLD_PARAMETER>|<MATCH_FUNCTION>/g
+        new_source_file_content = source_file_content.replaceAll(regex, (match) => {
+            if (match === "<THRESHOLD_PARAMETER>") {
+                return req_body_threshold.toString()
+            } else if (match === "<MATCH_FUNCTION>") {
+                return req.body.match_function
+            } else {
+                return match;
+            }
+        });
         await fs.writeFile(dest_implementation_file_path, new_source_file_content, "utf8");
     } catch(error) {
         error = "Error creating the implementation file for the step 4: " + error;
@@ -631,6 +778,14 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     uploads_folder_path = "uploads/" + workflow_id + "/python/"
     // Templates folder path.
     templates_folder_path = "templates/tbc/"
+    // Check whether the phenotype was created with the fused or consensus engines (i.e., it only has one step).
+    try {
+        var fused_engine = (await models.step.count({where:{workflowId:workflow_id}})) === 1
+    } catch(error) {
+        error = "Error counting the steps of the workflow: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+        logger.debug(error);
+        return res.status(500).send(error);
+    }
     // Copy 'LICENSE.md' file from templates folder.
     try {
         await fs.copyFile(templates_folder_path + 'LICENSE.md', final_output_path + 'LICENSE.md')
@@ -656,11 +811,17 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
         return res.status(500).send(error);
     }
     try {
-        await fs.copyFile(uploads_folder_path + 'step1.py', final_output_path + 'python/step1.py')
-        await fs.copyFile(uploads_folder_path + 'step2.py', final_output_path + 'python/step2.py')
-        await fs.copyFile(uploads_folder_path + 'step3.py', final_output_path + 'python/step3.py')
-        await fs.copyFile(uploads_folder_path + 'step4.py', final_output_path + 'python/step4.py')
-        await fs.copyFile(uploads_folder_path + 'step5.py', final_output_path + 'python/step5.py')
+        if (fused_engine) {
+            await fs.copyFile(uploads_folder_path + 'tbc.py', final_output_path + 'python/tbc.py')
+        } else {
+            await fs.copyFile(uploads_folder_path + 'step1.py', final_output_path + 'python/step1.py')
+            await fs.copyFile(uploads_folder_path + 'step2.py', final_output_path + 'python/step2.py')
+            await fs.copyFile(uploads_folder_path + 'step3.py', final_output_path + 'python/step3.py')
+            await fs.copyFile(uploads_folder_path + 'step4.py', final_output_path + 'python/step4.py')
+            await fs.copyFile(uploads_folder_path + 'step5.py', final_output_path + 'python/step5.py')
+            // Tool to convert the partitions between the json and npy formats.
+            await fs.copyFile(templates_folder_path + 'partitions-converter.py', final_output_path + 'python/partitions-converter.py')
+        }
     } catch(error) {
         error = "Error copying python files: " + error;
         logger.debug(error);
@@ -691,11 +852,15 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
         return res.status(500).send(error);
     }
     try {
-        await fs.copyFile(templates_folder_path + 'step1.cwl', final_output_path + 'cwl/step1.cwl')
-        await fs.copyFile(templates_folder_path + 'step2.cwl', final_output_path + 'cwl/step2.cwl')
-        await fs.copyFile(templates_folder_path + 'step3.cwl', final_output_path + 'cwl/step3.cwl')
-        await fs.copyFile(templates_folder_path + 'step4.cwl', final_output_path + 'cwl/step4.cwl')
-        await fs.copyFile(templates_folder_path + 'step5.cwl', final_output_path + 'cwl/step5.cwl')
+        if (fused_engine) {
+            await fs.copyFile(templates_folder_path + 'one-step.cwl', final_output_path + 'cwl/tbc.cwl')
+        } else {
+            await fs.copyFile(templates_folder_path + 'step1.cwl', final_output_path + 'cwl/step1.cwl')
+            await fs.copyFile(templates_folder_path + 'step2.cwl', final_output_path + 'cwl/step2.cwl')
+            await fs.copyFile(templates_folder_path + 'step3.cwl', final_output_path + 'cwl/step3.cwl')
+            await fs.copyFile(templates_folder_path + 'step4.cwl', final_output_path + 'cwl/step4.cwl')
+            await fs.copyFile(templates_folder_path + 'step5.cwl', final_output_path + 'cwl/step5.cwl')
+        }
     } catch(error) {
         error = "Error copying the cwl files corresponding to the steps: " + error;
         logger.debug(error);
@@ -703,7 +868,7 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     }
     // Copy main.cwl file from templates folder.
     try {
-        await fs.copyFile(templates_folder_path + 'main.cwl', final_output_path + 'main.cwl')
+        await fs.copyFile(templates_folder_path + (fused_engine ? 'one-step-main.cwl' : 'main.cwl'), final_output_path + 'main.cwl')
     } catch(error) {
         error = "Error copying main.cwl file: " + error;
         logger.debug(error);
@@ -711,7 +876,7 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     }
     // Read main.yml file content (from templates folder), replace it appropriately and write.
     try{
-        main_yml_file_content = await fs.readFile(templates_folder_path + 'main.yml', "utf8")
+        main_yml_file_content = await fs.readFile(templates_folder_path + (fused_engine ? 'one-step-main.yml' : 'main.yml'), "utf8")
         // We have to replace using the dataset name.
         new_main_yml_file_content = main_yml_file_content.replaceAll("<DATASET_NAME>", req.params.datasetName);
         await fs.writeFile(final_output_path + 'main.yml', new_main_yml_file_content, "utf8");
@@ -821,6 +986,14 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     uploads_folder_path = "uploads/" + workflow_id + "/python/"
     // Templates folder path.
     templates_folder_path = "templates/tbc/"
+    // Check whether the phenotype was created with the fused or consensus engines (i.e., it only has one step).
+    try {
+        var fused_engine = (await models.step.count({where:{workflowId:workflow_id}})) === 1
+    } catch(error) {
+        error = "Error counting the steps of the workflow: " + (error&&error.errors&&error.errors[0]&&error.errors[0].message?error.errors[0].message:error);
+        logger.debug(error);
+        return res.status(500).send(error);
+    }
     // Copy 'LICENSE.md' file from templates folder.
     try {
         await fs.copyFile(templates_folder_path + 'LICENSE.md', final_output_path + 'LICENSE.md')
@@ -846,11 +1019,17 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
         return res.status(500).send(error);
     }
     try {
-        await fs.copyFile(uploads_folder_path + 'step1.py', final_output_path + 'python/step1.py')
-        await fs.copyFile(uploads_folder_path + 'step2.py', final_output_path + 'python/step2.py')
-        await fs.copyFile(uploads_folder_path + 'step3.py', final_output_path + 'python/step3.py')
-        await fs.copyFile(uploads_folder_path + 'step4.py', final_output_path + 'python/step4.py')
-        await fs.copyFile(uploads_folder_path + 'step5.py', final_output_path + 'python/step5.py')
+        if (fused_engine) {
+            await fs.copyFile(uploads_folder_path + 'tbc.py', final_output_path + 'python/tbc.py')
+        } else {
+            await fs.copyFile(uploads_folder_path + 'step1.py', final_output_path + 'python/step1.py')
+            await fs.copyFile(uploads_folder_path + 'step2.py', final_output_path + 'python/step2.py')
+            await fs.copyFile(uploads_folder_path + 'step3.py', final_output_path + 'python/step3.py')
+            await fs.copyFile(uploads_folder_path + 'step4.py', final_output_path + 'python/step4.py')
+            await fs.copyFile(uploads_folder_path + 'step5.py', final_output_path + 'python/step5.py')
+            // Tool to convert the partitions between the json and npy formats.
+            await fs.copyFile(templates_folder_path + 'partitions-converter.py', final_output_path + 'python/partitions-converter.py')
+        }
     } catch(error) {
         error = "Error copying python files: " + error;
         logger.debug(error);
@@ -881,21 +1060,27 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
         return res.status(500).send(error);
     }
     try {
-        generator_url = config.get("generator.URL") + "/tbc/getStepCwl/1"
-        step1_cwl_file_content = await got.get(generator_url).text();
-        await fs.writeFile(final_output_path + 'cwl/step1.cwl', step1_cwl_file_content, "utf8");
-        generator_url = config.get("generator.URL") + "/tbc/getStepCwl/2"
-        step2_cwl_file_content = await got.get(generator_url).text();
-        await fs.writeFile(final_output_path + 'cwl/step2.cwl', step2_cwl_file_content, "utf8");
-        generator_url = config.get("generator.URL") + "/tbc/getStepCwl/3"
-        step3_cwl_file_content = await got.get(generator_url).text();
-        await fs.writeFile(final_output_path + 'cwl/step3.cwl', step3_cwl_file_content, "utf8");
-        generator_url = config.get("generator.URL") + "/tbc/getStepCwl/4"
-        step4_cwl_file_content = await got.get(generator_url).text();
-        await fs.writeFile(final_output_path + 'cwl/step4.cwl', step4_cwl_file_content, "utf8");
-        generator_url = config.get("generator.URL") + "/tbc/getStepCwl/5"
-        step5_cwl_file_content = await got.get(generator_url).text();
-        await fs.writeFile(final_output_path + 'cwl/step5.cwl', step5_cwl_file_content, "utf8");
+        if (fused_engine) {
+            generator_url = config.get("generator.URL") + "/tbc/getOneStepCwl"
+            tbc_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/tbc.cwl', tbc_cwl_file_content, "utf8");
+        } else {
+            generator_url = config.get("generator.URL") + "/tbc/getStepCwl/1"
+            step1_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/step1.cwl', step1_cwl_file_content, "utf8");
+            generator_url = config.get("generator.URL") + "/tbc/getStepCwl/2"
+            step2_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/step2.cwl', step2_cwl_file_content, "utf8");
+            generator_url = config.get("generator.URL") + "/tbc/getStepCwl/3"
+            step3_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/step3.cwl', step3_cwl_file_content, "utf8");
+            generator_url = config.get("generator.URL") + "/tbc/getStepCwl/4"
+            step4_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/step4.cwl', step4_cwl_file_content, "utf8");
+            generator_url = config.get("generator.URL") + "/tbc/getStepCwl/5"
+            step5_cwl_file_content = await got.get(generator_url).text();
+            await fs.writeFile(final_output_path + 'cwl/step5.cwl', step5_cwl_file_content, "utf8");
+        }
     } catch(error) {
         error = "Error generating the cwl files corresponding to the steps (" + generator_url + "): " + error;
         logger.debug(error);
@@ -903,7 +1088,7 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     }
     // Call generator endpoint to generate main.cwl file.
     try {
-        generator_url = config.get("generator.URL") + "/tbc/getMainCwl"
+        generator_url = config.get("generator.URL") + (fused_engine ? "/tbc/getOneStepMainCwl" : "/tbc/getMainCwl")
         main_cwl_file_content = await got.get(generator_url).text();
         await fs.writeFile(final_output_path + 'main.cwl', main_cwl_file_content, "utf8");
     } catch(error) {
@@ -913,7 +1098,7 @@ router.get("/generate2/:workflowName/:datasetName", jwt({secret:config.get("jwt.
     }
     // Call generator endpoint to generate main.yml file.
     try {
-        generator_url = config.get("generator.URL") + "/tbc/generateMainYml/" + req.params.datasetName
+        generator_url = config.get("generator.URL") + (fused_engine ? "/tbc/generateOneStepMainYml/" : "/tbc/generateMainYml/") + req.params.datasetName
         main_yml_file_content = await got.get(generator_url).text();
         await fs.writeFile(final_output_path + 'main.yml', main_yml_file_content, "utf8");
     } catch(error) {
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+import sys
+import os
+import shutil
+import json
+import numpy as np
+from pandas import read_csv
+from pandas.api.types import is_integer_dtype, is_float_dtype
+
+def infer_schema(file_path):
+    # Types of the attributes, inferred only once from the whole dataset (so that the following steps do not infer them again), one chunk at a time: the types of all chunks
+    # are combined exactly as if the whole file were read at once (attributes with integer and decimal values are decimal, and attributes with numeric and non-numeric values are objects).
+    dtypes = dict()
+    for chunk in read_csv(file_path, chunksize=chunk_size):
+        for column, dtype in chunk.dtypes.items():
+            if (column not in dtypes) or (dtypes[column] == dtype):
+                dtypes[column] = dtype
+            elif all(is_integer_dtype(current_dtype) or is_float_dtype(current_dtype) for current_dtype in [dtypes[column], dtype]):
+                dtypes[column] = np.dtype("float64")
+            else:
+                dtypes[column] = np.dtype("object")
+    return {column: str(dtype) for column, dtype in dtypes.items()}
+
+def stage_dataset(source_path, destination_path):
+    # The dataset is staged as it is, and not parsed and written again with pandas (which changed the last digits of some decimal values), so the following steps parse the values of the input file.
+    # Validation: only the header of the dataset is parsed (an empty or malformed file raises an error).
+    read_csv(source_path, nrows=0)
+    if os.path.exists(destination_path):
+        # Staged by a previous run in the same folder: nothing to do if it is already the dataset (e.g., a hard link to it), otherwise it is replaced.
+        if os.path.samefile(source_path, destination_path):
+            return
+        os.remove(destination_path)
+    try:
+        # Hard link: no data is copied at all (only possible if both paths are in the same filesystem).
+        os.link(source_path, destination_path)
+    except OSError:
+        # Otherwise, the copy is done by the kernel (shutil uses 'os.sendfile'/'copy_file_range' when available), without loading the dataset in memory.
+        shutil.copyfile(source_path, destination_path)
+
+# Number of rows read at once to infer the types of the attributes.
+chunk_size = 100000
+stage_dataset(sys.argv[1], 'name_cc001_id_1_train_dataset.csv')
+stage_dataset(sys.argv[2], 'name_cc001_id_1_test_dataset.csv')
+# Schema of both datasets (names and types of their attributes), used by the following steps to read them.
+with open('name_cc001_id_1_schema.json', 'w') as file_out:
+    json.dump({"train": infer_schema(sys.argv[1]), "test": infer_schema(sys.argv[2])}, file_out, indent=4)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+import sys
+import os
+import json
+import time
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+import numpy as np
+import joblib
+from threadpoolctl import threadpool_limits, threadpool_info
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Classifiers that can be compared, and the type of the numpy array used to fit each of them: tree-based estimators are always fitted in float32, and the rest in float64.
+_estimators = {
+    "LogisticRegression" : (LogisticRegression, np.float64),
+    "SVC" : (SVC, np.float64),
+    "DecisionTreeClassifier" : (DecisionTreeClassifier, np.float32),
+    "RandomForestClassifier" : (RandomForestClassifier, np.float32),
+    "GradientBoostingClassifier" : (GradientBoostingClassifier, np.float32),
+    "HistGradientBoostingClassifier" : (HistGradientBoostingClassifier, np.float64)
+}
+
+def downcast(dataset, class_name, downcast_floats):
+    # Reduce the memory used by the attributes without changing any value: integer attributes are stored in the smallest integer type,
+    # and decimal attributes in float32 when all their values are exactly representable in float32 (the class is not modified).
+    # Returns the original types of the modified attributes.
+    original_dtypes = dict()
+    for column in dataset.columns:
+        if column == class_name:
+            continue
+        values = dataset[column].to_numpy()
+        if np.issubdtype(values.dtype, np.integer):
+            downcast_values = pd.to_numeric(dataset[column], downcast = "integer").to_numpy()
+        elif downcast_floats and (values.dtype == np.float64):
+            with np.errstate(over = "ignore"):
+                downcast_values = values.astype(np.float32)
+            if not np.array_equal(downcast_values, values, equal_nan = True):
+                continue
+        else:
+            continue
+        if downcast_values.dtype != values.dtype:
+            original_dtypes[column] = values.dtype
+            dataset[column] = downcast_values
+    return original_dtypes
+
+def fit(estimator_name, X, y, random_state, threads_per_process):
+    # Run by each process: create and fit the estimator, and predict with the train dataset (X is the memory-mapped array shared by all the processes).
+    # Returns the model, the train predictions and the time taken (in seconds) by the fit and by the prediction.
+    estimator_class, _ = _estimators[estimator_name]
+    model = estimator_class(random_state = random_state)
+    # Only the Random Forest Classifier uses several threads (the n_jobs parameter of the Logistic Regression has no effect with its default solver).
+    if estimator_name == "RandomForestClassifier":
+        model.set_params(n_jobs = threads_per_process)
+    start = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    train_predictions = model.predict(X)
+    return model, train_predictions, fit_seconds, time.perf_counter() - start
+
+def count_pairs(counts, y_true, y_pred):
+    # Add the number of instances of each pair (class, prediction) to 'counts', so that the metrics of the test dataset are computed one chunk at a time (without keeping its predictions in memory).
+    for (true_value, predicted_value), count in pd.DataFrame({"true": y_true, "pred": y_pred}).value_counts(sort = False).items():
+        counts[(true_value, predicted_value)] = counts.get((true_value, predicted_value), 0) + count
+
+def metrics(counts):
+    # Accuracy, balanced accuracy (average recall of the classes) and macro F1 (average F1 of the classes and predicted values), computed as scikit-learn does from the confusion counts.
+    true_values = {true_value for true_value, _ in counts}
+    labels = true_values | {predicted_value for _, predicted_value in counts}
+    true_positives = {label: counts.get((label, label), 0) for label in labels}
+    support = {label: sum(count for (true_value, _), count in counts.items() if true_value == label) for label in labels}
+    predicted = {label: sum(count for (_, predicted_value), count in counts.items() if predicted_value == label) for label in labels}
+    f1 = [(2 * true_positives[label] / (support[label] + predicted[label])) if (support[label] + predicted[label]) > 0 else 0.0 for label in labels]
+    return {"accuracy": sum(true_positives.values()) / sum(counts.values()),
+            "balanced_accuracy": float(np.mean([true_positives[label] / support[label] for label in true_values])),
+            "f1_macro": float(np.mean(f1))}
+
+def write_csv(dataset, original_dtypes, file_path):
+    # The attributes are written with their original types (so that the output file is exactly the same), one block of rows at a time.
+    for block_start in range(0, max(len(dataset), 1), block_size):
+        dataset.iloc[block_start:block_start+block_size].astype(original_dtypes).to_csv(file_path, index = False, header = (block_start == 0), mode = "w" if (block_start == 0) else "a")
+
+def cpu_setting():
+    # Number of CPUs that the step can use: the value of the environment variable PHENOFLOW_N_JOBS (if it is set) or, otherwise, the effective CPU quota
+    # of the container (joblib takes into account the CPU affinity of the process and the cgroup CPU quota, and not only the number of CPUs of the machine).
+    environment_value = os.environ.get("PHENOFLOW_N_JOBS")
+    if environment_value:
+        return max(1, int(environment_value)), "PHENOFLOW_N_JOBS"
+    return joblib.cpu_count(), "CPU quota"
+
+def write_cpu_setting(file_path, **setting):
+    # The CPU setting used by the step is written to disk, together with the thread pools (BLAS/OpenMP) actually loaded and their number of threads.
+    setting["thread_pools"] = [{"library": thread_pool["internal_api"], "number_of_threads": thread_pool["num_threads"]} for thread_pool in threadpool_info()]
+    with open(file_path, "w") as file_out:
+        json.dump(setting, file_out, indent = 2)
+
+# Class name.
+class_name = <CLASS_NAME>
+random_state = <RANDOM_STATE>
+# Classifiers compared (with their default parameters). The predictions of each one are added to the datasets in a new attribute (class name + "_pred_" + classifier).
+estimators = json.loads(<ESTIMATORS>)
+att_names_for_predictions = {estimator_name: class_name + "_pred_" + estimator_name for estimator_name in estimators}
+# Number of processes used to fit the classifiers in parallel (-1 means all available CPUs). There are never more processes than classifiers.
+n_jobs = <N_JOBS>
+# Number of rows of the output train dataset written at once.
+block_size = 100000
+# Number of rows of the test dataset read (and predicted) at once.
+chunk_size = <CHUNK_SIZE>
+# Number of CPUs used by the step, which also limits the BLAS/OpenMP thread pools of this process (so that they do not use more CPUs than the quota).
+number_of_cpus, cpu_setting_source = cpu_setting()
+threadpool_limits(limits = number_of_cpus)
+# The value -1 means one process per CPU. The BLAS/OpenMP threads (and the n_jobs parameter) of each process are limited, so that the processes do not compete for the same CPUs.
+number_of_processes = min(number_of_cpus if (n_jobs == -1) else n_jobs, len(estimators))
+threads_per_process = max(1, number_of_cpus // number_of_processes)
+# Types of the attributes of both datasets, inferred only once in the step 1 (the datasets are read with these types, without inferring them again).
+with open(sys.argv[3], "r") as file_in:
+    schema = json.load(file_in)
+# The train dataset is read with the pyarrow engine (with one thread per CPU) if it is installed and the step has more than one CPU: it builds an Arrow table before the DataFrame, so its peak
+# memory is higher than the one of the C engine, and with only one CPU it is not faster either. The test dataset is read in chunks, which the pyarrow engine does not support.
+# Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the files (the default decimal parser of the C engine may differ in the last digit).
+use_pyarrow = (pyarrow is not None) and (number_of_cpus > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(number_of_cpus)
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# Read the train dataset only once, for all the classifiers (the predictions are added to it, so no copies are made).
+train_dataset = pd.read_csv(sys.argv[1], dtype = schema["train"], **csv_options)
+train_original_dtypes = downcast(train_dataset, class_name, True)
+# Split the train data into X and y.
+# X is converted only once into a numpy array of each type used by the classifiers, so that it is not converted again in each fit.
+# Besides, these arrays are memory-mapped by joblib and shared by all the processes (instead of being copied to each of them).
+class_position = train_dataset.columns.get_loc(class_name)
+y = train_dataset.pop(class_name)
+X_by_dtype = {X_dtype: train_dataset.to_numpy(dtype = X_dtype) for X_dtype in {_estimators[estimator_name][1] for estimator_name in estimators}}
+# Fit all the classifiers in parallel.
+with joblib.parallel_config(backend = "loky", inner_max_num_threads = threads_per_process):
+    results = joblib.Parallel(n_jobs = number_of_processes)(joblib.delayed(fit)(estimator_name, X_by_dtype[_estimators[estimator_name][1]], y.to_numpy(), random_state, threads_per_process)
+                                                            for estimator_name in estimators)
+del X_by_dtype
+models = {estimator_name: model for estimator_name, (model, _, _, _) in zip(estimators, results)}
+summary = pd.DataFrame({"estimator": estimators,
+                        "fit_seconds": [fit_seconds for (_, _, fit_seconds, _) in results],
+                        "train_predict_seconds": [train_predict_seconds for (_, _, _, train_predict_seconds) in results],
+                        "test_predict_seconds": 0.0})
+# Restore the class and add the new attributes.
+train_dataset.insert(class_position, class_name, y)
+train_metrics = []
+for estimator_name, (_, train_predictions, _, _) in zip(estimators, results):
+    train_dataset[att_names_for_predictions[estimator_name]] = train_predictions
+    train_counts = dict()
+    count_pairs(train_counts, y.to_numpy(), train_predictions)
+    train_metrics.append(metrics(train_counts))
+del results
+# Write the train dataset to disk (it is no longer needed).
+write_csv(train_dataset, train_original_dtypes, "step2_train_dataset_with_predictions.csv")
+del train_dataset, y
+# Predict with the test dataset one chunk at a time (so that the memory used does not depend on the size of the test dataset), add the new attributes and write each chunk to disk.
+# All chunks are read with the types of the whole test dataset (from the schema), so that the output file is exactly the same as if the test dataset were read at once.
+# Each chunk is converted only once into a numpy array of each type used by the classifiers.
+test_counts = {estimator_name: dict() for estimator_name in estimators}
+for chunk_number, test_chunk in enumerate(pd.read_csv(sys.argv[2], dtype = schema["test"], chunksize = chunk_size, float_precision = "round_trip")):
+    X_test = test_chunk.drop(columns = [class_name], errors = "ignore")
+    X_test_by_dtype = {X_dtype: X_test.to_numpy(dtype = X_dtype) for X_dtype in {_estimators[estimator_name][1] for estimator_name in estimators}}
+    for estimator_position, estimator_name in enumerate(estimators):
+        start = time.perf_counter()
+        test_predictions = models[estimator_name].predict(X_test_by_dtype[_estimators[estimator_name][1]])
+        summary.loc[estimator_position, "test_predict_seconds"] += time.perf_counter() - start
+        test_chunk[att_names_for_predictions[estimator_name]] = test_predictions
+        # The class may not exist in the test dataset (new instances to be classified).
+        if class_name in test_chunk.columns:
+            count_pairs(test_counts[estimator_name], test_chunk[class_name].to_numpy(), test_predictions)
+    test_chunk.to_csv("step2_test_dataset_with_predictions.csv", index = False, header = (chunk_number == 0), mode = "w" if (chunk_number == 0) else "a")
+    del X_test, X_test_by_dtype
+# Write the summary of all the classifiers to disk: the time taken by each one and its metrics with the train dataset and (if it has the class) with the test dataset.
+summary = summary.join(pd.DataFrame(train_metrics).add_prefix("train_"))
+if all(test_counts.values()):
+    summary = summary.join(pd.DataFrame([metrics(test_counts[estimator_name]) for estimator_name in estimators]).add_prefix("test_"))
+summary.to_csv("step2_comparison_summary.csv", index = False)
+# Write the CPU setting used by this step.
+write_cpu_setting("step2_cpu_setting.json", number_of_cpus = number_of_cpus, source = cpu_setting_source, n_jobs = number_of_processes, blas_openmp_threads = number_of_cpus, blas_openmp_threads_per_process = threads_per_process)
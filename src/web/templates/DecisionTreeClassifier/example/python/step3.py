@@ -4,18 +4,22 @@
 #    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
 
 import sys
-import pandas as pd
-import pickle
+import os
+import shutil
 
-# Read the datasets.
-train_dataset_with_predictions = pd.read_csv(sys.argv[1])
-test_dataset_with_predictions = pd.read_csv(sys.argv[2])
-# Write the datasts.
-train_dataset_with_predictions.to_csv("name_example_id_1_output_train_dataset_with_predictions.csv")
-test_dataset_with_predictions.to_csv("name_example_id_1_output_test_dataset_with_predictions.csv")
-# Read the model.
-input_model_file = open(sys.argv[3], "rb")
-output_model_file = open("name_example_id_1_output_pickle_model.pickle", "wb")
-pickle.dump(pickle.load(input_model_file), output_model_file)
-input_model_file.close()
-output_model_file.close()
+def stage_file(source_path, destination_path):
+    # The files generated in the step 2 are not modified, so they are not read (nor deserialized) again.
+    try:
+        # Hard link: no data is copied at all (only possible if both paths are in the same filesystem).
+        os.link(source_path, destination_path)
+    except OSError:
+        # Otherwise, the copy is done by the kernel (shutil uses 'os.sendfile'/'copy_file_range' when available), without loading the file in memory.
+        shutil.copyfile(source_path, destination_path)
+
+# Write the datasets.
+stage_file(sys.argv[1], "name_example_id_1_output_train_dataset_with_predictions.csv")
+stage_file(sys.argv[2], "name_example_id_1_output_test_dataset_with_predictions.csv")
+# Write the model.
+stage_file(sys.argv[3], "name_example_id_1_output_model.joblib")
+# Write the CPU setting used by the step 2.
+stage_file(sys.argv[4], "name_example_id_1_output_cpu_setting.json")
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+import sys
+import os
+import shutil
+
+def stage_file(source_path, destination_path):
+    # The files generated in the step 2 are not modified, so they are not read (nor deserialized) again.
+    try:
+        # Hard link: no data is copied at all (only possible if both paths are in the same filesystem).
+        os.link(source_path, destination_path)
+    except OSError:
+        # Otherwise, the copy is done by the kernel (shutil uses 'os.sendfile'/'copy_file_range' when available), without loading the file in memory.
+        shutil.copyfile(source_path, destination_path)
+
+# Write the datasets.
+stage_file(sys.argv[1], "name_hs001_id_1_output_train_dataset_with_predictions.csv")
+stage_file(sys.argv[2], "name_hs001_id_1_output_test_dataset_with_predictions.csv")
+# Write the best model.
+stage_file(sys.argv[3], "name_hs001_id_1_output_model.joblib")
+# Write the results of the search.
+stage_file(sys.argv[4], "name_hs001_id_1_output_search_results.csv")
+# Write the CPU setting used by the step 2.
+stage_file(sys.argv[5], "name_hs001_id_1_output_cpu_setting.json")
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+import sys
+import os
+import json
+import pandas as pd
+from scipy import stats
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+from <ESTIMATOR_MODULE> import <ESTIMATOR_NAME>
+import numpy as np
+import joblib
+from threadpoolctl import threadpool_limits, threadpool_info
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+def downcast(dataset, class_name, downcast_floats):
+    # Reduce the memory used by the attributes without changing any value: integer attributes are stored in the smallest integer type,
+    # and decimal attributes in float32 when all their values are exactly representable in float32 (the class is not modified).
+    # Returns the original types of the modified attributes.
+    original_dtypes = dict()
+    for column in dataset.columns:
+        if column == class_name:
+            continue
+        values = dataset[column].to_numpy()
+        if np.issubdtype(values.dtype, np.integer):
+            downcast_values = pd.to_numeric(dataset[column], downcast = "integer").to_numpy()
+        elif downcast_floats and (values.dtype == np.float64):
+            with np.errstate(over = "ignore"):
+                downcast_values = values.astype(np.float32)
+            if not np.array_equal(downcast_values, values, equal_nan = True):
+                continue
+        else:
+            continue
+        if downcast_values.dtype != values.dtype:
+            original_dtypes[column] = values.dtype
+            dataset[column] = downcast_values
+    return original_dtypes
+
+def predict(model, dataset, class_name):
+    # The model was fitted with a numpy array, so the attributes (without the class, if it exists) are converted in the same way.
+    return model.predict(dataset.drop(columns = [class_name], errors = "ignore").to_numpy(dtype = X_dtype))
+
+def to_distribution(values):
+    # Random search: a list of values is sampled uniformly, and an object defines a distribution ({"uniform": [low, high]}, {"loguniform": [low, high]} or {"randint": [low, high]}, where high is excluded).
+    if not isinstance(values, dict):
+        return values
+    (distribution_name, (low, high)), = values.items()
+    if distribution_name == "uniform":
+        return stats.uniform(low, high - low)
+    elif distribution_name == "loguniform":
+        return stats.loguniform(low, high)
+    elif distribution_name == "randint":
+        return stats.randint(low, high)
+    raise ValueError("Unknown distribution: " + distribution_name)
+
+def write_csv(dataset, original_dtypes, file_path):
+    # The attributes are written with their original types (so that the output file is exactly the same), one block of rows at a time.
+    for block_start in range(0, max(len(dataset), 1), block_size):
+        dataset.iloc[block_start:block_start+block_size].astype(original_dtypes).to_csv(file_path, index = False, header = (block_start == 0), mode = "w" if (block_start == 0) else "a")
+
+def cpu_setting():
+    # Number of CPUs that the step can use: the value of the environment variable PHENOFLOW_N_JOBS (if it is set) or, otherwise, the effective CPU quota
+    # of the container (joblib takes into account the CPU affinity of the process and the cgroup CPU quota, and not only the number of CPUs of the machine).
+    environment_value = os.environ.get("PHENOFLOW_N_JOBS")
+    if environment_value:
+        return max(1, int(environment_value)), "PHENOFLOW_N_JOBS"
+    return joblib.cpu_count(), "CPU quota"
+
+def write_cpu_setting(file_path, **setting):
+    # The CPU setting used by the step is written to disk, together with the thread pools (BLAS/OpenMP) actually loaded and their number of threads.
+    setting["thread_pools"] = [{"library": thread_pool["internal_api"], "number_of_threads": thread_pool["num_threads"]} for thread_pool in threadpool_info()]
+    with open(file_path, "w") as file_out:
+        json.dump(setting, file_out, indent = 2)
+
+# Class name.
+class_name = <CLASS_NAME>
+att_name_for_predictions = class_name + "_pred"
+random_state = <RANDOM_STATE>
+# Search strategy: "grid" (all combinations of the parameter space) or "random" (n_iter combinations sampled from the parameter space).
+search = "<SEARCH>"
+parameter_space = json.loads(<PARAMETER_SPACE>)
+n_iter = <N_ITER>
+# Number of folds of the cross-validation, and metric used to select the best combination.
+cv = <CV>
+scoring = "<SCORING>"
+# Number of processes used to fit the combinations in parallel (-1 means all available CPUs).
+n_jobs = <N_JOBS>
+# Type of the numpy array used to fit: tree-based estimators are always fitted in float32, and the rest in float64.
+X_dtype = np.float32 if "<ESTIMATOR_NAME>" in ["DecisionTreeClassifier", "RandomForestClassifier", "GradientBoostingClassifier"] else np.float64
+# Number of rows of the output train dataset written at once.
+block_size = 100000
+# Number of rows of the test dataset read (and predicted) at once.
+chunk_size = <CHUNK_SIZE>
+# Compression level of the model file, from 0 (no compression) to 9.
+compression = <COMPRESSION>
+# Number of CPUs used by the step, which also limits the BLAS/OpenMP thread pools of this process (so that they do not use more CPUs than the quota).
+number_of_cpus, cpu_setting_source = cpu_setting()
+threadpool_limits(limits = number_of_cpus)
+# The value -1 means one process per CPU. The BLAS/OpenMP threads of each process are limited, so that the processes do not compete for the same CPUs.
+number_of_processes = number_of_cpus if (n_jobs == -1) else n_jobs
+threads_per_process = max(1, number_of_cpus // number_of_processes)
+# Types of the attributes of both datasets, inferred only once in the step 1 (the datasets are read with these types, without inferring them again).
+with open(sys.argv[3], "r") as file_in:
+    schema = json.load(file_in)
+# The train dataset is read with the pyarrow engine (with one thread per CPU) if it is installed and the step has more than one CPU: it builds an Arrow table before the DataFrame, so its peak
+# memory is higher than the one of the C engine, and with only one CPU it is not faster either. The test dataset is read in chunks, which the pyarrow engine does not support.
+# Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the files (the default decimal parser of the C engine may differ in the last digit).
+use_pyarrow = (pyarrow is not None) and (number_of_cpus > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(number_of_cpus)
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# Read the train dataset (the predictions are added to it, so no copies are made).
+train_dataset = pd.read_csv(sys.argv[1], dtype = schema["train"], **csv_options)
+train_original_dtypes = downcast(train_dataset, class_name, True)
+# Split the train data into X and y.
+# X is converted only once into a numpy array of the type used by the estimator, so that it is not converted again in each fit.
+# Besides, this array is memory-mapped by joblib and shared by all the processes (instead of being copied to each of them).
+class_position = train_dataset.columns.get_loc(class_name)
+y = train_dataset.pop(class_name)
+X = train_dataset.to_numpy(dtype = X_dtype)
+# Create the search.
+estimator = <ESTIMATOR_NAME>(random_state = random_state)
+if search == "grid":
+    model_search = GridSearchCV(estimator, parameter_space, scoring = scoring, n_jobs = number_of_processes, cv = cv)
+else:
+    parameter_distributions = [{parameter: to_distribution(values) for parameter, values in space.items()} for space in (parameter_space if isinstance(parameter_space, list) else [parameter_space])]
+    model_search = RandomizedSearchCV(estimator, parameter_distributions, n_iter = n_iter, scoring = scoring, n_jobs = number_of_processes, cv = cv, random_state = random_state)
+# Fit all combinations (the best one is fitted again with the whole train dataset).
+with joblib.parallel_config(backend = "loky", inner_max_num_threads = threads_per_process):
+    model_search.fit(X, y)
+model = model_search.best_estimator_
+# Write the results of all combinations to disk (from the best to the worst).
+pd.DataFrame(model_search.cv_results_).drop(columns = ["params"]).sort_values("rank_test_score", kind = "stable").to_csv("step2_search_results.csv", index = False)
+# Predict with the train dataset, restore the class and add the new attribute.
+train_predictions = model.predict(X)
+del X
+train_dataset.insert(class_position, class_name, y)
+train_dataset[att_name_for_predictions] = train_predictions
+# Write the train dataset to disk (it is no longer needed).
+write_csv(train_dataset, train_original_dtypes, "step2_train_dataset_with_predictions.csv")
+del train_dataset, y
+# Predict with the test dataset one chunk at a time (so that the memory used does not depend on the size of the test dataset), add the new attribute and write each chunk to disk.
+# All chunks are read with the types of the whole test dataset (from the schema), so that the output file is exactly the same as if the test dataset were read at once.
+for chunk_number, test_chunk in enumerate(pd.read_csv(sys.argv[2], dtype = schema["test"], chunksize = chunk_size, float_precision = "round_trip")):
+    test_chunk[att_name_for_predictions] = predict(model, test_chunk, class_name)
+    test_chunk.to_csv("step2_test_dataset_with_predictions.csv", index = False, header = (chunk_number == 0), mode = "w" if (chunk_number == 0) else "a")
+# Write the best model to disk (if it is not compressed, its numpy arrays can be memory-mapped on load with 'joblib.load(file_path, mmap_mode="r")').
+joblib.dump(model, "step2_model.joblib", compress = compression)
+# Write the CPU setting used by this step.
+write_cpu_setting("step2_cpu_setting.json", number_of_cpus = number_of_cpus, source = cpu_setting_source, n_jobs = number_of_processes, blas_openmp_threads = number_of_cpus, blas_openmp_threads_per_process = threads_per_process)
@@ -4,9 +4,20 @@
 #    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
 
 import sys
+import os
+import json
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
-import pickle
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import Pipeline
+import numpy as np
+import joblib
+from threadpoolctl import threadpool_limits, threadpool_info
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 _params = {
     "penalty" : 'l2',
@@ -25,37 +36,153 @@ _params = {
     "l1_ratio" : None
 }
 
+def downcast(dataset, class_name, downcast_floats):
+    # Reduce the memory used by the attributes without changing any value: integer attributes are stored in the smallest integer type,
+    # and decimal attributes in float32 when all their values are exactly representable in float32 (the class is not modified).
+    # Returns the original types of the modified attributes.
+    original_dtypes = dict()
+    for column in dataset.columns:
+        if column == class_name:
+            continue
+        values = dataset[column].to_numpy()
+        if np.issubdtype(values.dtype, np.integer):
+            downcast_values = pd.to_numeric(dataset[column], downcast = "integer").to_numpy()
+        elif downcast_floats and (values.dtype == np.float64):
+            with np.errstate(over = "ignore"):
+                downcast_values = values.astype(np.float32)
+            if not np.array_equal(downcast_values, values, equal_nan = True):
+                continue
+        else:
+            continue
+        if downcast_values.dtype != values.dtype:
+            original_dtypes[column] = values.dtype
+            dataset[column] = downcast_values
+    return original_dtypes
+
+def predict(model, dataset, class_name):
+    # The class (if it exists) is temporarily removed, so that the dataset itself (and not a copy) is used as X.
+    if class_name not in dataset.columns:
+        return model.predict(dataset)
+    class_position = dataset.columns.get_loc(class_name)
+    class_values = dataset.pop(class_name)
+    predictions = model.predict(dataset)
+    dataset.insert(class_position, class_name, class_values)
+    return predictions
+
+def read_chunks(file_path, dtype):
+    # All chunks are read with the types of the whole dataset (from the schema), so that the output file is exactly the same as if the dataset were read at once.
+    return pd.read_csv(file_path, dtype = dtype, chunksize = chunk_size, float_precision = "round_trip")
+
+def fit_out_of_core(file_path, dtype, class_name, random_state):
+    # Fit the model without loading the train dataset at once: the train dataset is read one chunk at a time, first to fit the scaler (and find the classes
+    # and the number of instances), and then once per epoch to fit the classifier by stochastic gradient descent over the standardised chunks.
+    scaler = StandardScaler()
+    classes = set()
+    number_of_instances = 0
+    for train_chunk in read_chunks(file_path, dtype):
+        y_chunk = train_chunk.pop(class_name)
+        scaler.partial_fit(train_chunk)
+        classes.update(y_chunk.unique())
+        number_of_instances += len(train_chunk)
+    # The log loss with this L2 penalty is the objective of LogisticRegression (divided by C times the number of instances), so that both are regularised in the same way.
+    # The coefficients are averaged over all the updates, which converges to the coefficients of LogisticRegression much faster than the last update (the penalty is too small to damp its noise).
+    classifier = SGDClassifier(loss = "log_loss", penalty = "l2", alpha = 1.0 / (_params["C"] * number_of_instances), fit_intercept = _params["fit_intercept"],
+                               average = True, random_state = random_state, n_jobs = n_jobs)
+    classes = np.array(sorted(classes))
+    for epoch in range(epochs):
+        for train_chunk in read_chunks(file_path, dtype):
+            y_chunk = train_chunk.pop(class_name)
+            classifier.partial_fit(scaler.transform(train_chunk), y_chunk.to_numpy(), classes = classes)
+    return Pipeline([("scaler", scaler), ("classifier", classifier)])
+
+def predict_csv(model, input_file_path, dtype, output_file_path):
+    # Predict with a dataset one chunk at a time (so that the memory used does not depend on the size of the dataset), add the new attribute and write each chunk to disk.
+    for chunk_number, chunk in enumerate(read_chunks(input_file_path, dtype)):
+        chunk[att_name_for_predictions] = predict(model, chunk, class_name)
+        chunk.to_csv(output_file_path, index = False, header = (chunk_number == 0), mode = "w" if (chunk_number == 0) else "a")
+
+def write_csv(dataset, original_dtypes, file_path):
+    # The attributes are written with their original types (so that the output file is exactly the same), one block of rows at a time.
+    for block_start in range(0, max(len(dataset), 1), block_size):
+        dataset.iloc[block_start:block_start+block_size].astype(original_dtypes).to_csv(file_path, index = False, header = (block_start == 0), mode = "w" if (block_start == 0) else "a")
+
+def cpu_setting():
+    # Number of CPUs that the step can use: the value of the environment variable PHENOFLOW_N_JOBS (if it is set) or, otherwise, the effective CPU quota
+    # of the container (joblib takes into account the CPU affinity of the process and the cgroup CPU quota, and not only the number of CPUs of the machine).
+    environment_value = os.environ.get("PHENOFLOW_N_JOBS")
+    if environment_value:
+        return max(1, int(environment_value)), "PHENOFLOW_N_JOBS"
+    return joblib.cpu_count(), "CPU quota"
+
+def write_cpu_setting(file_path, **setting):
+    # The CPU setting used by the step is written to disk, together with the thread pools (BLAS/OpenMP) actually loaded and their number of threads.
+    setting["thread_pools"] = [{"library": thread_pool["internal_api"], "number_of_threads": thread_pool["num_threads"]} for thread_pool in threadpool_info()]
+    with open(file_path, "w") as file_out:
+        json.dump(setting, file_out, indent = 2)
+
 # Class name.
 class_name = "Class"
 att_name_for_predictions = class_name + "_pred"
-# Read the input datasets.
-train_dataset = pd.read_csv(sys.argv[1])
-test_dataset = pd.read_csv(sys.argv[2])
-# Create the output datasets.
-train_dataset_with_predictions = train_dataset.copy()
-test_dataset_with_predictions = test_dataset.copy()
-# Create the model.
+# Decimal attributes are not stored in float32, since LogisticRegression would then be fitted in float32 (and the predictions could change).
+downcast_floats = False
+# Number of rows of the output train dataset written at once.
+block_size = 100000
+# Number of rows of the test dataset (and, in the out-of-core mode, of the train dataset) read at once.
+chunk_size = 100000
+# Out-of-core mode: the train dataset is not loaded at once, but read in chunks of chunk_size instances. The attributes are standardised (with a scaler fitted one chunk at a time)
+# and a logistic regression is fitted by stochastic gradient descent (SGDClassifier with the log loss), passing over all the chunks of the train dataset 'epochs' times.
+# The model is then a pipeline of the scaler and the classifier. Otherwise, the whole train dataset is loaded and LogisticRegression is fitted.
+out_of_core = False
+epochs = 5
+# Compression level of the model file, from 0 (no compression) to 9.
+compression = 0
+# Number of CPUs used by the step, which also limits the BLAS/OpenMP thread pools (so that they do not use more CPUs than the quota).
+number_of_cpus, cpu_setting_source = cpu_setting()
+threadpool_limits(limits = number_of_cpus)
+# LogisticRegression only uses n_jobs with the one-vs-rest scheme (and ignores it since scikit-learn 1.8), so the CPUs are used through the BLAS thread pool.
+# SGDClassifier fits one binary classifier per class (with more than two classes), one per thread.
+n_jobs = number_of_cpus if out_of_core else _params["n_jobs"]
+# Types of the attributes of both datasets, inferred only once in the step 1 (the datasets are read with these types, without inferring them again).
+with open(sys.argv[3], "r") as file_in:
+    schema = json.load(file_in)
+# The train dataset is read with the pyarrow engine (with one thread per CPU) if it is installed and the step has more than one CPU: it builds an Arrow table before the DataFrame, so its peak
+# memory is higher than the one of the C engine, and with only one CPU it is not faster either. The test dataset is read in chunks, which the pyarrow engine does not support.
+# Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the files (the default decimal parser of the C engine may differ in the last digit).
+use_pyarrow = (pyarrow is not None) and (number_of_cpus > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(number_of_cpus)
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# Random seed of the model.
 random_state_value = 100 or _params["random_state"]
-model = LogisticRegression(penalty = _params["penalty"], dual = _params["dual"], tol = _params["tol"], C = _params["C"],
-                           fit_intercept = _params["fit_intercept"], intercept_scaling = _params["intercept_scaling"],
-                           class_weight = _params["class_weight"], random_state = random_state_value, solver = _params["solver"],
-                           max_iter = _params["max_iter"], verbose = _params["verbose"], warm_start = _params["warm_start"],
-                           n_jobs = _params["n_jobs"], l1_ratio = _params["l1_ratio"])
-# Split the train data into X and y.
-X = train_dataset.drop(columns=[class_name], inplace=False)
-y = train_dataset[class_name]
-# Fit.
-model.fit(X, y)
-# Predict with the train dataset and add the new attribute.
-train_dataset_with_predictions[att_name_for_predictions] = pd.Series(model.predict(X))
-# Predict with the test dataset and add the new attribute.
-if class_name in test_dataset.columns:
-    test_dataset_with_predictions[att_name_for_predictions] = pd.Series(model.predict(test_dataset.drop(columns = [class_name], inplace = False)))
+if out_of_core:
+    model = fit_out_of_core(sys.argv[1], schema["train"], class_name, random_state_value)
+    # Predict with the train dataset one chunk at a time, add the new attribute and write each chunk to disk.
+    predict_csv(model, sys.argv[1], schema["train"], "step2_train_dataset_with_predictions.csv")
 else:
-    test_dataset_with_predictions[att_name_for_predictions] = pd.Series(model.predict(test_dataset))
-# Write the results to disk.
-train_dataset_with_predictions.to_csv("step2_train_dataset_with_predictions.csv", index = False)
-test_dataset_with_predictions.to_csv("step2_test_dataset_with_predictions.csv", index = False)
-model_file = open("step2_model.pickle", "wb")
-pickle.dump(model, model_file)
-model_file.close()
+    # Read the train dataset (the predictions are added to it, so no copies are made).
+    train_dataset = pd.read_csv(sys.argv[1], dtype = schema["train"], **csv_options)
+    train_original_dtypes = downcast(train_dataset, class_name, downcast_floats)
+    # Create the model.
+    model = LogisticRegression(penalty = _params["penalty"], dual = _params["dual"], tol = _params["tol"], C = _params["C"],
+                               fit_intercept = _params["fit_intercept"], intercept_scaling = _params["intercept_scaling"],
+                               class_weight = _params["class_weight"], random_state = random_state_value, solver = _params["solver"],
+                               max_iter = _params["max_iter"], verbose = _params["verbose"], warm_start = _params["warm_start"],
+                               n_jobs = n_jobs, l1_ratio = _params["l1_ratio"])
+    # Split the train data into X and y (the class is temporarily removed, so that X is the train dataset itself and not a copy).
+    class_position = train_dataset.columns.get_loc(class_name)
+    y = train_dataset.pop(class_name)
+    # Fit.
+    model.fit(train_dataset, y)
+    # Predict with the train dataset, restore the class and add the new attribute.
+    train_predictions = model.predict(train_dataset)
+    train_dataset.insert(class_position, class_name, y)
+    train_dataset[att_name_for_predictions] = train_predictions
+    # Write the train dataset to disk (it is no longer needed).
+    write_csv(train_dataset, train_original_dtypes, "step2_train_dataset_with_predictions.csv")
+    del train_dataset, y
+# Predict with the test dataset one chunk at a time.
+predict_csv(model, sys.argv[2], schema["test"], "step2_test_dataset_with_predictions.csv")
+# Write the model to disk (if it is not compressed, its numpy arrays can be memory-mapped on load with 'joblib.load(file_path, mmap_mode="r")').
+joblib.dump(model, "step2_model.joblib", compress = compression)
+# Write the CPU setting used by this step.
+write_cpu_setting("step2_cpu_setting.json", number_of_cpus = number_of_cpus, source = cpu_setting_source, n_jobs = n_jobs, blas_openmp_threads = number_of_cpus)
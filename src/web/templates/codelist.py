@@ -2,24 +2,29 @@
 
 import sys, csv, re
 
-codes = [[LIST]];
+# Codes are indexed once, so each lookup takes the same time whatever the size of the codelist.
+codes = frozenset([[LIST]]);
 REQUIRED_CODES = [REQUIRED_CODES];
+# Columns holding cell lists of codes (e.g. (code,date),(code,date)). If the input has none of them, every column is scanned.
+CODE_COLUMNS = ["codes"];
+# Code of each entry in a cell list: the text between an opening bracket and the next comma.
+CODE_PATTERN = re.compile(r'\(([^,]*)\,');
+
+def count_codes(row, code_columns):
+    # Codes of the row that are in the codelist, counted until REQUIRED_CODES is reached.
+    codes_identified = 0;
+    for column in code_columns:
+        for item in CODE_PATTERN.findall(row[column]):
+            if(item in codes):
+                codes_identified+=1;
+                if(codes_identified>=REQUIRED_CODES): return codes_identified;
+    return codes_identified;
+
 with open(sys.argv[1], 'r') as file_in, open('[PHENOTYPE]-potential-cases.csv', 'w', newline='') as file_out:
     csv_reader = csv.DictReader(file_in)
     csv_writer = csv.DictWriter(file_out, csv_reader.fieldnames + ["[CATEGORY]-identified"])
     csv_writer.writeheader();
-    codes_identified = 0;
+    code_columns = [column for column in csv_reader.fieldnames if column in CODE_COLUMNS] or csv_reader.fieldnames;
     for row in csv_reader:
-        newRow = row.copy();
-        for cell in row:
-            # Iterate cell lists (e.g. codes)
-            for item in re.findall(r'\(([^,]*)\,', row[cell]):
-                if(item in codes): codes_identified+=1;
-                if(codes_identified>=REQUIRED_CODES):
-                    newRow["[CATEGORY]-identified"] = "CASE";
-                    break;
-            if(codes_identified>=REQUIRED_CODES): break;
-        if(codes_identified<REQUIRED_CODES):
-            newRow["[CATEGORY]-identified"] = "UNK";
-        codes_identified=0;
-        csv_writer.writerow(newRow)
+        row["[CATEGORY]-identified"] = "CASE" if count_codes(row, code_columns)>=REQUIRED_CODES else "UNK";
+        csv_writer.writerow(row)
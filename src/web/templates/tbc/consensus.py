@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+# This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
+
+# Consensus version of the Trace-based clustering technique: the whole technique is executed with several random seeds in only one run, and the results are aggregated.
+# For each instance, the output file contains the number (and the frequency) of random seeds for which the instance belongs to a final candidate cluster.
+# The final candidate clusters obtained with each random seed are exactly the same as the ones obtained by the five-step workflow with that random seed.
+
+import sys
+import os
+import tempfile
+from pandas import read_csv
+# We force that all clustering algorithms are from 'sklearn.cluster' to maintain the same interface.
+from sklearn.cluster import <CLUSTERING_ALGORITHM_NAME>
+import numpy as np
+from joblib import Parallel, delayed, parallel_config, effective_n_jobs, cpu_count
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+def divide(numerators, denominators):
+    # Element-wise division of the values of match, in which the value of match is 0 when the denominator is 0 (e.g., between two empty clusters, which some clustering algorithms can generate).
+    return np.divide(numerators, denominators, out=np.zeros(np.broadcast(numerators, denominators).shape), where=(denominators > 0))
+
+def generate_partition(dataset_path, number_of_clusters, current_random_seed):
+    # All the worker processes share the same memory-mapped copy of the dataset.
+    pandas_dataframe = np.load(dataset_path, mmap_mode="r")
+    # Run the clustering algorithm.
+    algorithm_result = <CLUSTERING_ALGORITHM_CALL>
+    # Cluster of each instance of the original dataset.
+    return algorithm_result.labels_
+
+def final_candidate_instances(labels_matrix):
+    # Steps 3 and 4 of the technique over the partitions of one random seed: returns a boolean array indicating whether each instance belongs to a final candidate cluster.
+    labels_of_partition_k = labels_matrix[:, k-2].astype(np.int64)
+    cluster_sizes_of_partition_k = np.bincount(labels_of_partition_k, minlength=k)
+    # For each previous partition (from the partition 2 to the partition k-1), the maximum value of match of each cluster of the partition k.
+    max_values_of_match = dict()
+    for partition_number in range(2, k):
+        labels_of_current_partition = labels_matrix[:, partition_number-2].astype(np.int64)
+        cluster_sizes_of_current_partition = np.bincount(labels_of_current_partition, minlength=partition_number)
+        # Contingency table: position [i, j] stores the size of the intersection between the cluster i of the partition k and the cluster j of the current partition.
+        intersection_sizes = np.bincount(labels_of_partition_k * partition_number + labels_of_current_partition, minlength=k*partition_number).reshape(k, partition_number)
+        # Values of match between all pairs of clusters.
+        values_of_match = <VALUE_OF_MATCH_CALCULATION>
+        max_values_of_match[partition_number] = values_of_match.max(axis=1).tolist()
+    # Final candidate clusters: the mean value of match (computed in the same order as in the step 4) is greater or equal than the threshold.
+    final_candidate_clusters = np.zeros(k, dtype=bool)
+    for cluster_number_of_partition_k in range(0, k):
+        values_of_match = [max_values_of_match[partition_number][cluster_number_of_partition_k] for partition_number in range(2, k)]
+        mean_value_of_match = sum(values_of_match) / len(values_of_match)
+        final_candidate_clusters[cluster_number_of_partition_k] = (mean_value_of_match >= threshold)
+    return final_candidate_clusters[labels_of_partition_k]
+
+# Initial parameters.
+# Each random seed is used only once (a repeated seed would give the same partitions again and count them twice).
+random_seeds = list(dict.fromkeys([<RANDOM_SEEDS_PARAMETER>]))
+k = <K_PARAMETER>
+threshold = <THRESHOLD_PARAMETER>
+# Number of processes used to generate the partitions (-1 means all available CPUs).
+n_jobs = <N_JOBS_PARAMETER>
+# Number of rows of the output file written at once.
+block_size = 100000
+
+# The dataset is read as the step 2 reads it: all attributes are decimal (the type used by the clustering algorithms, as in the schema written by the step 1), and the pyarrow engine
+# (with one thread per CPU) is used if it is installed and there is more than one CPU, as in the step 2. Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the file
+# (the default decimal parser of the C engine may differ in the last digit), and the partitions of each random seed are the same as the ones of the step 2.
+use_pyarrow = (pyarrow is not None) and (cpu_count() > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(cpu_count())
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# The dataset is read only once and stored in a temporary npy file, which is memory-mapped by all worker processes.
+with tempfile.TemporaryDirectory() as temporary_folder_path:
+    dataset_path = os.path.join(temporary_folder_path, "dataset.npy")
+    np.save(dataset_path, read_csv(sys.argv[1], dtype=np.float64, **csv_options).to_numpy())
+    number_of_instances = np.load(dataset_path, mmap_mode="r").shape[0]
+    # Partitions of each random seed: for the random seed s, the partition with 'number_of_clusters' clusters uses the seed s + 3*(number_of_clusters-2), exactly as in the step 2.
+    tasks = [(random_seed, number_of_clusters) for random_seed in random_seeds for number_of_clusters in range(2, k+1)]
+    labels_matrices = {random_seed: np.empty((number_of_instances, k-1), dtype=np.min_scalar_type(k-1), order="F") for random_seed in random_seeds}
+    # All partitions (of all random seeds) are generated in parallel, since they are independent.
+    # - The BLAS/OpenMP threads of each process are limited, so that the processes do not compete for the same CPUs.
+    number_of_processes = min(effective_n_jobs(n_jobs), len(tasks))
+    with parallel_config(backend="loky", inner_max_num_threads=max(1, cpu_count() // number_of_processes)):
+        all_labels = Parallel(n_jobs=number_of_processes, return_as="generator")(delayed(generate_partition)(dataset_path, number_of_clusters, random_seed + 3*(number_of_clusters-2)) for random_seed, number_of_clusters in tasks)
+        for (random_seed, number_of_clusters), labels in zip(tasks, all_labels):
+            labels_matrices[random_seed][:, number_of_clusters-2] = labels
+
+# Number of random seeds for which each instance belongs to a final candidate cluster.
+number_of_seeds = np.zeros(number_of_instances, dtype=np.int64)
+for random_seed in random_seeds:
+    number_of_seeds += final_candidate_instances(labels_matrices[random_seed])
+    # The partitions of this random seed are no longer needed.
+    del labels_matrices[random_seed]
+
+with open('name_<WORKFLOW_NAME>_id_<WORKFLOW_ID>_output.csv', 'w') as file_out:
+    file_out.write('"instance index of the initial dataset (starting from 0)","number of random seeds for which the instance belongs to a final candidate cluster (from a total of ' + str(len(random_seeds)) + ')","stable cluster frequency"\n')
+    # The rows are written in large blocks.
+    for block_start in range(0, number_of_instances, block_size):
+        block_end = min(block_start + block_size, number_of_instances)
+        file_out.write("".join(str(instance_index) + "," + str(seeds) + "," + str(seeds / len(random_seeds)) + "\n" for instance_index, seeds in zip(range(block_start, block_end), number_of_seeds[block_start:block_end].tolist())))
@@ -6,7 +6,20 @@
 # This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
 
 import sys
+import os
+import shutil
+import json
+from pandas import read_csv
 
-with open(sys.argv[1], 'r') as file_in, open('name_tbc001_id_6_dataset.csv', 'w') as file_out:
-    file_content = file_in.read()
-    file_out.write(file_content)
+# Validation: only the header of the dataset is parsed (an empty or malformed file raises an error).
+header = read_csv(sys.argv[1], nrows=0)
+try:
+    # Hard link: no data is copied at all (only possible if both paths are in the same filesystem).
+    os.link(sys.argv[1], 'name_tbc001_id_6_dataset.csv')
+except OSError:
+    # Otherwise, the copy is done by the kernel (shutil uses 'os.sendfile'/'copy_file_range' when available), without loading the dataset in memory.
+    shutil.copyfile(sys.argv[1], 'name_tbc001_id_6_dataset.csv')
+# Schema of the dataset (names and types of its attributes), used by the following steps to read it.
+# All attributes are decimal, which is the type used by the clustering algorithms, so they are known from the header (the dataset is not read).
+with open('name_tbc001_id_6_schema.json', 'w') as file_out:
+    json.dump({"dataset": {column: "float64" for column in header.columns}}, file_out, indent=4)
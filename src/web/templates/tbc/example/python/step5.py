@@ -8,14 +8,74 @@
 import sys
 import json
 
+def iterate_json_object(file_in, chunk_size=1 << 20):
+    # Iterate over the (key, value) pairs of a json object stored in a file, reading the file incrementally.
+    # Only one value is decoded at a time, so the memory used is bounded by the largest value (and not by the whole file).
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    end_of_file = False
+    def read_more():
+        nonlocal buffer, position, end_of_file
+        # The size of the read grows with the buffer, so that decoding a large value is not quadratic.
+        chunk = file_in.read(max(chunk_size, len(buffer) - position))
+        end_of_file = (chunk == "")
+        buffer = buffer[position:] + chunk
+        position = 0
+    def next_token():
+        # Skip the whitespaces and return the next character (None at the end of the file).
+        nonlocal position
+        while True:
+            while (position < len(buffer)) and buffer[position].isspace():
+                position = position + 1
+            if position < len(buffer):
+                return buffer[position]
+            if end_of_file:
+                return None
+            read_more()
+    def decode():
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # A value that is not followed by a delimiter could continue in the file (e.g. a number).
+                if ((end < len(buffer)) and (buffer[end] in ",:]} \t\r\n")) or end_of_file:
+                    position = end
+                    return value
+                read_more()
+            except json.JSONDecodeError:
+                # The value is not complete in the buffer (unless the end of the file was reached).
+                if end_of_file:
+                    raise
+                read_more()
+    if next_token() != "{":
+        raise ValueError("The file does not contain a json object.")
+    position = position + 1
+    if next_token() == "}":
+        return
+    while True:
+        next_token()
+        key = decode()
+        if next_token() != ":":
+            raise ValueError("Invalid json object: ':' was expected.")
+        position = position + 1
+        next_token()
+        yield key, decode()
+        token = next_token()
+        position = position + 1
+        if token == "}":
+            return
+        if token != ",":
+            raise ValueError("Invalid json object: ',' or '}' was expected.")
+
+# Number of rows written at once.
+block_size = 100000
+
 with open(sys.argv[1], 'r') as file_in, open('name_tbc001_id_6_output.csv', 'w') as file_out:
-    # Read the final candidate clusters generated in the previous step.
-    final_candidate_clusters = json.load(file_in)
     # Write in the output file.
     file_out.write('"instance index of the initial dataset (starting from 0)","cluster name (starting from 0 and from the partition with 5 clusters)","mean value of match with previous partitions"\n')
-    # Iterate over the final candidate clusters.
-    for cluster_name in final_candidate_clusters:
-        current_cluster = final_candidate_clusters[cluster_name]
+    # Iterate over the final candidate clusters generated in the previous step (one cluster at a time).
+    for cluster_name, current_cluster in iterate_json_object(file_in):
         # For each cluster, iterate over the previous partitions.
         previous_partitions = current_cluster["match_with_previous_partitions"]
         # All values of match.
@@ -25,6 +85,9 @@ with open(sys.argv[1], 'r') as file_in, open('name_tbc001_id_6_output.csv', 'w')
             values_of_match.append( current_previous_partition["max_value_of_match"] )
         # Compute the mean.
         mean_value_of_match = sum(values_of_match) / len(values_of_match)
-        # For each cluster, iterate over its instances.
-        for instance_index in current_cluster["instances"]:
-            file_out.write(str(instance_index) + "," + cluster_name + "," + str(mean_value_of_match) + "\n")
+        # The last two columns are the same for all the instances of the cluster, so the rows are written in large blocks.
+        # Each block is the list of instance indexes joined with the rest of the row (which also ends each row).
+        row_suffix = "," + cluster_name + "," + str(mean_value_of_match) + "\n"
+        instances = current_cluster["instances"]
+        for block_start in range(0, len(instances), block_size):
+            file_out.write(row_suffix.join(map(str, instances[block_start:block_start+block_size])) + row_suffix)
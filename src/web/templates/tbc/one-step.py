@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+# This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
+
+# One-step version of the Trace-based clustering technique: the steps 2 to 5 are executed in the same process, over in-memory arrays, without writing the intermediate json files.
+# The output file is exactly the same as the one generated by the step 5.
+
+import sys
+import os
+import hashlib
+from pandas import read_csv
+import sklearn
+# We force that all clustering algorithms are from 'sklearn.cluster' to maintain the same interface.
+from sklearn.cluster import <CLUSTERING_ALGORITHM_NAME>
+import numpy as np
+from joblib import Parallel, delayed, parallel_config, effective_n_jobs, cpu_count
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+def divide(numerators, denominators):
+    # Element-wise division of the values of match, in which the value of match is 0 when the denominator is 0 (e.g., between two empty clusters, which some clustering algorithms can generate).
+    return np.divide(numerators, denominators, out=np.zeros(np.broadcast(numerators, denominators).shape), where=(denominators > 0))
+
+def get_partition_store():
+    # Optional folder (shared between executions) in which the partitions already computed are stored.
+    partition_store = os.environ.get("PHENOFLOW_TBC_PARTITION_STORE")
+    if partition_store and os.path.isdir(partition_store):
+        return partition_store
+    return None
+
+def file_hash(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file_in:
+        for block in iter(lambda: file_in.read(1 << 20), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def save_to_store(file_path, array):
+    # The file is renamed once completely written, so that concurrent executions never read an incomplete partition.
+    temporary_file_path = file_path + "." + str(os.getpid()) + ".tmp.npy"
+    np.save(temporary_file_path, array)
+    os.replace(temporary_file_path, file_path)
+
+def generate_partition(pandas_dataframe, number_of_clusters, current_random_seed):
+    # Run the clustering algorithm.
+    algorithm_result = <CLUSTERING_ALGORITHM_CALL>
+    # Cluster of each instance of the original pandas dataframe.
+    return algorithm_result.labels_
+
+# Initial parameters.
+random_seed = <RANDOM_SEED_PARAMETER>
+k = <K_PARAMETER>
+threshold = <THRESHOLD_PARAMETER>
+# Number of processes used to generate the partitions (-1 means all available CPUs).
+n_jobs = <N_JOBS_PARAMETER>
+# Number of rows of the output file written at once.
+block_size = 100000
+
+##### Step 2: generate all partitions (label matrix). #####
+# Partitions already computed in previous executions.
+# The partition with 'number_of_clusters' clusters only depends on the dataset, the clustering algorithm, the random seed and 'number_of_clusters'.
+partition_store = get_partition_store()
+stored_partitions = dict()
+if partition_store:
+    partitions_folder_path = os.path.join(partition_store, file_hash(sys.argv[1]), "<CLUSTERING_ALGORITHM_NAME>-sklearn_" + sklearn.__version__ + "-seed_" + str(random_seed))
+    os.makedirs(partitions_folder_path, exist_ok=True)
+    for number_of_clusters in range(2, k+1):
+        stored_partition_path = os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy")
+        if os.path.exists(stored_partition_path):
+            stored_partitions[number_of_clusters] = np.load(stored_partition_path)
+# Partitions that have to be computed in this execution.
+missing_partitions = [number_of_clusters for number_of_clusters in range(2, k+1) if number_of_clusters not in stored_partitions]
+# The dataset is read as the step 2 reads it: all attributes are decimal (the type used by the clustering algorithms, as in the schema written by the step 1), and the pyarrow engine
+# (with one thread per CPU) is used if it is installed and there is more than one CPU, as in the step 2. Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the file
+# (the default decimal parser of the C engine may differ in the last digit), and the partitions are the same as (and can be shared with) the ones of the step 2.
+use_pyarrow = (pyarrow is not None) and (cpu_count() > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(cpu_count())
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# Read the input dataset (only if it is necessary).
+pandas_dataframe = read_csv(sys.argv[1], dtype=np.float64, **csv_options) if missing_partitions else None
+number_of_instances = len(pandas_dataframe) if missing_partitions else len(stored_partitions[2])
+# Matrix in which the partitions will be stored: position [i, j] contains the cluster of the instance i in the partition with j+2 clusters.
+labels_matrix = np.empty((number_of_instances, k-1), dtype=np.min_scalar_type(k-1), order="F")
+for number_of_clusters, labels in stored_partitions.items():
+    labels_matrix[:, number_of_clusters-2] = labels
+# The random seed will be different on each call to the clustering algorithm (current_random_seed + 3), exactly as in the step 2.
+random_seeds = [random_seed + 3*(number_of_clusters-2) for number_of_clusters in missing_partitions]
+# Generate the missing partitions in parallel, since they are independent.
+if missing_partitions:
+    number_of_processes = min(effective_n_jobs(n_jobs), len(missing_partitions))
+    with parallel_config(backend="loky", inner_max_num_threads=max(1, cpu_count() // number_of_processes)):
+        all_labels = Parallel(n_jobs=number_of_processes, return_as="generator")(delayed(generate_partition)(pandas_dataframe, number_of_clusters, current_random_seed) for number_of_clusters, current_random_seed in zip(missing_partitions, random_seeds))
+        for number_of_clusters, labels in zip(missing_partitions, all_labels):
+            labels_matrix[:, number_of_clusters-2] = labels
+            if partition_store:
+                save_to_store(os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy"), labels_matrix[:, number_of_clusters-2])
+# The dataset is no longer needed.
+del pandas_dataframe
+
+##### Step 3: matrix of matches. #####
+# Labels and cluster sizes of the partition with more clusters.
+labels_of_partition_k = labels_matrix[:, k-2].astype(np.int64)
+cluster_sizes_of_partition_k = np.bincount(labels_of_partition_k, minlength=k)
+# Indexes of the instances of each cluster of the partition with more clusters (in ascending order).
+instances_of_partition_k = np.split(np.argsort(labels_of_partition_k, kind="stable"), np.cumsum(cluster_sizes_of_partition_k)[:-1])
+# For each previous partition (from the partition 2 to the partition k-1), the maximum value of match of each cluster of the partition k.
+max_values_of_match = dict()
+for partition_number in range(2, k):
+    labels_of_current_partition = labels_matrix[:, partition_number-2].astype(np.int64)
+    cluster_sizes_of_current_partition = np.bincount(labels_of_current_partition, minlength=partition_number)
+    # Contingency table: position [i, j] stores the size of the intersection between the cluster i of the partition k and the cluster j of the current partition.
+    intersection_sizes = np.bincount(labels_of_partition_k * partition_number + labels_of_current_partition, minlength=k*partition_number).reshape(k, partition_number)
+    # Values of match between all pairs of clusters.
+    values_of_match = <VALUE_OF_MATCH_CALCULATION>
+    max_values_of_match[partition_number] = values_of_match.max(axis=1).tolist()
+
+##### Steps 4 and 5: filter the final candidate clusters and write them to the output file. #####
+with open('name_<WORKFLOW_NAME>_id_<WORKFLOW_ID>_output.csv', 'w') as file_out:
+    file_out.write('"instance index of the initial dataset (starting from 0)","cluster name (starting from 0 and from the partition with <K_PARAMETER> clusters)","mean value of match with previous partitions"\n')
+    # Iterate over the clusters of the partition with more clusters (i.e., from cluster 0 to cluster k-1).
+    for cluster_number_of_partition_k in range(0, k):
+        # All values of match (in the same order as in the matrix of matches, so that the mean is exactly the same).
+        values_of_match = [max_values_of_match[partition_number][cluster_number_of_partition_k] for partition_number in range(2, k)]
+        # Compute the mean.
+        mean_value_of_match = sum(values_of_match) / len(values_of_match)
+        # Compare the mean with the threshold.
+        if mean_value_of_match >= threshold:
+            cluster_name = "partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)
+            # The rows are written in large blocks (the last two columns are the same for all the instances of the cluster).
+            row_suffix = "," + cluster_name + "," + str(mean_value_of_match) + "\n"
+            instances = instances_of_partition_k[cluster_number_of_partition_k]
+            for block_start in range(0, len(instances), block_size):
+                file_out.write(row_suffix.join(map(str, instances[block_start:block_start+block_size].tolist())) + row_suffix)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
+
+# Convert the partitions generated in the step 2 between the 'npy' format (label matrix) and the 'json' format (dictionary of partitions).
+# The direction of the conversion is given by the extension of the input file.
+# Usage: python partitions-converter.py partitions.npy partitions.json
+#        python partitions-converter.py partitions.json partitions.npy
+
+import sys
+import json
+import numpy as np
+
+def labels_to_partitions(labels_matrix):
+    # Column j of the label matrix corresponds to the partition with j+2 clusters.
+    dictionary_of_partitions = dict()
+    for column in range(0, labels_matrix.shape[1]):
+        number_of_clusters = column + 2
+        labels = np.asarray(labels_matrix[:, column])
+        # Indexes of the instances sorted by cluster (and, inside each cluster, in ascending order).
+        sorted_indexes = np.argsort(labels, kind="stable")
+        cluster_boundaries = np.cumsum(np.bincount(labels, minlength=number_of_clusters))[:-1]
+        dictionary_of_clusters = dict()
+        for cluster, indexes in enumerate(np.split(sorted_indexes, cluster_boundaries)):
+            dictionary_of_clusters["cluster_"+str(cluster)] = indexes.tolist()
+        dictionary_of_partitions["partition_k_"+str(number_of_clusters)] = dictionary_of_clusters
+    return dictionary_of_partitions
+
+def partitions_to_labels(dictionary_of_partitions):
+    # Every partition contains all the instances of the dataset.
+    number_of_instances = sum(len(instances) for instances in dictionary_of_partitions["partition_k_2"].values())
+    k = len(dictionary_of_partitions) + 1
+    labels_matrix = np.empty((number_of_instances, k-1), dtype=np.min_scalar_type(k-1), order="F")
+    for number_of_clusters in range(2, k+1):
+        for cluster in range(0, number_of_clusters):
+            labels_matrix[dictionary_of_partitions["partition_k_"+str(number_of_clusters)]["cluster_"+str(cluster)], number_of_clusters-2] = cluster
+    return labels_matrix
+
+if sys.argv[1].endswith(".npy"):
+    with open(sys.argv[2], 'w') as file_out:
+        json.dump(labels_to_partitions(np.load(sys.argv[1], mmap_mode="r")), file_out, indent=4)
+else:
+    with open(sys.argv[1], 'r') as file_in:
+        np.save(sys.argv[2], partitions_to_labels(json.load(file_in)))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Author:
+#    Antonio Lopez-Martinez-Carrasco <antoniolopezmc@um.es>
+
+# This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
+
+# Large-data version of the step 2: the dataset is never loaded completely in memory.
+# - First pass: the clustering models of all partitions are trained incrementally ('partial_fit') over chunks of the dataset.
+# - Second pass: the cluster of each instance is assigned chunk by chunk and written to a memory-mapped label matrix.
+
+import sys
+import os
+import hashlib
+from pandas import read_csv
+import sklearn
+# We force that all clustering algorithms are from 'sklearn.cluster' to maintain the same interface.
+from sklearn.cluster import <CLUSTERING_ALGORITHM_NAME>
+import numpy as np
+import json
+
+def labels_to_partitions(labels_matrix):
+    # Column j of the label matrix corresponds to the partition with j+2 clusters.
+    dictionary_of_partitions = dict()
+    for column in range(0, labels_matrix.shape[1]):
+        number_of_clusters = column + 2
+        labels = np.asarray(labels_matrix[:, column])
+        # Indexes of the instances sorted by cluster (and, inside each cluster, in ascending order).
+        sorted_indexes = np.argsort(labels, kind="stable")
+        cluster_boundaries = np.cumsum(np.bincount(labels, minlength=number_of_clusters))[:-1]
+        dictionary_of_clusters = dict()
+        for cluster, indexes in enumerate(np.split(sorted_indexes, cluster_boundaries)):
+            dictionary_of_clusters["cluster_"+str(cluster)] = indexes.tolist()
+        dictionary_of_partitions["partition_k_"+str(number_of_clusters)] = dictionary_of_clusters
+    return dictionary_of_partitions
+
+def get_partition_store():
+    # Optional folder (shared between executions) in which the partitions already computed are stored.
+    partition_store = os.environ.get("PHENOFLOW_TBC_PARTITION_STORE")
+    if partition_store and os.path.isdir(partition_store):
+        return partition_store
+    return None
+
+def file_hash(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file_in:
+        for block in iter(lambda: file_in.read(1 << 20), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def save_to_store(file_path, array):
+    # The file is renamed once completely written, so that concurrent executions never read an incomplete partition.
+    temporary_file_path = file_path + "." + str(os.getpid()) + ".tmp.npy"
+    np.save(temporary_file_path, array)
+    os.replace(temporary_file_path, file_path)
+
+def read_chunks(file_path):
+    # All chunks are read with the types of the schema (written in the step 1), instead of inferring the type of each chunk independently.
+    # The decimal values are parsed with correct rounding, so the values are exactly the ones written in the file (the default decimal parser may differ in the last digit).
+    for pandas_dataframe in read_csv(file_path, dtype=schema["dataset"], chunksize=chunk_size, float_precision="round_trip"):
+        yield pandas_dataframe.to_numpy(dtype=np.float64)
+
+# Types of the attributes of the dataset.
+with open(sys.argv[2], 'r') as file_in:
+    schema = json.load(file_in)
+# Initial parameters.
+random_seed = <RANDOM_SEED_PARAMETER>
+k = <K_PARAMETER>
+# Format of the output file: 'json' (dictionary of partitions with the indexes of the instances of each cluster) or 'npy' (label matrix).
+partitions_format = "<PARTITIONS_FORMAT>"
+# Number of instances read from the dataset at once (the first chunk must contain at least k instances).
+chunk_size = <CHUNK_SIZE_PARAMETER>
+# Partitions already computed in previous executions.
+# The partition with 'number_of_clusters' clusters only depends on the dataset, the clustering algorithm (and the chunk size), the random seed and 'number_of_clusters'.
+partition_store = get_partition_store()
+stored_partition_paths = dict()
+if partition_store:
+    partitions_folder_path = os.path.join(partition_store, file_hash(sys.argv[1]), "<CLUSTERING_ALGORITHM_NAME>-sklearn_" + sklearn.__version__ + "-seed_" + str(random_seed) + "-chunk_size_" + str(chunk_size))
+    os.makedirs(partitions_folder_path, exist_ok=True)
+    for number_of_clusters in range(2, k+1):
+        stored_partition_path = os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy")
+        if os.path.exists(stored_partition_path):
+            stored_partition_paths[number_of_clusters] = stored_partition_path
+# One clustering model per partition that has to be computed in this execution.
+# The random seed will be different for each model (current_random_seed + 3).
+missing_partitions = []
+clustering_models = []
+current_random_seed = random_seed
+for number_of_clusters in range(2, k+1):
+    if number_of_clusters not in stored_partition_paths:
+        missing_partitions.append(number_of_clusters)
+        clustering_models.append( <CLUSTERING_ALGORITHM_CALL> )
+    # current_random_seed + 3
+    current_random_seed = current_random_seed + 3
+# First pass: train all the models with each chunk, so that the dataset is read only once.
+if missing_partitions:
+    number_of_instances = 0
+    for chunk in read_chunks(sys.argv[1]):
+        for clustering_model in clustering_models:
+            clustering_model.partial_fit(chunk)
+        number_of_instances = number_of_instances + len(chunk)
+else:
+    number_of_instances = len(np.load(stored_partition_paths[2], mmap_mode="r"))
+# Matrix in which the final results will be stored: position [i, j] contains the cluster of the instance i in the partition with j+2 clusters.
+# - The smallest unsigned integer type able to store the cluster numbers is used.
+# - It is stored by columns and memory-mapped, so that it is written to disk as it is filled.
+labels_file_path = 'partitions.npy' if partitions_format == "npy" else 'labels.npy'
+labels_matrix = np.lib.format.open_memmap(labels_file_path, mode='w+', dtype=np.min_scalar_type(k-1), shape=(number_of_instances, k-1), fortran_order=True)
+for number_of_clusters, stored_partition_path in stored_partition_paths.items():
+    labels_matrix[:, number_of_clusters-2] = np.load(stored_partition_path, mmap_mode="r")
+# Second pass: assign the cluster of each instance of the dataset.
+if missing_partitions:
+    first_instance = 0
+    for chunk in read_chunks(sys.argv[1]):
+        for number_of_clusters, clustering_model in zip(missing_partitions, clustering_models):
+            labels_matrix[first_instance:first_instance+len(chunk), number_of_clusters-2] = clustering_model.predict(chunk)
+        first_instance = first_instance + len(chunk)
+    if partition_store:
+        for number_of_clusters in missing_partitions:
+            save_to_store(os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy"), labels_matrix[:, number_of_clusters-2])
+labels_matrix.flush()
+# Finally, we write the partitions to the output file (the 'npy' format has already been written).
+if partitions_format == "json":
+    with open('partitions.json', 'w') as file_out:
+        json.dump(labels_to_partitions(labels_matrix), file_out, indent=4)
+    # The temporary label matrix is no longer needed.
+    del labels_matrix
+    os.remove(labels_file_path)
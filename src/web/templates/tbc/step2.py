@@ -6,36 +6,120 @@
 # This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
 
 import sys
+import os
+import hashlib
 from pandas import read_csv
+import sklearn
 # We force that all clustering algorithms are from 'sklearn.cluster' to maintain the same interface.
 from sklearn.cluster import <CLUSTERING_ALGORITHM_NAME>
+import numpy as np
 import json
+from joblib import Parallel, delayed, parallel_config, effective_n_jobs, cpu_count
+try:
+    # Optional: the pyarrow engine of pandas parses CSV files with several threads.
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
-# IMPORTANT: it is not necessary to use 'open' with the file_input, since it will be read by pandas.
-with open('partitions.json', 'w') as file_out:
-    # Initial parameters.
-    random_seed = <RANDOM_SEED_PARAMETER>
-    k = <K_PARAMETER>
-    # Read the input dataset.
-    pandas_dataframe = read_csv(sys.argv[1])
-    # Dictionary in which the final results will be stored.
+def labels_to_partitions(labels_matrix):
+    # Column j of the label matrix corresponds to the partition with j+2 clusters.
     dictionary_of_partitions = dict()
-    # The random seed will be different on each call to the clustering algorithm.
-    current_random_seed = random_seed
-    # Generate all partitions (from 'number_of_cluster=2' to 'number_of_cluster=k').
-    for number_of_clusters in range(2, k+1):
-        # Run the clustering algorithm.
-        algorithm_result = <CLUSTERING_ALGORITHM_CALL>
-        # For the current partition, generate all its clusters (from 0 to 'number_of_clusters - 1').
+    for column in range(0, labels_matrix.shape[1]):
+        number_of_clusters = column + 2
+        labels = np.asarray(labels_matrix[:, column])
+        # Indexes of the instances sorted by cluster (and, inside each cluster, in ascending order).
+        sorted_indexes = np.argsort(labels, kind="stable")
+        cluster_boundaries = np.cumsum(np.bincount(labels, minlength=number_of_clusters))[:-1]
         dictionary_of_clusters = dict()
-        for cluster in range(0,number_of_clusters):
-            # Dataframe with only the elements/rows of the original pandas dataframe in the cluster number 'cluster'.
-            sub_dataframe = pandas_dataframe[algorithm_result.labels_ == cluster]
-            # Get the list of indexes of the sub_dataframe and add them to the list 'dictionary_of_clusters'. 
-            dictionary_of_clusters["cluster_"+str(cluster)] = sub_dataframe.index.tolist()
-        # current_random_seed + 3
-        current_random_seed = current_random_seed + 3
-        # Add the current partition to the dictionary.
+        for cluster, indexes in enumerate(np.split(sorted_indexes, cluster_boundaries)):
+            dictionary_of_clusters["cluster_"+str(cluster)] = indexes.tolist()
         dictionary_of_partitions["partition_k_"+str(number_of_clusters)] = dictionary_of_clusters
-    # Finally, we convert all to json format and write to the output file.
-    json.dump(dictionary_of_partitions, file_out, indent=4)
+    return dictionary_of_partitions
+
+def get_partition_store():
+    # Optional folder (shared between executions) in which the partitions already computed are stored.
+    partition_store = os.environ.get("PHENOFLOW_TBC_PARTITION_STORE")
+    if partition_store and os.path.isdir(partition_store):
+        return partition_store
+    return None
+
+def file_hash(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file_in:
+        for block in iter(lambda: file_in.read(1 << 20), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def save_to_store(file_path, array):
+    # The file is renamed once completely written, so that concurrent executions never read an incomplete partition.
+    temporary_file_path = file_path + "." + str(os.getpid()) + ".tmp.npy"
+    np.save(temporary_file_path, array)
+    os.replace(temporary_file_path, file_path)
+
+def generate_partition(pandas_dataframe, number_of_clusters, current_random_seed):
+    # Run the clustering algorithm.
+    algorithm_result = <CLUSTERING_ALGORITHM_CALL>
+    # Cluster of each instance of the original pandas dataframe.
+    return algorithm_result.labels_
+
+# IMPORTANT: it is not necessary to use 'open' with the file_input, since it will be read by pandas.
+# Initial parameters.
+random_seed = <RANDOM_SEED_PARAMETER>
+k = <K_PARAMETER>
+# Number of processes used to generate the partitions (-1 means all available CPUs).
+n_jobs = <N_JOBS_PARAMETER>
+# Format of the output file: 'json' (dictionary of partitions with the indexes of the instances of each cluster) or 'npy' (label matrix).
+partitions_format = "<PARTITIONS_FORMAT>"
+# Partitions already computed in previous executions.
+# The partition with 'number_of_clusters' clusters only depends on the dataset, the clustering algorithm, the random seed and 'number_of_clusters'.
+partition_store = get_partition_store()
+stored_partitions = dict()
+if partition_store:
+    partitions_folder_path = os.path.join(partition_store, file_hash(sys.argv[1]), "<CLUSTERING_ALGORITHM_NAME>-sklearn_" + sklearn.__version__ + "-seed_" + str(random_seed))
+    os.makedirs(partitions_folder_path, exist_ok=True)
+    for number_of_clusters in range(2, k+1):
+        stored_partition_path = os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy")
+        if os.path.exists(stored_partition_path):
+            stored_partitions[number_of_clusters] = np.load(stored_partition_path)
+# Partitions that have to be computed in this execution.
+missing_partitions = [number_of_clusters for number_of_clusters in range(2, k+1) if number_of_clusters not in stored_partitions]
+# Types of the attributes of the dataset, written in the step 1 (the dataset is read with these types, without inferring them).
+with open(sys.argv[2], 'r') as file_in:
+    schema = json.load(file_in)
+# The dataset is read with the pyarrow engine (with one thread per CPU) if it is installed and there is more than one CPU: it builds an Arrow table before the DataFrame, so its peak
+# memory is higher than the one of the C engine, and with only one CPU it is not faster either.
+# Both engines parse the decimal values with correct rounding, so the values are exactly the ones written in the file (the default decimal parser of the C engine may differ in the last digit).
+use_pyarrow = (pyarrow is not None) and (cpu_count() > 1)
+if use_pyarrow:
+    pyarrow.set_cpu_count(cpu_count())
+csv_options = {"engine": "pyarrow"} if use_pyarrow else {"engine": "c", "float_precision": "round_trip"}
+# Read the input dataset (only if it is necessary).
+pandas_dataframe = read_csv(sys.argv[1], dtype=schema["dataset"], **csv_options) if missing_partitions else None
+number_of_instances = len(pandas_dataframe) if missing_partitions else len(stored_partitions[2])
+# Matrix in which the final results will be stored: position [i, j] contains the cluster of the instance i in the partition with j+2 clusters.
+# - The smallest unsigned integer type able to store the cluster numbers is used.
+# - It is stored by columns, so that each partition is contiguous on disk.
+labels_matrix = np.empty((number_of_instances, k-1), dtype=np.min_scalar_type(k-1), order="F")
+for number_of_clusters, labels in stored_partitions.items():
+    labels_matrix[:, number_of_clusters-2] = labels
+# The random seed will be different on each call to the clustering algorithm (current_random_seed + 3).
+# Each partition gets the same seed as in a sequential execution, so the results do not depend on the number of processes (nor on the partitions stored).
+random_seeds = [random_seed + 3*(number_of_clusters-2) for number_of_clusters in missing_partitions]
+# Generate the missing partitions (from 'number_of_cluster=2' to 'number_of_cluster=k') in parallel, since they are independent.
+# - The dataset is shared with the worker processes through a memory-mapped file (instead of a copy per partition).
+# - The BLAS/OpenMP threads of each process are limited, so that the processes do not compete for the same CPUs.
+if missing_partitions:
+    number_of_processes = min(effective_n_jobs(n_jobs), len(missing_partitions))
+    with parallel_config(backend="loky", inner_max_num_threads=max(1, cpu_count() // number_of_processes)):
+        all_labels = Parallel(n_jobs=number_of_processes, return_as="generator")(delayed(generate_partition)(pandas_dataframe, number_of_clusters, current_random_seed) for number_of_clusters, current_random_seed in zip(missing_partitions, random_seeds))
+        # Store the cluster of each instance of the original pandas dataframe (the partitions are returned in order).
+        for number_of_clusters, labels in zip(missing_partitions, all_labels):
+            labels_matrix[:, number_of_clusters-2] = labels
+            if partition_store:
+                save_to_store(os.path.join(partitions_folder_path, "partition_k_" + str(number_of_clusters) + ".npy"), labels_matrix[:, number_of_clusters-2])
+# Finally, we write the partitions to the output file.
+if partitions_format == "npy":
+    np.save('partitions.npy', labels_matrix)
+else:
+    with open('partitions.json', 'w') as file_out:
+        json.dump(labels_to_partitions(labels_matrix), file_out, indent=4)
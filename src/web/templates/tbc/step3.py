@@ -6,35 +6,113 @@
 # This implementation is based on the paper "A methodology based on Trace-based clustering for patient phenotyping" (DOI: https://doi.org/10.1016/j.knosys.2021.107469 , GITHUB REPO: https://github.com/antoniolopezmc/A-methodology-based-on-Trace-based-clustering-for-patient-phenotyping).
 
 import sys
+import os
+import shutil
+import hashlib
 import json
+import numpy as np
 
-with open(sys.argv[1], 'r') as file_in, open('matrix_of_matches.json', 'w') as file_out:
-    # Initial parameters.
-    k = <K_PARAMETER>
-    # Read all partitions generated in the previous step.
-    partitions = json.load(file_in)
+def partition_to_labels(partition, number_of_instances):
+    # Array in which position i stores the cluster number of the instance i.
+    labels = np.empty(number_of_instances, dtype=np.int64)
+    for cluster_number in range(0, len(partition)):
+        labels[partition["cluster_"+str(cluster_number)]] = cluster_number
+    return labels
+
+def divide(numerators, denominators):
+    # Element-wise division of the values of match, in which the value of match is 0 when the denominator is 0 (e.g., between two empty clusters, which some clustering algorithms can generate).
+    return np.divide(numerators, denominators, out=np.zeros(np.broadcast(numerators, denominators).shape), where=(denominators > 0))
+
+def get_partition_store():
+    # Optional folder (shared between executions) in which the partitions and the matrices of matches already computed are stored.
+    partition_store = os.environ.get("PHENOFLOW_TBC_PARTITION_STORE")
+    if partition_store and os.path.isdir(partition_store):
+        return partition_store
+    return None
+
+def file_hash(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file_in:
+        for block in iter(lambda: file_in.read(1 << 20), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+# Initial parameters.
+k = <K_PARAMETER>
+# The matrix of matches only depends on the partitions and k (it contains all the match functions), so it can be reused when only the threshold or the match function changes (step 4).
+partition_store = get_partition_store()
+if partition_store:
+    matrices_folder_path = os.path.join(partition_store, "matrices_of_matches")
+    os.makedirs(matrices_folder_path, exist_ok=True)
+    matrix_key = hashlib.sha256((file_hash(sys.argv[1]) + "\n" + str(k)).encode("utf-8")).hexdigest()
+    stored_matrix_path = os.path.join(matrices_folder_path, matrix_key + ".json")
+    if os.path.exists(stored_matrix_path):
+        shutil.copyfile(stored_matrix_path, 'matrix_of_matches.json')
+        sys.exit(0)
+# Read all partitions generated in the previous step, either in 'npy' format (label matrix) or in 'json' format (dictionary of partitions).
+if sys.argv[1].endswith(".npy"):
+    # The label matrix is memory-mapped: only the columns of the partitions being compared are read from disk.
+    labels_matrix = np.load(sys.argv[1], mmap_mode="r")
+    number_of_instances = labels_matrix.shape[0]
+    def get_labels(partition_number):
+        return np.asarray(labels_matrix[:, partition_number-2], dtype=np.int64)
+else:
+    with open(sys.argv[1], 'r') as file_in:
+        partitions = json.load(file_in)
+    # Every partition contains all the instances of the dataset.
+    number_of_instances = sum(len(instances) for instances in partitions["partition_k_2"].values())
+    def get_labels(partition_number):
+        return partition_to_labels(partitions["partition_k_"+str(partition_number)], number_of_instances)
+
+with open('matrix_of_matches.json', 'w') as file_out:
+    # Labels and cluster sizes of the partition with more clusters.
+    labels_of_partition_k = get_labels(k)
+    cluster_sizes_of_partition_k = np.bincount(labels_of_partition_k, minlength=k)
+    # Indexes of the instances of each cluster of the partition with more clusters (in ascending order).
+    instances_of_partition_k = np.split(np.argsort(labels_of_partition_k, kind="stable"), np.cumsum(cluster_sizes_of_partition_k)[:-1])
+    # All the match functions are computed at once, since all of them are obtained from the same intersection and cluster sizes.
+    match_functions = ["jaccard", "jaccard2", "dice"]
+    # For each match function and each previous partition (from the partition 2 to the partition k-1), the maximum value of match of each cluster of the partition k and the cluster with which it is obtained.
+    max_values_of_match = {match_function: dict() for match_function in match_functions}
+    clusters_with_max_value_of_match = {match_function: dict() for match_function in match_functions}
+    for partition_number in range(2, k):
+        labels_of_current_partition = get_labels(partition_number)
+        cluster_sizes_of_current_partition = np.bincount(labels_of_current_partition, minlength=partition_number)
+        # Contingency table: position [i, j] stores the size of the intersection between the cluster i of the partition k and the cluster j of the current partition.
+        # It is computed in only one pass, combining both labels into a single one.
+        intersection_sizes = np.bincount(labels_of_partition_k * partition_number + labels_of_current_partition, minlength=k*partition_number).reshape(k, partition_number)
+        # Sum of the sizes of all pairs of clusters.
+        sums_of_cluster_sizes = cluster_sizes_of_partition_k[:, None] + cluster_sizes_of_current_partition[None, :]
+        # Values of match between all pairs of clusters, for each match function.
+        values_of_match_of_each_function = {
+            "jaccard": divide(intersection_sizes, sums_of_cluster_sizes - intersection_sizes),
+            "jaccard2": divide(intersection_sizes, cluster_sizes_of_current_partition[None, :]),
+            "dice": divide(2*intersection_sizes, sums_of_cluster_sizes)
+        }
+        for match_function, values_of_match in values_of_match_of_each_function.items():
+            # IMPORTANT: 'argmax' returns the first occurrence of the maximum value (i.e., the cluster with the lowest number in case of a tie).
+            max_values_of_match[match_function][partition_number] = values_of_match.max(axis=1).tolist()
+            clusters_with_max_value_of_match[match_function][partition_number] = values_of_match.argmax(axis=1).tolist()
     # Dictionary in which the final results will be stored.
     dictionary_matrix_of_matches = dict()
     # Iterate over the clusters of the partition with more clusters (i.e., from cluster 0 to cluster k-1).
     for cluster_number_of_partition_k in range(0, k):
-        dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)] = dict()
-        dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)]["instances"] = partitions["partition_k_"+str(k)]["cluster_"+str(cluster_number_of_partition_k)]
-        dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)]["match_with_previous_partitions"] = dict()
-        # Python set with the indexes of the instances from the original dataset.
-        cluster_of_partition_k = set( partitions["partition_k_"+str(k)]["cluster_"+str(cluster_number_of_partition_k)] )
-        # Iterate over the previous partitions (from the partition 2 to the partition k-1).
-        for partition_number in range(2, k):
-            dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)]["match_with_previous_partitions"]["partition_k_"+str(partition_number)] = dict()
-            max_value_of_match = float("-inf")
-            cluster_with_max_value_of_match = None
-            # Iterate over the clusters of the current partition.
-            for cluster_number in range(0,partition_number):
-                cluster_of_current_partition = set( partitions["partition_k_"+str(partition_number)]["cluster_"+str(cluster_number)] )
-                value_of_match = <VALUE_OF_MATCH_CALCULATION>
-                if value_of_match > max_value_of_match:
-                    max_value_of_match = value_of_match
-                    cluster_with_max_value_of_match = "partition_k_"+str(partition_number)+"_cluster_"+str(cluster_number)
-            dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)]["match_with_previous_partitions"]["partition_k_"+str(partition_number)]["max_value_of_match"] = max_value_of_match
-            dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)]["match_with_previous_partitions"]["partition_k_"+str(partition_number)]["cluster_with_max_value_of_match"] = cluster_with_max_value_of_match
+        current_cluster = dict()
+        current_cluster["instances"] = instances_of_partition_k[cluster_number_of_partition_k].tolist()
+        # The matches with the previous partitions are stored for each match function (the step 4 selects one of them).
+        current_cluster["match_with_previous_partitions"] = dict()
+        for match_function in match_functions:
+            current_cluster["match_with_previous_partitions"][match_function] = dict()
+            # Iterate over the previous partitions (from the partition 2 to the partition k-1).
+            for partition_number in range(2, k):
+                current_cluster["match_with_previous_partitions"][match_function]["partition_k_"+str(partition_number)] = dict()
+                current_cluster["match_with_previous_partitions"][match_function]["partition_k_"+str(partition_number)]["max_value_of_match"] = max_values_of_match[match_function][partition_number][cluster_number_of_partition_k]
+                current_cluster["match_with_previous_partitions"][match_function]["partition_k_"+str(partition_number)]["cluster_with_max_value_of_match"] = "partition_k_"+str(partition_number)+"_cluster_"+str(clusters_with_max_value_of_match[match_function][partition_number][cluster_number_of_partition_k])
+        dictionary_matrix_of_matches["partition_k_"+str(k)+"_cluster_"+str(cluster_number_of_partition_k)] = current_cluster
     # Finally, we convert all to json format and write to the output file.
     json.dump(dictionary_matrix_of_matches, file_out, indent=4)
+# The matrix of matches is stored for future executions (it is renamed once completely written).
+if partition_store:
+    temporary_matrix_path = stored_matrix_path + "." + str(os.getpid()) + ".tmp"
+    shutil.copyfile('matrix_of_matches.json', temporary_matrix_path)
+    os.replace(temporary_matrix_path, stored_matrix_path)
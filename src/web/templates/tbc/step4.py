@@ -8,18 +8,79 @@
 import sys
 import json
 
+def iterate_json_object(file_in, chunk_size=1 << 20):
+    # Iterate over the (key, value) pairs of a json object stored in a file, reading the file incrementally.
+    # Only one value is decoded at a time, so the memory used is bounded by the largest value (and not by the whole file).
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    end_of_file = False
+    def read_more():
+        nonlocal buffer, position, end_of_file
+        # The size of the read grows with the buffer, so that decoding a large value is not quadratic.
+        chunk = file_in.read(max(chunk_size, len(buffer) - position))
+        end_of_file = (chunk == "")
+        buffer = buffer[position:] + chunk
+        position = 0
+    def next_token():
+        # Skip the whitespaces and return the next character (None at the end of the file).
+        nonlocal position
+        while True:
+            while (position < len(buffer)) and buffer[position].isspace():
+                position = position + 1
+            if position < len(buffer):
+                return buffer[position]
+            if end_of_file:
+                return None
+            read_more()
+    def decode():
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # A value that is not followed by a delimiter could continue in the file (e.g. a number).
+                if ((end < len(buffer)) and (buffer[end] in ",:]} \t\r\n")) or end_of_file:
+                    position = end
+                    return value
+                read_more()
+            except json.JSONDecodeError:
+                # The value is not complete in the buffer (unless the end of the file was reached).
+                if end_of_file:
+                    raise
+                read_more()
+    if next_token() != "{":
+        raise ValueError("The file does not contain a json object.")
+    position = position + 1
+    if next_token() == "}":
+        return
+    while True:
+        next_token()
+        key = decode()
+        if next_token() != ":":
+            raise ValueError("Invalid json object: ':' was expected.")
+        position = position + 1
+        next_token()
+        yield key, decode()
+        token = next_token()
+        position = position + 1
+        if token == "}":
+            return
+        if token != ",":
+            raise ValueError("Invalid json object: ',' or '}' was expected.")
+
 with open(sys.argv[1], 'r') as file_in, open('final_candidate_clusters.json', 'w') as file_out:
     # Initial parameters.
     threshold = <THRESHOLD_PARAMETER>
-    # Read the matrix of matches generated in the previous step.
-    matrix_of_matches = json.load(file_in)
-    # Dictionary in which the final results will be stored.
-    dictionary_final_candidate_clusters = dict()
-    # Iterate over the matrix of matches.
-    for cluster_key in matrix_of_matches:
-        current_cluster = matrix_of_matches[cluster_key]
-        # For each cluster, iterate over the previous partitions.
-        previous_partitions = current_cluster["match_with_previous_partitions"]
+    # Match function used to select the final candidate clusters (the matrix of matches contains all of them).
+    match_function = "<MATCH_FUNCTION>"
+    # The final candidate clusters are written (in compact json format) as soon as they are found.
+    file_out.write("{")
+    separator = ""
+    # Iterate over the matrix of matches generated in the previous step (one cluster at a time).
+    for cluster_key, current_cluster in iterate_json_object(file_in):
+        # For each cluster, iterate over the previous partitions (only the matches of the selected match function are kept).
+        previous_partitions = current_cluster["match_with_previous_partitions"][match_function]
+        current_cluster["match_with_previous_partitions"] = previous_partitions
         # All values of match.
         values_of_match = []
         for partition_key in previous_partitions:
@@ -30,6 +91,6 @@ with open(sys.argv[1], 'r') as file_in, open('final_candidate_clusters.json', 'w
         # Compare the mean with the threshold.
         if mean_value_of_match >= threshold:
             # Add the current cluster to the final result.
-            dictionary_final_candidate_clusters[cluster_key] = matrix_of_matches[cluster_key]
-    # Finally, we convert all to json format and write to the output file.
-    json.dump(dictionary_final_candidate_clusters, file_out, indent=4)
+            file_out.write(separator + json.dumps(cluster_key) + ":" + json.dumps(current_cluster, separators=(",", ":")))
+            separator = ","
+    file_out.write("}")
@@ -0,0 +1,134 @@
+# Benchmark of the step 2 of the classifier techniques (fit and predict over the train and test datasets).
+#
+# A synthetic train and test dataset is generated for each size, with integer attributes and decimal attributes (half
+# of them exactly representable in float32). The template (its step 1, which writes the schema of the datasets, and its
+# step 2) is compared with the previous implementation, which copied both datasets and built X with drop(); the output
+# files of both must be exactly the same. The previous implementation parses the decimal values with correct rounding, as
+# the template does. The peak resident memory (RSS) of each run and the size of the model file are reported.
+#
+# Usage: python classifier-step2.py [--sizes 100000 1000000] [--attributes 40] [--classifiers DecisionTreeClassifier ...] [--chunk-size 100000] [--compression 0] [--seed SEED] [--work-dir DIR]
+
+import os, re, ast, sys, time, argparse, filecmp, subprocess
+import numpy as np
+import pandas as pd
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+DEFAULT_SIZES = [100000, 1000000]
+DEFAULT_CLASSIFIERS = ["DecisionTreeClassifier", "LogisticRegression", "RandomForestClassifier"]
+OUTPUT_FILES = ["step2_train_dataset_with_predictions.csv", "step2_test_dataset_with_predictions.csv"]
+# The template persists the model with joblib (compressed with --compression) and the previous implementation with pickle.
+MODEL_FILES = {"template": "step2_model.joblib", "previous": "step2_model.pickle"}
+
+PREVIOUS_STEP2 = '''
+import sys
+import pandas as pd
+from {module} import {classifier}
+import pickle
+
+class_name = "Class"
+att_name_for_predictions = class_name + "_pred"
+train_dataset = pd.read_csv(sys.argv[1], float_precision="round_trip")
+test_dataset = pd.read_csv(sys.argv[2], float_precision="round_trip")
+train_dataset_with_predictions = train_dataset.copy()
+test_dataset_with_predictions = test_dataset.copy()
+model = {classifier}(**{params})
+X = train_dataset.drop(columns=[class_name], inplace=False)
+y = train_dataset[class_name]
+model.fit(X, y)
+train_dataset_with_predictions[att_name_for_predictions] = pd.Series(model.predict(X))
+test_dataset_with_predictions[att_name_for_predictions] = pd.Series(model.predict(test_dataset.drop(columns = [class_name], inplace = False)))
+train_dataset_with_predictions.to_csv("step2_train_dataset_with_predictions.csv", index = False)
+test_dataset_with_predictions.to_csv("step2_test_dataset_with_predictions.csv", index = False)
+model_file = open("step2_model.pickle", "wb")
+pickle.dump(model, model_file)
+model_file.close()
+'''
+
+def dataset(number_of_instances, number_of_attributes, seed):
+    generator = np.random.default_rng(seed)
+    columns = dict()
+    for attribute in range(number_of_attributes):
+        if attribute % 4 == 0:
+            columns["int_" + str(attribute)] = generator.integers(0, 1000, number_of_instances)
+        elif attribute % 4 == 1:
+            columns["float_" + str(attribute)] = generator.normal(size=number_of_instances)
+        else:
+            # Decimal values with few significant digits in binary (e.g. a measure with a precision of 1/8), which are exactly representable in float32.
+            columns["float32_" + str(attribute)] = np.round(generator.normal(100, 20, number_of_instances) * 8) / 8
+    dataframe = pd.DataFrame(columns)
+    dataframe["Class"] = np.where(dataframe.iloc[:, 1] + generator.normal(size=number_of_instances) > 0, "positive", "negative")
+    return dataframe
+
+def render(classifier, chunk_size, compression):
+    replacements = {"<WORKFLOW_NAME>": "benchmark", "<WORKFLOW_ID>": "1", "<CLASS_NAME>": '"Class"', "<RANDOM_STATE>": "1", "<CHUNK_SIZE>": str(chunk_size),
+                    "<COMPRESSION>": str(compression), "<APPROXIMATION>": "None", "<N_COMPONENTS>": "100", "<EARLY_STOPPING>": '"auto"', "<OUT_OF_CORE>": "False",
+                    "<EPOCHS>": "5"}
+    sources = []
+    for file_name in ["step1.py", "step2.py"]:
+        with open(os.path.join(TEMPLATES_FOLDER_PATH, classifier, file_name), 'r') as file_in:
+            source = file_in.read()
+        for placeholder, value in replacements.items():
+            source = source.replace(placeholder, value)
+        # A placeholder added to the templates must also be added to the replacements.
+        placeholders = sorted(set(re.findall(r"<[A-Z_]+>", source)))
+        if placeholders:
+            sys.exit("ERROR: placeholders of " + classifier + "/" + file_name + " not replaced by the benchmark: " + ", ".join(placeholders) + ".")
+        sources.append(source)
+    step1_source, source = sources
+    # The previous implementation uses the same model and parameters.
+    module = re.search(r"^from (sklearn\S*) import (?:.*, )?" + classifier + "(?:,.*)?$", source, re.MULTILINE).group(1)
+    params = ast.literal_eval(re.search(r"^_params = (\{.*?^\})", source, re.MULTILINE | re.DOTALL).group(1))
+    params["random_state"] = 1
+    return step1_source, source, PREVIOUS_STEP2.format(module=module, classifier=classifier, params=repr(params))
+
+def run(script_path, work_dir, arguments):
+    # Returns the time taken and the peak RSS (in MB) of the script.
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script_path] + arguments, cwd=work_dir)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        sys.exit("ERROR: " + script_path + " failed.")
+    # ru_maxrss is in kilobytes on Linux (and in bytes on macOS).
+    return elapsed, usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the step 2 of the classifier techniques.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--attributes", type=int, default=40)
+    parser.add_argument("--classifiers", nargs="+", default=DEFAULT_CLASSIFIERS)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--compression", type=int, choices=range(0, 10), default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    print("classifier,implementation,instances,seconds,peak rss (MB),model size (MB)")
+    for size in args.sizes:
+        size_work_dir = os.path.abspath(os.path.join(args.work_dir, "classifier-step2-" + str(size)))
+        os.makedirs(size_work_dir, exist_ok=True)
+        train_path = os.path.join(size_work_dir, "train.csv")
+        test_path = os.path.join(size_work_dir, "test.csv")
+        if not os.path.exists(train_path):
+            dataset(size, args.attributes, args.seed).to_csv(train_path, index=False)
+            dataset(size // 4, args.attributes, args.seed + 1).to_csv(test_path, index=False)
+        for classifier in args.classifiers:
+            template_step1, template, previous = render(classifier, args.chunk_size, args.compression)
+            for implementation, step1_source, source in [("template", template_step1, template), ("previous", None, previous)]:
+                implementation_work_dir = os.path.join(size_work_dir, classifier, implementation)
+                os.makedirs(implementation_work_dir, exist_ok=True)
+                elapsed, peak_rss, arguments = 0, 0, [train_path, test_path]
+                if step1_source:
+                    with open(os.path.join(implementation_work_dir, "step1.py"), 'w') as file_out:
+                        file_out.write(step1_source)
+                    step1_elapsed, step1_peak_rss = run("step1.py", implementation_work_dir, [train_path, test_path])
+                    elapsed, peak_rss = elapsed + step1_elapsed, max(peak_rss, step1_peak_rss)
+                    arguments = arguments + [os.path.join(implementation_work_dir, "name_benchmark_id_1_schema.json")]
+                with open(os.path.join(implementation_work_dir, "step2.py"), 'w') as file_out:
+                    file_out.write(source)
+                step2_elapsed, step2_peak_rss = run("step2.py", implementation_work_dir, arguments)
+                elapsed, peak_rss = elapsed + step2_elapsed, max(peak_rss, step2_peak_rss)
+                model_size = os.path.getsize(os.path.join(implementation_work_dir, MODEL_FILES[implementation])) / (1024 * 1024)
+                print(classifier + "," + implementation + "," + str(size) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(peak_rss) + "," + "{:.1f}".format(model_size), flush=True)
+            for output_file in OUTPUT_FILES:
+                if not filecmp.cmp(os.path.join(size_work_dir, classifier, "template", output_file), os.path.join(size_work_dir, classifier, "previous", output_file), shallow=False):
+                    sys.exit("ERROR: the output of the template is different from the previous output (" + classifier + ", " + str(size) + " instances, " + output_file + ").")
@@ -0,0 +1,81 @@
+# Benchmark of the codelist template against the size of the codelist.
+#
+# A synthetic cohort (see 'cohort.py') is generated once, and the template is run with codelists of increasing size, drawn
+# from the same vocabulary as the cohort. Each run is compared with the previous implementation, which looked up every code
+# in a list and tokenised every cell of every row, and which is also used to check that the output of the template is
+# exactly the same.
+#
+# Usage: python codelist-size.py [--patients 100000] [--codelist-sizes 10 100 1000 5000] [--required-codes 1] [--seed SEED] [--work-dir DIR]
+
+import os, sys, time, argparse, filecmp, subprocess
+import cohort
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+DEFAULT_CODELIST_SIZES = [10, 100, 1000, 5000]
+
+PREVIOUS_CODELIST = '''
+import sys, csv, re
+
+codes = [[LIST]];
+REQUIRED_CODES = [REQUIRED_CODES];
+with open(sys.argv[1], 'r') as file_in, open('[PHENOTYPE]-potential-cases.csv', 'w', newline='') as file_out:
+    csv_reader = csv.DictReader(file_in)
+    csv_writer = csv.DictWriter(file_out, csv_reader.fieldnames + ["[CATEGORY]-identified"])
+    csv_writer.writeheader();
+    codes_identified = 0;
+    for row in csv_reader:
+        newRow = row.copy();
+        for cell in row:
+            for item in re.findall(r'\\(([^,]*)\\,', row[cell]):
+                if(item in codes): codes_identified+=1;
+                if(codes_identified>=REQUIRED_CODES):
+                    newRow["[CATEGORY]-identified"] = "CASE";
+                    break;
+            if(codes_identified>=REQUIRED_CODES): break;
+        if(codes_identified<REQUIRED_CODES):
+            newRow["[CATEGORY]-identified"] = "UNK";
+        codes_identified=0;
+        csv_writer.writerow(newRow)
+'''
+
+def render(source, codelist, required_codes, phenotype):
+    replacements = {"[AUTHOR]": "benchmark", "[YEAR]": "2021", "[LIST]": ",".join("'" + code + "'" for code in codelist),
+                    "[REQUIRED_CODES]": str(required_codes), "[PHENOTYPE]": phenotype, "[CATEGORY]": "benchmark"}
+    for placeholder, value in replacements.items():
+        source = source.replace(placeholder, value)
+    return source
+
+def run(source, input_path, phenotype):
+    source_path = phenotype + ".py"
+    with open(source_path, 'w') as file_out:
+        file_out.write(source)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, source_path, input_path], check=True)
+    return time.perf_counter() - start, phenotype + "-potential-cases.csv"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the codelist template against the size of the codelist.")
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--codelist-sizes", type=int, nargs="+", default=DEFAULT_CODELIST_SIZES)
+    parser.add_argument("--required-codes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocabulary-size", type=int, default=10000)
+    parser.add_argument("--mean-codes", type=int, default=20)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    os.makedirs(args.work_dir, exist_ok=True)
+    cohort_path = os.path.join(args.work_dir, "cohort-" + "-".join(map(str, [args.patients, args.seed, args.vocabulary_size, args.mean_codes])) + ".csv")
+    if not os.path.exists(cohort_path):
+        cohort.write_cohort(cohort_path, args.patients, args.seed, args.vocabulary_size, args.mean_codes)
+    with open(os.path.join(TEMPLATES_FOLDER_PATH, "codelist.py"), 'r') as file_in:
+        template_source = file_in.read()
+    print("codelist size,patients,template seconds,template patients per second,previous seconds,previous patients per second,speedup")
+    for codelist_size in args.codelist_sizes:
+        codelist = cohort.codelist(codelist_size, args.vocabulary_size, args.seed)
+        phenotype = os.path.abspath(os.path.join(args.work_dir, "codelist-" + str(codelist_size)))
+        template_elapsed, template_output = run(render(template_source, codelist, args.required_codes, phenotype), cohort_path, phenotype)
+        previous_elapsed, previous_output = run(render(PREVIOUS_CODELIST, codelist, args.required_codes, phenotype + "-previous"), cohort_path, phenotype + "-previous")
+        if not filecmp.cmp(template_output, previous_output, shallow=False):
+            sys.exit("ERROR: the output of the template differs from the output of the previous implementation (codelist size " + str(codelist_size) + ").")
+        print(str(codelist_size) + "," + str(args.patients) + "," + "{:.3f}".format(template_elapsed) + "," + "{:.0f}".format(args.patients / template_elapsed) + ","
+              + "{:.3f}".format(previous_elapsed) + "," + "{:.0f}".format(args.patients / previous_elapsed) + "," + "{:.1f}".format(previous_elapsed / template_elapsed), flush=True)
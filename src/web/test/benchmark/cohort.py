@@ -0,0 +1,69 @@
+# Synthetic EHR cohort generator used to benchmark the rule-based templates.
+#
+# Rows follow the layout expected by 'templates/read-potential-cases.template.py' (patient-id, dob, codes, last-encounter),
+# where 'codes' is a list of (code,date) entries. The output is fully determined by the seed and is streamed straight to
+# disk, so cohorts of any size can be generated in constant memory.
+#
+# Usage: python cohort.py <output.csv> <number of patients> [--seed SEED] [--vocabulary-size SIZE] [--mean-codes MEAN]
+
+import csv, random, argparse
+from itertools import accumulate
+from datetime import date, timedelta
+
+# Prefixes loosely based on the code systems supported by Phenoflow (Read v2 / CTV3 style identifiers).
+CODE_PREFIXES = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+CODE_CHARACTERS = "0123456789abcdefghjkmnpqrstuvwxyz"
+FIRST_BIRTH = date(1920, 1, 1)
+LAST_BIRTH = date(2015, 12, 31)
+LAST_ENCOUNTER = date(2024, 12, 31)
+
+def vocabulary(size, seed=0):
+    # The vocabulary only depends on its size and the seed, so benchmarks can rebuild it to draw codelists.
+    generator = random.Random("vocabulary-" + str(seed))
+    codes = set()
+    while len(codes) < size:
+        codes.add(generator.choice(CODE_PREFIXES) + "".join(generator.choice(CODE_CHARACTERS) for _ in range(4)))
+    return sorted(codes)
+
+def codelist(size, vocabulary_size, seed=0):
+    # A codelist is a random sample of the vocabulary (e.g. the codes of a phenotype definition).
+    return random.Random("codelist-" + str(seed) + "-" + str(size)).sample(vocabulary(vocabulary_size, seed), size)
+
+def random_date(generator, start, end):
+    return start + timedelta(days=generator.randint(0, max((end - start).days, 0)))
+
+def patients(number_of_patients, seed=0, vocabulary_size=10000, mean_codes=20):
+    generator = random.Random(seed)
+    codes = vocabulary(vocabulary_size, seed)
+    # Code usage is heavily skewed in EHRs: a few codes are very common, most are rare (Zipf-like weights over a shuffled ranking).
+    random.Random("ranking-" + str(seed)).shuffle(codes)
+    cumulative_weights = list(accumulate(1 / (rank + 1) for rank in range(len(codes))))
+    for patient_id in range(1, number_of_patients + 1):
+        dob = random_date(generator, FIRST_BIRTH, LAST_BIRTH)
+        last_encounter = random_date(generator, max(dob, date(2000, 1, 1)), LAST_ENCOUNTER)
+        # Code-list lengths are long-tailed: most records are short, a few are very long.
+        number_of_codes = min(int(generator.lognormvariate(0, 1) * mean_codes / 1.6487), 50 * mean_codes)
+        entries = generator.choices(codes, cum_weights=cumulative_weights, k=number_of_codes)
+        dates = sorted(random_date(generator, dob, last_encounter) for _ in entries)
+        yield {
+            "patient-id": patient_id,
+            "dob": dob.isoformat(),
+            "codes": ",".join("(" + code + "," + code_date.isoformat() + ")" for code, code_date in zip(entries, dates)),
+            "last-encounter": last_encounter.isoformat()
+        }
+
+def write_cohort(file_path, number_of_patients, seed=0, vocabulary_size=10000, mean_codes=20):
+    with open(file_path, 'w', newline='') as file_out:
+        csv_writer = csv.DictWriter(file_out, ["patient-id", "dob", "codes", "last-encounter"])
+        csv_writer.writeheader()
+        csv_writer.writerows(patients(number_of_patients, seed, vocabulary_size, mean_codes))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic cohort in the format read by the rule-based templates.")
+    parser.add_argument("output")
+    parser.add_argument("patients", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocabulary-size", type=int, default=10000)
+    parser.add_argument("--mean-codes", type=int, default=20)
+    args = parser.parse_args()
+    write_cohort(args.output, args.patients, args.seed, args.vocabulary_size, args.mean_codes)
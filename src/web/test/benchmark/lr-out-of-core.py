@@ -0,0 +1,84 @@
+# Benchmark of the out-of-core mode of the Logistic Regression technique (step 2).
+#
+# Synthetic train and test datasets of each size are generated (decimal and integer attributes, and a binary class that depends
+# linearly on some of them, with noise), one block of rows at a time, so that datasets larger than the memory can be generated.
+# The step 1 and step 2 templates are run with LogisticRegression (the whole train dataset is loaded) and in the out-of-core mode
+# (SGDClassifier fitted one chunk at a time). The time taken, the peak resident memory (RSS), the accuracy over the test dataset
+# and the agreement with the predictions of LogisticRegression over the test dataset are reported. LogisticRegression is not run
+# over train datasets larger than --max-in-core-instances.
+#
+# Usage: python lr-out-of-core.py [--sizes 100000 1000000 10000000] [--attributes 20] [--chunk-size 100000] [--epochs 5] [--max-in-core-instances 10000000] [--seed SEED] [--work-dir DIR]
+
+import os, sys, time, argparse, subprocess
+import numpy as np
+import pandas as pd
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+DEFAULT_SIZES = [100000, 1000000, 10000000]
+BLOCK_SIZE = 100000
+
+def generate(file_path, number_of_instances, number_of_attributes, seed):
+    generator = np.random.default_rng(seed)
+    # The weights of the attributes are the same for the train and test datasets.
+    weights = np.random.default_rng(0).normal(size=number_of_attributes)
+    for block_start in range(0, number_of_instances, BLOCK_SIZE):
+        block_size = min(BLOCK_SIZE, number_of_instances - block_start)
+        values = generator.normal(size=(block_size, number_of_attributes))
+        block = pd.DataFrame({("float_" if (attribute % 2 == 0) else "int_") + str(attribute): (values[:, attribute] if (attribute % 2 == 0) else np.round(values[:, attribute] * 10).astype(np.int64))
+                              for attribute in range(number_of_attributes)})
+        block["Class"] = np.where(values @ weights + generator.normal(size=block_size) > 0, "positive", "negative")
+        block.to_csv(file_path, index=False, header=(block_start == 0), mode="w" if (block_start == 0) else "a")
+
+def render(file_name, out_of_core, chunk_size, epochs):
+    with open(os.path.join(TEMPLATES_FOLDER_PATH, "LogisticRegression", file_name), 'r') as file_in:
+        source = file_in.read()
+    return (source.replace("<WORKFLOW_NAME>", "benchmark").replace("<WORKFLOW_ID>", "1").replace("<CLASS_NAME>", '"Class"').replace("<RANDOM_STATE>", "1")
+                  .replace("<CHUNK_SIZE>", str(chunk_size)).replace("<COMPRESSION>", "0").replace("<OUT_OF_CORE>", str(out_of_core)).replace("<EPOCHS>", str(epochs)))
+
+def run(script_path, work_dir, arguments):
+    # Returns the time taken and the peak RSS (in MB) of the script.
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-W", "ignore", script_path] + arguments, cwd=work_dir)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        sys.exit("ERROR: " + script_path + " failed.")
+    # ru_maxrss is in kilobytes on Linux (and in bytes on macOS).
+    return elapsed, usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the out-of-core mode of the Logistic Regression technique.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--attributes", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--max-in-core-instances", type=int, default=10000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    print("mode,train instances,seconds,peak rss (MB),test accuracy,agreement with LogisticRegression")
+    for size in args.sizes:
+        size_work_dir = os.path.abspath(os.path.join(args.work_dir, "lr-out-of-core-" + str(size)))
+        os.makedirs(size_work_dir, exist_ok=True)
+        train_path = os.path.join(size_work_dir, "train.csv")
+        test_path = os.path.join(size_work_dir, "test.csv")
+        if not os.path.exists(train_path):
+            generate(train_path, size, args.attributes, args.seed)
+            generate(test_path, min(size, 1000000), args.attributes, args.seed + 1)
+        in_core_test_predictions = None
+        for out_of_core in [False, True]:
+            if (not out_of_core) and (size > args.max_in_core_instances):
+                continue
+            implementation_work_dir = os.path.join(size_work_dir, "out-of-core" if out_of_core else "in-core")
+            os.makedirs(implementation_work_dir, exist_ok=True)
+            for file_name in ["step1.py", "step2.py"]:
+                with open(os.path.join(implementation_work_dir, file_name), 'w') as file_out:
+                    file_out.write(render(file_name, out_of_core, args.chunk_size, args.epochs))
+            run("step1.py", implementation_work_dir, [train_path, test_path])
+            elapsed, peak_rss = run("step2.py", implementation_work_dir, [train_path, test_path, os.path.join(implementation_work_dir, "name_benchmark_id_1_schema.json")])
+            test_predictions = pd.read_csv(os.path.join(implementation_work_dir, "step2_test_dataset_with_predictions.csv"), usecols=["Class", "Class_pred"])
+            if not out_of_core:
+                in_core_test_predictions = test_predictions["Class_pred"]
+            agreement = "{:.4f}".format((test_predictions["Class_pred"] == in_core_test_predictions).mean()) if in_core_test_predictions is not None else ""
+            print(("out-of-core" if out_of_core else "in-core") + "," + str(size) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(peak_rss) + ","
+                  + "{:.4f}".format((test_predictions["Class"] == test_predictions["Class_pred"]).mean()) + "," + agreement, flush=True)
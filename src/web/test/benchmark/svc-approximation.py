@@ -0,0 +1,88 @@
+# Benchmark of the kernel approximations of the Support Vector Classification technique (step 2).
+#
+# The train and test datasets of the SVC example are upscaled by each factor: the instances are repeated, and the decimal
+# and integer attributes of each copy are perturbed with a small noise (1% of the standard deviation of the attribute), so
+# that the copies are not duplicates. The step 1 and step 2 templates are run with the exact SVC and with each kernel
+# approximation (nystroem and rff). The time taken, the peak resident memory (RSS), the accuracy over the train and test
+# datasets and the agreement with the predictions of the exact SVC over the test dataset are reported. The exact SVC is
+# not run over train datasets larger than --max-exact-instances, since its fit time grows quadratically (or more).
+#
+# Usage: python svc-approximation.py [--factors 1 4 16 64] [--n-components 100] [--max-exact-instances 50000] [--seed SEED] [--work-dir DIR]
+
+import os, sys, time, argparse, subprocess
+import numpy as np
+import pandas as pd
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+EXAMPLE_FOLDER_PATH = os.path.join(TEMPLATES_FOLDER_PATH, "SVC", "example", "files")
+DEFAULT_FACTORS = [1, 4, 16, 64]
+APPROXIMATIONS = [None, "nystroem", "rff"]
+
+def upscale(dataset, factor, seed):
+    generator = np.random.default_rng(seed)
+    copies = [dataset]
+    for _ in range(factor - 1):
+        copy = dataset.copy()
+        for column in copy.columns:
+            if pd.api.types.is_numeric_dtype(copy[column]):
+                noise = generator.normal(0, 0.01 * copy[column].std(), len(copy))
+                copy[column] = (copy[column] + noise).round().astype(copy[column].dtype) if pd.api.types.is_integer_dtype(copy[column]) else copy[column] + noise
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def render(file_name, approximation, n_components):
+    with open(os.path.join(TEMPLATES_FOLDER_PATH, "SVC", file_name), 'r') as file_in:
+        source = file_in.read()
+    return (source.replace("<WORKFLOW_NAME>", "benchmark").replace("<WORKFLOW_ID>", "1").replace("<CLASS_NAME>", '"Class"').replace("<RANDOM_STATE>", "1")
+                  .replace("<CHUNK_SIZE>", "100000").replace("<COMPRESSION>", "0").replace("<APPROXIMATION>", repr(approximation)).replace("<N_COMPONENTS>", str(n_components)))
+
+def run(script_path, work_dir, arguments):
+    # Returns the time taken and the peak RSS (in MB) of the script.
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-W", "ignore", script_path] + arguments, cwd=work_dir)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        sys.exit("ERROR: " + script_path + " failed.")
+    # ru_maxrss is in kilobytes on Linux (and in bytes on macOS).
+    return elapsed, usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the kernel approximations of the SVC technique.")
+    parser.add_argument("--factors", type=int, nargs="+", default=DEFAULT_FACTORS)
+    parser.add_argument("--n-components", type=int, default=100)
+    parser.add_argument("--max-exact-instances", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    train_dataset = pd.read_csv(os.path.join(EXAMPLE_FOLDER_PATH, "train.csv"))
+    test_dataset = pd.read_csv(os.path.join(EXAMPLE_FOLDER_PATH, "test.csv"))
+    print("approximation,factor,train instances,seconds,peak rss (MB),train accuracy,test accuracy,agreement with exact SVC")
+    for factor in args.factors:
+        factor_work_dir = os.path.abspath(os.path.join(args.work_dir, "svc-approximation-" + str(factor)))
+        os.makedirs(factor_work_dir, exist_ok=True)
+        train_path = os.path.join(factor_work_dir, "train.csv")
+        test_path = os.path.join(factor_work_dir, "test.csv")
+        if not os.path.exists(train_path):
+            upscale(train_dataset, factor, args.seed).to_csv(train_path, index=False)
+            upscale(test_dataset, factor, args.seed + 1).to_csv(test_path, index=False)
+        number_of_instances = len(train_dataset) * factor
+        exact_test_predictions = None
+        for approximation in APPROXIMATIONS:
+            if (approximation is None) and (number_of_instances > args.max_exact_instances):
+                continue
+            implementation_work_dir = os.path.join(factor_work_dir, str(approximation).lower())
+            os.makedirs(implementation_work_dir, exist_ok=True)
+            for file_name in ["step1.py", "step2.py"]:
+                with open(os.path.join(implementation_work_dir, file_name), 'w') as file_out:
+                    file_out.write(render(file_name, approximation, args.n_components))
+            run("step1.py", implementation_work_dir, [train_path, test_path])
+            elapsed, peak_rss = run("step2.py", implementation_work_dir, [train_path, test_path, os.path.join(implementation_work_dir, "name_benchmark_id_1_schema.json")])
+            train_predictions = pd.read_csv(os.path.join(implementation_work_dir, "step2_train_dataset_with_predictions.csv"), usecols=["Class", "Class_pred"])
+            test_predictions = pd.read_csv(os.path.join(implementation_work_dir, "step2_test_dataset_with_predictions.csv"), usecols=["Class", "Class_pred"])
+            if approximation is None:
+                exact_test_predictions = test_predictions["Class_pred"]
+            agreement = "{:.4f}".format((test_predictions["Class_pred"] == exact_test_predictions).mean()) if exact_test_predictions is not None else ""
+            print(str(approximation).lower() + "," + str(factor) + "," + str(number_of_instances) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(peak_rss) + ","
+                  + "{:.4f}".format((train_predictions["Class"] == train_predictions["Class_pred"]).mean()) + ","
+                  + "{:.4f}".format((test_predictions["Class"] == test_predictions["Class_pred"]).mean()) + "," + agreement, flush=True)
@@ -0,0 +1,78 @@
+# Benchmark of the step 5 of the Trace-based clustering technique (final candidate clusters in json -> csv output).
+#
+# A synthetic 'final_candidate_clusters.json' is generated for each size, with the instances split over the clusters of
+# the partition k. The template is compared with the previous row-by-row writer, which is also used to check that the
+# output of the template is exactly the same.
+#
+# Usage: python tbc-step5.py [--sizes 1000000 10000000] [--k K] [--seed SEED] [--work-dir DIR]
+
+import os, sys, json, time, random, argparse, filecmp, subprocess
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+DEFAULT_SIZES = [1000000, 10000000]
+
+def final_candidate_clusters(number_of_instances, k, seed):
+    # Every instance belongs to one cluster of the partition k, and some of the clusters are kept as final candidates.
+    generator = random.Random(seed)
+    clusters = [[] for _ in range(k)]
+    for instance_index in range(number_of_instances):
+        clusters[generator.randrange(k)].append(instance_index)
+    final_clusters = dict()
+    for cluster_number in range(k):
+        if generator.random() < 0.8:
+            final_clusters["partition_k_" + str(k) + "_cluster_" + str(cluster_number)] = {
+                "instances": clusters[cluster_number],
+                "match_with_previous_partitions": {
+                    "partition_k_" + str(partition_number): {
+                        "max_value_of_match": generator.random(),
+                        "cluster_with_max_value_of_match": "partition_k_" + str(partition_number) + "_cluster_" + str(generator.randrange(partition_number))
+                    } for partition_number in range(2, k)
+                }
+            }
+    return final_clusters
+
+def render(k):
+    with open(os.path.join(TEMPLATES_FOLDER_PATH, "tbc", "step5.py"), 'r') as file_in:
+        source = file_in.read()
+    return source.replace("<WORKFLOW_NAME>", "benchmark").replace("<WORKFLOW_ID>", "1").replace("<K_PARAMETER>", str(k))
+
+def row_by_row(input_path, output_path, k):
+    # Previous implementation of the step 5: one string concatenation and one write per instance.
+    with open(input_path, 'r') as file_in, open(output_path, 'w') as file_out:
+        final_clusters = json.load(file_in)
+        file_out.write('"instance index of the initial dataset (starting from 0)","cluster name (starting from 0 and from the partition with ' + str(k) + ' clusters)","mean value of match with previous partitions"\n')
+        for cluster_name in final_clusters:
+            previous_partitions = final_clusters[cluster_name]["match_with_previous_partitions"]
+            values_of_match = [previous_partitions[partition_key]["max_value_of_match"] for partition_key in previous_partitions]
+            mean_value_of_match = sum(values_of_match) / len(values_of_match)
+            for instance_index in final_clusters[cluster_name]["instances"]:
+                file_out.write(str(instance_index) + "," + cluster_name + "," + str(mean_value_of_match) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the step 5 of the Trace-based clustering technique.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    print("implementation,instances,seconds,instances per second")
+    for size in args.sizes:
+        size_work_dir = os.path.abspath(os.path.join(args.work_dir, "tbc-step5-" + str(size)))
+        os.makedirs(size_work_dir, exist_ok=True)
+        input_path = os.path.join(size_work_dir, "final_candidate_clusters.json")
+        if not os.path.exists(input_path):
+            with open(input_path, 'w') as file_out:
+                json.dump(final_candidate_clusters(size, args.k, args.seed), file_out)
+        with open(os.path.join(size_work_dir, "step5.py"), 'w') as file_out:
+            file_out.write(render(args.k))
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "step5.py", input_path], cwd=size_work_dir, check=True)
+        elapsed = time.perf_counter() - start
+        print("template," + str(size) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(size / elapsed), flush=True)
+        reference_path = os.path.join(size_work_dir, "row-by-row.csv")
+        start = time.perf_counter()
+        row_by_row(input_path, reference_path, args.k)
+        elapsed = time.perf_counter() - start
+        print("row-by-row," + str(size) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(size / elapsed), flush=True)
+        if not filecmp.cmp(os.path.join(size_work_dir, "name_benchmark_id_1_output.csv"), reference_path, shallow=False):
+            sys.exit("ERROR: the output of the template is different from the row-by-row output (" + str(size) + " instances).")
@@ -0,0 +1,70 @@
+# Benchmark of the rule-based templates over synthetic cohorts (see 'cohort.py').
+#
+# Each template is customised in the same way as in 'test/templates.js' and the templates are chained as in a generated
+# workflow (codelist -> codelists-temporal -> codelist-exclude -> age -> output-cases), so every step reads the output of
+# the previous one. Cohorts are generated once per size and seed, and kept in the working directory for later runs.
+#
+# Usage: python templates.py [--sizes 10000 100000 1000000 10000000] [--seed SEED] [--codelist-size SIZE] [--work-dir DIR]
+
+import os, sys, time, argparse, subprocess
+import cohort
+
+TEMPLATES_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "templates")
+DEFAULT_SIZES = [10000, 100000, 1000000, 10000000]
+
+def render(template_name, replacements):
+    with open(os.path.join(TEMPLATES_FOLDER_PATH, template_name), 'r') as file_in:
+        source = file_in.read()
+    source = source.replace("[AUTHOR]", "benchmark").replace("[YEAR]", "2021")
+    for placeholder, value in replacements.items():
+        source = source.replace(placeholder, value)
+    return source
+
+def quoted(codes):
+    return ",".join("'" + code + "'" for code in codes)
+
+def pipeline(codelist_size, vocabulary_size, seed):
+    # Disjoint codelists, so that cases and exclusions are driven by different codes.
+    codes = cohort.codelist(codelist_size * 4, vocabulary_size, seed)
+    case_codes, before_codes, after_codes, exclude_codes = [codes[index::4] for index in range(4)]
+    return [
+        ("codelist.py", {"[LIST]": quoted(case_codes), "[REQUIRED_CODES]": "1", "[CATEGORY]": "benchmark"}),
+        ("codelists-temporal.py", {"[LIST_BEFORE]": quoted(before_codes), "[LIST_AFTER]": quoted(after_codes), "[MIN_DAYS]": "0", "[MAX_DAYS]": "365", "[CATEGORY]": "benchmark-temporal"}),
+        ("codelist-exclude.py", {"[LIST]": quoted(exclude_codes), "[CATEGORY]": "benchmark"}),
+        ("age.py", {"[AGE_LOWER]": "18", "[AGE_UPPER]": "80"}),
+        ("output-cases.py", {})
+    ]
+
+def run(template_name, replacements, input_path, work_dir):
+    phenotype = os.path.join(work_dir, template_name.replace(".py", ""))
+    replacements = dict(replacements, **{"[PHENOTYPE]": phenotype})
+    source_path = phenotype + ".py"
+    with open(source_path, 'w') as file_out:
+        file_out.write(render(template_name, replacements))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, source_path, input_path], check=True)
+    elapsed = time.perf_counter() - start
+    output_path = phenotype + ("-cases.csv" if template_name.startswith("output") else "-potential-cases.csv")
+    return elapsed, output_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based templates over synthetic cohorts.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--codelist-size", type=int, default=100)
+    parser.add_argument("--vocabulary-size", type=int, default=10000)
+    parser.add_argument("--mean-codes", type=int, default=20)
+    parser.add_argument("--work-dir", default="benchmark-output")
+    args = parser.parse_args()
+    os.makedirs(args.work_dir, exist_ok=True)
+    print("template,patients,seconds,patients per second")
+    for size in args.sizes:
+        cohort_path = os.path.join(args.work_dir, "cohort-" + "-".join(map(str, [size, args.seed, args.vocabulary_size, args.mean_codes])) + ".csv")
+        if not os.path.exists(cohort_path):
+            cohort.write_cohort(cohort_path, size, args.seed, args.vocabulary_size, args.mean_codes)
+        size_work_dir = os.path.join(args.work_dir, str(size))
+        os.makedirs(size_work_dir, exist_ok=True)
+        input_path = cohort_path
+        for template_name, replacements in pipeline(args.codelist_size, args.vocabulary_size, args.seed):
+            elapsed, input_path = run(template_name, replacements, input_path, size_work_dir)
+            print(template_name + "," + str(size) + "," + "{:.3f}".format(elapsed) + "," + "{:.0f}".format(size / elapsed), flush=True)
@@ -126,9 +126,9 @@ async function testLastEncounterCheck(existingTimestamp=null, encounterExclusion
 
 }
 
-async function runPythonCode(codelistSource, input) {
+async function runPythonCode(codelistSource, input, cwd=undefined) {
   return new Promise((resolve, reject) => {
-    shell.runString(codelistSource, {args:input}, function (error, results) {
+    shell.runString(codelistSource, {args:input, cwd:cwd}, function (error, results) {
       if(error) reject(error);
       resolve(results);
     });
@@ -316,6 +316,28 @@ describe("templates", () => {
       expect(csv[2]['nested-phenotype-name-identified']).to.equal('UNK');
     });
 
+    it("[TE23] Should be able to execute a trace-based clustering matrix of matches with empty clusters.", async() => {
+      const TIMESTAMP = Date.now();
+      let source = await fs.readFile("templates/tbc/step3.py", "utf-8");
+      source = source.replaceAll("<K_PARAMETER>", "3");
+
+      // The cluster 1 of the partition 2 and the cluster 2 of the partition 3 are empty.
+      const WORK_DIR = "/tmp/tbc-"+TIMESTAMP;
+      await fs.mkdir(WORK_DIR);
+      await fs.writeFile(WORK_DIR+"/partitions.json", JSON.stringify({"partition_k_2":{"cluster_0":[0,1,2,3],"cluster_1":[]},"partition_k_3":{"cluster_0":[0,1],"cluster_1":[2,3],"cluster_2":[]}}));
+      let results = await runPythonCode(source, [WORK_DIR+"/partitions.json"], WORK_DIR);
+      if(results) console.log(results);
+
+      const matrixOfMatches = JSON.parse(await fs.readFile(WORK_DIR+"/matrix_of_matches.json", "utf-8"));
+      const VALUES_OF_MATCH = {"jaccard":0.5, "jaccard2":0.5, "dice":2/3};
+      for(const matchFunction in VALUES_OF_MATCH) {
+        expect(matrixOfMatches["partition_k_3_cluster_0"]["match_with_previous_partitions"][matchFunction]["partition_k_2"]["max_value_of_match"]).to.equal(VALUES_OF_MATCH[matchFunction]);
+        expect(matrixOfMatches["partition_k_3_cluster_2"]["instances"]).to.be.empty;
+        expect(matrixOfMatches["partition_k_3_cluster_2"]["match_with_previous_partitions"][matchFunction]["partition_k_2"]["max_value_of_match"]).to.equal(0);
+        expect(matrixOfMatches["partition_k_3_cluster_2"]["match_with_previous_partitions"][matchFunction]["partition_k_2"]["cluster_with_max_value_of_match"]).to.equal("partition_k_2_cluster_0");
+      }
+    });
+
   });
 
 });